@@ -2,65 +2,41 @@
 Arquivo __init__.py do pacote app.
 """
 
-# from flask import Flask, jsonify, request
-# from app.routes.routes import routes
-# from app.controllers.path_control import Path_Controller
-# from app.controllers.file_control import (
-#     listar_arquivos,
-#     criar_arquivo,
-#     deletar_arquivo
-# )
-
-# def create_app():
-#     """
-#     Inicializa e configura a aplicação Flask.
-
-#     Retorna:
-#         app (Flask): A aplicação Flask configurada.
-#     """
-#     app = Flask(__name__)
-
-#     # Registro de rotas utilizando Blueprint
-#     app.register_blueprint(routes, url_prefix="/api")
-
-#     # Rota para analisar caminhos
-#     @app.route("/analyze", methods=["POST"])
-#     def analyze():
-#         """
-#         Rota para analisar caminhos.
-#         """
-#         data = request.get_json()
-#         path = data.get("path")
-#         if not path:
-#             return jsonify({"error": "Path is required"}), 400
-#         controle = Path_Controller(path)
-#         return jsonify({
-#             "caminho_absoluto": controle._caminho_atual,
-#             "caminho_relativo": controle.caminho_entrada
-#         })
-
-#     # Rota para listar arquivos
-#     @app.route("/arquivos", methods=["GET"])
-#     def listar_arquivos_route():
-#         """
-#         Rota para listar arquivos.
-#         """
-#         return listar_arquivos()
-
-#     # Rota para criar arquivo
-#     @app.route("/arquivos", methods=["POST"])
-#     def criar_arquivo_route():
-#         """
-#         Rota para criar arquivo.
-#         """
-#         return criar_arquivo()
-
-#     # Rota para deletar arquivo
-#     @app.route("/arquivos/<int:id>", methods=["DELETE"])
-#     def deletar_arquivo_route(id):
-#         """
-#         Rota para deletar arquivo.
-#         """
-#         return deletar_arquivo(id)
-
-#     return app
+from typing import Any, Mapping, Optional
+
+
+def create_app(config: Optional[Mapping[str, Any]] = None):
+    """
+    Inicializa e configura a aplicação Flask.
+
+    Configurações próprias:
+        PASTA_FAVORITOS: Pasta cujos arquivos a API pode ler pelo
+            `caminho` (ou pelo `path` de /analyze). Sem ela (o padrão) só
+            são aceitos arquivos enviados.
+        BANCO_TAREFAS: Arquivo SQLite da fila de tarefas (padrão:
+            tarefas.sqlite na pasta de instância).
+        WORKERS_TAREFAS: Processos da fila de tarefas (padrão: número de CPUs).
+
+    Retorna:
+        app (Flask): A aplicação Flask configurada.
+    """
+    # Importações tardias: a linha de comando e os processos da análise
+    # paralela importam o pacote app e não precisam carregar o Flask
+    from flask import Flask  # pylint: disable=C0415
+
+    from app.routes.favorites_routes import favoritos  # pylint: disable=C0415
+    from app.routes.routes import routes  # pylint: disable=C0415
+    from app.routes.tarefas_routes import tarefas  # pylint: disable=C0415
+
+    app = Flask(__name__)
+    app.config.setdefault("PASTA_FAVORITOS", None)
+    app.config.setdefault("BANCO_TAREFAS", None)
+    app.config.setdefault("WORKERS_TAREFAS", None)
+    if config:
+        app.config.update(config)
+
+    # Registro de rotas utilizando Blueprint
+    app.register_blueprint(routes, url_prefix="/api")
+    app.register_blueprint(favoritos, url_prefix="/api")
+    app.register_blueprint(tarefas, url_prefix="/api")
+    return app
@@ -0,0 +1,437 @@
+# app/cli.py
+
+"""
+Interface de linha de comando do BookmarkHunter.
+
+Uso:
+    python -m app.cli ingerir <pasta> [--workers N] [--lote N] [--manifesto ARQUIVO]
+    python -m app.cli analisar <arquivo> [--workers N] [--hierarquia]
+    python -m app.cli descobrir <pasta> [<pasta> ...] [--workers N] [--ordenado]
+    python -m app.cli delta <arquivo> --snapshot <arquivo.json>
+    python -m app.cli indexar <arquivo> [<arquivo> ...] --banco <indice.sqlite>
+    python -m app.cli buscar --banco <indice.sqlite> [--host H] [--texto T]
+    python -m app.cli deduplicar <arquivo> [<arquivo> ...] [--somente-duplicados]
+    python -m app.cli similares <arquivo> [<arquivo> ...] [--limiar L] [--bandas B] [--linhas R]
+    python -m app.cli verificar <arquivo> [<arquivo> ...] [--conexoes N] [--taxa-por-dominio R] [--quebrados]
+    python -m app.cli exportar <arquivo> [<arquivo> ...] --saida <destino> [--formato F] [--lote N]
+
+Opções gerais (antes do subcomando):
+    --metricas {json,prometheus} [--metricas-saida ARQUIVO]
+    --perfil {cprofile,tracemalloc} [--perfil-saida ARQUIVO]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+from app.instrumentacao import MODOS_PERFIL, metricas, perfilar
+from app.models.icones import ICONES_IGNORADOS
+from app.models.tag_model import AnalisadorHTML
+from app.services.agendador import TAXA_POR_DOMINIO, AgendadorHosts
+from app.services.analise_paralela import AnalisadorParalelo
+from app.services.deduplicacao import LIMITE_GRUPOS, Deduplicador
+from app.services.delta import SnapshotFavoritos, comparar
+from app.services.descoberta import DescobertaFavoritos
+from app.services.exportacao import FORMATOS, TAMANHO_LOTE, ExportadorFavoritos
+from app.services.indice import IndiceFavoritos
+from app.services.ingestao import IngestaoEmLote
+from app.services.similaridade import BANDAS, LIMIAR, LINHAS, DetectorSimilares
+from app.services.verificacao import MAX_CONEXOES, MAX_POR_HOST, TIMEOUT, VerificadorLinks
+
+
+def _comando_ingerir(args: argparse.Namespace) -> int:
+    """
+    Analisa os arquivos da pasta e imprime um JSON por arquivo concluído.
+    """
+    ingestao = IngestaoEmLote(
+        args.pasta,
+        workers=args.workers,
+        tamanho_lote=args.lote,
+        extensoes=args.extensoes,
+        hierarquia=args.hierarquia,
+        icones=args.icones,
+        incluir_registros=args.registros,
+        manifesto=args.manifesto,
+    )
+    inicio = time.perf_counter()
+    arquivos = registros = erros = em_cache = 0
+    for resultado in ingestao.executar():
+        arquivos += 1
+        em_cache += resultado["cache"]
+        registros += resultado["total"]
+        erros += resultado["erro"] is not None
+        print(json.dumps(resultado, ensure_ascii=False), flush=True)
+
+    resumo = {
+        "arquivos": arquivos,
+        "registros": registros,
+        "erros": erros,
+        "em_cache": em_cache,
+        "duracao": time.perf_counter() - inicio,
+    }
+    print(json.dumps(resumo, ensure_ascii=False), file=sys.stderr)
+    return 1 if erros else 0
+
+
+def _comando_analisar(args: argparse.Namespace) -> int:
+    """
+    Analisa um único arquivo em trechos paralelos e imprime um JSON por registro.
+    """
+    analisador = AnalisadorParalelo(
+        args.arquivo,
+        workers=args.workers,
+        hierarquia=args.hierarquia,
+        icones=args.icones,
+    )
+    for registro in analisador.iterar_tags():
+        print(json.dumps(registro, ensure_ascii=False))
+    return 0
+
+
+def _comando_descobrir(args: argparse.Namespace) -> int:
+    """
+    Procura arquivos de favoritos e imprime um caminho por linha.
+    """
+    descoberta = DescobertaFavoritos(
+        args.pastas,
+        workers=args.workers,
+        max_em_voo=args.em_voo,
+        profundidade_maxima=args.profundidade,
+        seguir_links=args.seguir_links,
+        ordenado=args.ordenado,
+    )
+    for caminho in descoberta.executar():
+        print(caminho, flush=True)
+    for caminho, erro in descoberta.erros:
+        print(f"{caminho}: {erro}", file=sys.stderr)
+    return 0
+
+
+def _comando_delta(args: argparse.Namespace) -> int:
+    """
+    Compara o arquivo com o snapshot anterior e imprime um JSON por mudança.
+    """
+    inicio = time.perf_counter()
+    anterior = SnapshotFavoritos.carregar(args.snapshot) if os.path.exists(args.snapshot) else None
+    resultado = comparar(args.arquivo, anterior)
+    for evento in resultado["eventos"]:
+        print(json.dumps(evento, ensure_ascii=False))
+    if not args.nao_salvar:
+        resultado["snapshot"].salvar(args.snapshot)
+
+    resumo = {
+        "eventos": len(resultado["eventos"]),
+        "pastas_puladas": resultado["pastas_puladas"],
+        "incremental": resultado["incremental"],
+        "duracao": time.perf_counter() - inicio,
+    }
+    print(json.dumps(resumo, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+def _comando_indexar(args: argparse.Namespace) -> int:
+    """
+    Grava os favoritos dos arquivos no índice SQLite.
+    """
+    with IndiceFavoritos(args.banco) as indice:
+        for arquivo in args.arquivos:
+            inicio = time.perf_counter()
+            total = indice.indexar_arquivo(arquivo)
+            resultado = {"arquivo": arquivo, "total": total, "duracao": time.perf_counter() - inicio}
+            print(json.dumps(resultado, ensure_ascii=False), flush=True)
+    return 0
+
+
+def _comando_buscar(args: argparse.Namespace) -> int:
+    """
+    Consulta o índice e imprime um JSON por favorito encontrado.
+    """
+    filtros = {
+        "host": args.host,
+        "texto": args.texto,
+        "pasta": tuple(args.pasta.split("/")) if args.pasta else None,
+        "add_date_min": args.desde,
+        "add_date_max": args.ate,
+    }
+    with IndiceFavoritos(args.banco) as indice:
+        for favorito in indice.buscar(limite=args.limite, deslocamento=args.deslocamento, **filtros):
+            print(json.dumps(favorito, ensure_ascii=False))
+    return 0
+
+
+def _comando_deduplicar(args: argparse.Namespace) -> int:
+    """
+    Agrupa os favoritos dos arquivos pela URL canônica e imprime um JSON por
+    grupo.
+    """
+    inicio = time.perf_counter()
+    deduplicador = Deduplicador(limite_grupos=args.limite_grupos)
+    for arquivo in args.arquivos:
+        with AnalisadorHTML.from_path(arquivo) as analisador:
+            deduplicador.processar(analisador.iterar_tags(hierarquia=True, icones=ICONES_IGNORADOS))
+    grupos = 0
+    for grupo in deduplicador.grupos(somente_duplicados=args.somente_duplicados):
+        print(json.dumps(grupo, ensure_ascii=False))
+        grupos += 1
+
+    resumo = {
+        "favoritos": deduplicador.registros,
+        "grupos": grupos,
+        "duracao": time.perf_counter() - inicio,
+    }
+    print(json.dumps(resumo, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+def _comando_similares(args: argparse.Namespace) -> int:
+    """
+    Agrupa os favoritos quase duplicados e imprime um JSON por grupo.
+    """
+    inicio = time.perf_counter()
+    detector = DetectorSimilares(bandas=args.bandas, linhas=args.linhas, limiar=args.limiar)
+    for arquivo in args.arquivos:
+        with AnalisadorHTML.from_path(arquivo) as analisador:
+            detector.processar(analisador.iterar_tags(hierarquia=True, icones=ICONES_IGNORADOS))
+    grupos = detector.grupos()
+    for grupo in grupos:
+        print(json.dumps(grupo, ensure_ascii=False))
+
+    resumo = {
+        "favoritos": len(detector),
+        "grupos": len(grupos),
+        "comparacoes": detector.comparacoes,
+        "baldes_ignorados": detector.baldes_ignorados,
+        "duracao": time.perf_counter() - inicio,
+    }
+    print(json.dumps(resumo, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+def _hrefs(arquivos: List[str]) -> List[str]:
+    """
+    HREFs distintos dos arquivos, na ordem em que aparecem.
+    """
+    hrefs: dict = {}
+    for arquivo in arquivos:
+        with AnalisadorHTML.from_path(arquivo) as analisador:
+            for registro in analisador.iterar_tags(icones=ICONES_IGNORADOS):
+                if registro["tag"] == "A":
+                    hrefs.setdefault(registro["HREF"], None)
+    return list(hrefs)
+
+
+def _comando_verificar(args: argparse.Namespace) -> int:
+    """
+    Verifica os links dos arquivos, em rodízio entre os domínios e com limite
+    de taxa por domínio, e imprime um JSON por link na ordem em que as
+    respostas chegam.
+    """
+    inicio = time.perf_counter()
+    agendador = AgendadorHosts(taxa_por_dominio=args.taxa_por_dominio, max_por_dominio=args.por_host)
+    for href in _hrefs(args.arquivos):
+        agendador.adicionar(href)
+    links = len(agendador)
+    contagem = {"ok": 0, "quebrados": 0, "ignorados": 0}
+
+    async def verificar() -> None:
+        async with VerificadorLinks(
+            timeout=args.timeout, max_conexoes=args.conexoes, max_por_host=args.por_host
+        ) as verificador:
+            async for saida in agendador.executar(verificador.verificar_link, concorrencia=args.conexoes):
+                resultado = saida["resultado"] or {"HREF": saida["item"], "ok": False, "erro": saida["erro"]}
+                chave = "ignorados" if resultado["ok"] is None else "ok" if resultado["ok"] else "quebrados"
+                contagem[chave] += 1
+                if not args.quebrados or resultado["ok"] is False:
+                    print(json.dumps(resultado, ensure_ascii=False), flush=True)
+
+    asyncio.run(verificar())
+    resumo = dict(contagem, links=links, duracao=time.perf_counter() - inicio, vazao=agendador.metricas()["vazao"])
+    print(json.dumps(resumo, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+def _comando_exportar(args: argparse.Namespace) -> int:
+    """
+    Grava os favoritos dos arquivos num único CSV, JSON Lines, Parquet ou Arrow.
+    """
+    inicio = time.perf_counter()
+    with ExportadorFavoritos(args.saida, args.formato, args.lote) as exportador:
+        for arquivo in args.arquivos:
+            exportador.exportar_arquivo(arquivo)
+    resumo = {
+        "arquivos": len(args.arquivos),
+        "linhas": exportador.total,
+        "formato": exportador.formato,
+        "duracao": time.perf_counter() - inicio,
+    }
+    print(json.dumps(resumo, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """
+    Monta o parser de argumentos com os subcomandos disponíveis.
+    """
+    parser = argparse.ArgumentParser(prog="bookmarkhunter", description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--metricas", choices=["json", "prometheus"], default=None, help="Coleta e imprime as métricas no stderr."
+    )
+    parser.add_argument("--metricas-saida", default=None, help="Grava as métricas neste arquivo.")
+    parser.add_argument(
+        "--perfil", choices=list(MODOS_PERFIL), default=None, help="Perfila a execução e imprime o resumo no stderr."
+    )
+    parser.add_argument(
+        "--perfil-saida", default=None, help="Grava o perfil completo (pstats ou snapshot do tracemalloc)."
+    )
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    ingerir = subcomandos.add_parser("ingerir", help="Analisa em paralelo os favoritos de uma pasta.")
+    ingerir.add_argument("pasta", help="Pasta com os arquivos exportados.")
+    ingerir.add_argument("--workers", type=int, default=None, help="Quantidade de processos.")
+    ingerir.add_argument("--lote", type=int, default=1, help="Arquivos por tarefa.")
+    ingerir.add_argument(
+        "--extensoes", nargs="+", default=None, help="Extensões aceitas (padrão: .html .htm)."
+    )
+    ingerir.add_argument("--hierarquia", action="store_true", help="Inclui a pasta de cada favorito.")
+    ingerir.add_argument(
+        "--icones", choices=("completo", "ignorar"), default="ignorar", help="Modo de ícones."
+    )
+    ingerir.add_argument(
+        "--registros", action="store_true", help="Inclui os registros extraídos na saída."
+    )
+    ingerir.add_argument(
+        "--manifesto", default=None, help="Arquivo SQLite para pular arquivos não modificados."
+    )
+    ingerir.set_defaults(funcao=_comando_ingerir)
+
+    analisar = subcomandos.add_parser(
+        "analisar", help="Analisa um arquivo grande dividindo-o entre processos."
+    )
+    analisar.add_argument("arquivo", help="Arquivo de favoritos exportado.")
+    analisar.add_argument("--workers", type=int, default=None, help="Quantidade de processos.")
+    analisar.add_argument("--hierarquia", action="store_true", help="Inclui a pasta de cada favorito.")
+    analisar.add_argument(
+        "--icones", choices=("completo", "ignorar"), default="ignorar", help="Modo de ícones."
+    )
+    analisar.set_defaults(funcao=_comando_analisar)
+
+    descobrir = subcomandos.add_parser(
+        "descobrir", help="Procura arquivos de favoritos exportados nas pastas."
+    )
+    descobrir.add_argument("pastas", nargs="+", help="Pastas onde a busca começa.")
+    descobrir.add_argument("--workers", type=int, default=8, help="Quantidade de threads.")
+    descobrir.add_argument(
+        "--em-voo", type=int, default=64, help="Máximo de tarefas em andamento."
+    )
+    descobrir.add_argument("--profundidade", type=int, default=None, help="Profundidade máxima.")
+    descobrir.add_argument(
+        "--seguir-links", action="store_true", help="Entra em links simbólicos para pastas."
+    )
+    descobrir.add_argument("--ordenado", action="store_true", help="Entrega em ordem alfabética.")
+    descobrir.set_defaults(funcao=_comando_descobrir)
+
+    delta = subcomandos.add_parser(
+        "delta", help="Lista os favoritos adicionados, removidos e movidos desde o último snapshot."
+    )
+    delta.add_argument("arquivo", help="Nova exportação de favoritos.")
+    delta.add_argument("--snapshot", required=True, help="Arquivo JSON do snapshot anterior.")
+    delta.add_argument(
+        "--nao-salvar", action="store_true", help="Não substitui o snapshot pelo novo."
+    )
+    delta.set_defaults(funcao=_comando_delta)
+
+    indexar = subcomandos.add_parser("indexar", help="Grava os favoritos num índice SQLite.")
+    indexar.add_argument("arquivos", nargs="+", help="Arquivos de favoritos exportados.")
+    indexar.add_argument("--banco", required=True, help="Arquivo SQLite do índice.")
+    indexar.set_defaults(funcao=_comando_indexar)
+
+    buscar = subcomandos.add_parser("buscar", help="Consulta o índice SQLite.")
+    buscar.add_argument("--banco", required=True, help="Arquivo SQLite do índice.")
+    buscar.add_argument("--host", default=None, help="Host exato (ex.: github.com).")
+    buscar.add_argument("--texto", default=None, help="Consulta FTS5 nos títulos.")
+    buscar.add_argument("--pasta", default=None, help="Pasta, com subpastas separadas por '/'.")
+    buscar.add_argument("--desde", type=int, default=None, help="ADD_DATE mínimo.")
+    buscar.add_argument("--ate", type=int, default=None, help="ADD_DATE máximo.")
+    buscar.add_argument("--limite", type=int, default=100, help="Máximo de resultados.")
+    buscar.add_argument("--deslocamento", type=int, default=0, help="Resultados a pular.")
+    buscar.set_defaults(funcao=_comando_buscar)
+
+    deduplicar = subcomandos.add_parser(
+        "deduplicar", help="Agrupa os favoritos repetidos pela URL canônica."
+    )
+    deduplicar.add_argument("arquivos", nargs="+", help="Arquivos de favoritos exportados.")
+    deduplicar.add_argument(
+        "--somente-duplicados", action="store_true", help="Mostra só as URLs repetidas."
+    )
+    deduplicar.add_argument(
+        "--limite-grupos", type=int, default=LIMITE_GRUPOS, help="Grupos em memória antes de usar o disco."
+    )
+    deduplicar.set_defaults(funcao=_comando_deduplicar)
+
+    similares = subcomandos.add_parser(
+        "similares", help="Agrupa favoritos quase duplicados (MinHash/LSH)."
+    )
+    similares.add_argument("arquivos", nargs="+", help="Arquivos de favoritos exportados.")
+    similares.add_argument("--limiar", type=float, default=LIMIAR, help="Similaridade mínima (0 a 1).")
+    similares.add_argument("--bandas", type=int, default=BANDAS, help="Bandas LSH.")
+    similares.add_argument("--linhas", type=int, default=LINHAS, help="Valores por banda.")
+    similares.set_defaults(funcao=_comando_similares)
+
+    verificar = subcomandos.add_parser("verificar", help="Verifica quais links ainda respondem.")
+    verificar.add_argument("arquivos", nargs="+", help="Arquivos de favoritos exportados.")
+    verificar.add_argument(
+        "--conexoes", type=int, default=MAX_CONEXOES, help="Requisições simultâneas no total."
+    )
+    verificar.add_argument(
+        "--por-host", type=int, default=MAX_POR_HOST, help="Requisições simultâneas por host."
+    )
+    verificar.add_argument(
+        "--taxa-por-dominio", type=float, default=TAXA_POR_DOMINIO, help="Requisições por segundo por domínio."
+    )
+    verificar.add_argument("--timeout", type=float, default=TIMEOUT, help="Segundos por tentativa.")
+    verificar.add_argument("--quebrados", action="store_true", help="Mostra só os links quebrados.")
+    verificar.set_defaults(funcao=_comando_verificar)
+
+    exportar = subcomandos.add_parser(
+        "exportar", help="Exporta os favoritos em CSV, JSON Lines, Parquet ou Arrow."
+    )
+    exportar.add_argument("arquivos", nargs="+", help="Arquivos de favoritos exportados.")
+    exportar.add_argument("--saida", required=True, help="Arquivo de destino.")
+    exportar.add_argument(
+        "--formato", choices=list(FORMATOS), default=None, help="Formato (padrão: pela extensão da saída)."
+    )
+    exportar.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="Linhas por lote (row group).")
+    exportar.set_defaults(funcao=_comando_exportar)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Ponto de entrada da linha de comando.
+    """
+    args = criar_parser().parse_args(argv)
+    if args.metricas:
+        metricas.ativar()
+    perfil = perfilar(args.perfil, args.perfil_saida) if args.perfil else contextlib.nullcontext()
+    with perfil:
+        codigo = args.funcao(args)
+    if args.metricas:
+        if args.metricas == "json":
+            texto = json.dumps(metricas.exportar_json(), indent=2, ensure_ascii=False) + "\n"
+        else:
+            texto = metricas.exportar_prometheus()
+        if args.metricas_saida:
+            with open(args.metricas_saida, "w", encoding="utf-8") as arquivo:
+                arquivo.write(texto)
+        else:
+            sys.stderr.write(texto)
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,7 +19,7 @@ class FilePathCheckController:
         self.file_path_check = FilePathCheck(path)
 
         # Verifica a existência do caminho já na inicialização
-        if not self.file_path_check.path.exists():
+        if not self.file_path_check.path_exists():
             raise FileNotFoundError(f"O caminho '{path}' não existe.")
 
     def is_a_real_file(self):
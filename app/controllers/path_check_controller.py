@@ -46,13 +46,21 @@ class PathCheckController:
     def get_path_timing(self):
         """
         Obtém as datas de último acesso, última modificação e criação do caminho.
+        As três datas vêm da mesma leitura dos metadados.
         """
+        stats = self.path_check.get_metadata()
         return {
-            "path_creation_time": self.path_check.get_creation_time(),
-            "path_modification_time": self.path_check.get_modification_time(),
-            "path_access_time": self.path_check.get_access_time(),
+            "path_creation_time": stats.st_ctime if stats else None,
+            "path_modification_time": stats.st_mtime if stats else None,
+            "path_access_time": stats.st_atime if stats else None,
         }
 
+    def refresh(self):
+        """
+        Descarta os metadados em cache do caminho.
+        """
+        self.path_check.refresh()
+
     def validate_path(self):
         """
         Valida se o caminho existe e é utilizável (leitura e escrita).
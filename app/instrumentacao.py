@@ -0,0 +1,291 @@
+# app/instrumentacao.py
+
+"""
+Instrumentação leve das etapas do pipeline (verificação de caminhos,
+análise do HTML, formatação de timestamps, ingestão).
+
+As etapas informam ao registro global `metricas` cronômetros, contadores e
+histogramas com nome e rótulos opcionais. O registro começa desligado: nesse
+estado cada ponto de medição custa uma checagem de atributo e, nos
+cronômetros, um gerenciador de contexto que não faz nada. Ligado, ele exporta
+as medições em JSON ou no formato de texto do Prometheus. As medições valem
+para o processo atual; as dos workers de um `ProcessPoolExecutor` ficam nos
+workers.
+
+`perfilar` captura um perfil do cProfile ou do tracemalloc de uma única
+execução (ver a opção --perfil da linha de comando).
+"""
+
+import cProfile
+import functools
+import io
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+LIMITES_PADRAO = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0, 100.0)
+PREFIXO_PROMETHEUS = "bookmarkhunter"
+MODOS_PERFIL = ("cprofile", "tracemalloc")
+
+_Chave = Tuple[str, Tuple[Tuple[str, str], ...]]
+_NOME_INVALIDO = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+class _Histograma:
+    __slots__ = ("limites", "contagens", "quantidade", "soma", "minimo", "maximo")
+
+    def __init__(self, limites: Sequence[float]) -> None:
+        self.limites = tuple(limites)
+        self.contagens = [0] * (len(self.limites) + 1)  # A última é o +Inf
+        self.quantidade = 0
+        self.soma = 0.0
+        self.minimo = float("inf")
+        self.maximo = float("-inf")
+
+    def observar(self, valor: float) -> None:
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.quantidade += 1
+        self.soma += valor
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+
+
+class _CronometroNulo:
+    __slots__ = ()
+
+    def __enter__(self) -> "_CronometroNulo":
+        return self
+
+    def __exit__(self, *_) -> bool:
+        return False
+
+
+_NULO = _CronometroNulo()
+
+
+class _Cronometro:
+    __slots__ = ("_registro", "_chave", "_inicio")
+
+    def __init__(self, registro: "RegistroMetricas", chave: _Chave) -> None:
+        self._registro = registro
+        self._chave = chave
+        self._inicio = 0.0
+
+    def __enter__(self) -> "_Cronometro":
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *_) -> bool:
+        self._registro._observar(self._chave, time.perf_counter() - self._inicio, LIMITES_PADRAO)
+        return False
+
+
+def _chave(nome: str, rotulos: Dict[str, Any]) -> _Chave:
+    return nome, tuple(sorted((rotulo, str(valor)) for rotulo, valor in rotulos.items()))
+
+
+class RegistroMetricas:
+    """
+    Contadores e histogramas nomeados, com rótulos opcionais.
+    """
+
+    def __init__(self, ativo: bool = False) -> None:
+        self.ativo = ativo
+        self._trava = threading.Lock()
+        self._contadores: Dict[_Chave, float] = {}
+        self._histogramas: Dict[_Chave, _Histograma] = {}
+
+    def ativar(self) -> None:
+        """
+        Liga a coleta.
+        """
+        self.ativo = True
+
+    def desativar(self) -> None:
+        """
+        Desliga a coleta; o que já foi medido continua disponível.
+        """
+        self.ativo = False
+
+    def limpar(self) -> None:
+        """
+        Descarta todas as medições.
+        """
+        with self._trava:
+            self._contadores.clear()
+            self._histogramas.clear()
+
+    def contar(self, nome: str, valor: float = 1, **rotulos: Any) -> None:
+        """
+        Soma `valor` ao contador.
+        """
+        if not self.ativo:
+            return
+        chave = _chave(nome, rotulos)
+        with self._trava:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def observar(self, nome: str, valor: float, limites: Sequence[float] = LIMITES_PADRAO, **rotulos: Any) -> None:
+        """
+        Registra um valor no histograma. Os `limites` dos baldes valem a
+        partir da primeira observação.
+        """
+        if self.ativo:
+            self._observar(_chave(nome, rotulos), valor, limites)
+
+    def _observar(self, chave: _Chave, valor: float, limites: Sequence[float]) -> None:
+        with self._trava:
+            histograma = self._histogramas.get(chave)
+            if histograma is None:
+                histograma = self._histogramas[chave] = _Histograma(limites)
+            histograma.observar(valor)
+
+    def cronometro(self, nome: str, **rotulos: Any):
+        """
+        Gerenciador de contexto que registra a duração do bloco, em
+        segundos, no histograma `<nome>_segundos`.
+        """
+        if not self.ativo:
+            return _NULO
+        return _Cronometro(self, _chave(f"{nome}_segundos", rotulos))
+
+    def cronometrar(self, nome: str) -> Callable[[Callable], Callable]:
+        """
+        Decorador que mede cada chamada da função com `cronometro(nome)`.
+        """
+
+        def decorador(funcao: Callable) -> Callable:
+            @functools.wraps(funcao)
+            def medida(*args, **kwargs):
+                if not self.ativo:
+                    return funcao(*args, **kwargs)
+                with self.cronometro(nome):
+                    return funcao(*args, **kwargs)
+
+            return medida
+
+        return decorador
+
+    def exportar_json(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retorna as medições num dicionário serializável em JSON.
+        """
+        with self._trava:
+            contadores = [
+                {"nome": nome, "rotulos": dict(rotulos), "valor": valor}
+                for (nome, rotulos), valor in sorted(self._contadores.items())
+            ]
+            histogramas = [
+                {
+                    "nome": nome,
+                    "rotulos": dict(rotulos),
+                    "quantidade": histograma.quantidade,
+                    "soma": histograma.soma,
+                    "media": histograma.soma / histograma.quantidade,
+                    "minimo": histograma.minimo,
+                    "maximo": histograma.maximo,
+                    "baldes": {
+                        str(limite): contagem
+                        for limite, contagem in zip(histograma.limites + ("+Inf",), histograma.contagens)
+                    },
+                }
+                for (nome, rotulos), histograma in sorted(self._histogramas.items())
+            ]
+        return {"contadores": contadores, "histogramas": histogramas}
+
+    def exportar_prometheus(self, prefixo: str = PREFIXO_PROMETHEUS) -> str:
+        """
+        Retorna as medições no formato de texto do Prometheus (contadores com
+        o sufixo _total, histogramas com baldes cumulativos).
+        """
+
+        def nome_metrica(nome: str) -> str:
+            return _NOME_INVALIDO.sub("_", f"{prefixo}_{nome}" if prefixo else nome)
+
+        def rotulos_texto(rotulos, extra=()) -> str:
+            pares = [
+                rotulo + '="' + valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                for rotulo, valor in tuple(rotulos) + tuple(extra)
+            ]
+            return "{" + ",".join(pares) + "}" if pares else ""
+
+        linhas: List[str] = []
+        with self._trava:
+            tipos_escritos = set()
+            for (nome, rotulos), valor in sorted(self._contadores.items()):
+                metrica = nome_metrica(nome) + "_total"
+                if metrica not in tipos_escritos:
+                    linhas.append(f"# TYPE {metrica} counter")
+                    tipos_escritos.add(metrica)
+                linhas.append(f"{metrica}{rotulos_texto(rotulos)} {valor}")
+            for (nome, rotulos), histograma in sorted(self._histogramas.items()):
+                metrica = nome_metrica(nome)
+                if metrica not in tipos_escritos:
+                    linhas.append(f"# TYPE {metrica} histogram")
+                    tipos_escritos.add(metrica)
+                acumulado = 0
+                for limite, contagem in zip(histograma.limites + ("+Inf",), histograma.contagens):
+                    acumulado += contagem
+                    linhas.append(f"{metrica}_bucket{rotulos_texto(rotulos, (('le', str(limite)),))} {acumulado}")
+                linhas.append(f"{metrica}_sum{rotulos_texto(rotulos)} {histograma.soma}")
+                linhas.append(f"{metrica}_count{rotulos_texto(rotulos)} {histograma.quantidade}")
+        return "\n".join(linhas) + "\n" if linhas else ""
+
+
+metricas = RegistroMetricas()
+
+
+@contextmanager
+def perfilar(modo: str, saida: Optional[str] = None, relatorio: Optional[TextIO] = None,
+             limite: int = 25) -> Iterator[None]:
+    """
+    Captura o perfil do bloco e escreve um resumo em `relatorio` (padrão:
+    stderr).
+
+    Args:
+        modo: "cprofile" (tempo por função) ou "tracemalloc" (memória
+            alocada por linha e pico).
+        saida: Arquivo para os dados completos: estatísticas do pstats no
+            modo cprofile, snapshot do tracemalloc no outro.
+        relatorio: Fluxo de texto do resumo.
+        limite: Linhas do resumo.
+    """
+    if modo not in MODOS_PERFIL:
+        raise ValueError(f"Modo de perfil inválido. Use um destes: {MODOS_PERFIL}")
+    relatorio = relatorio or sys.stderr
+    if modo == "cprofile":
+        perfil = cProfile.Profile()
+        perfil.enable()
+        try:
+            yield
+        finally:
+            perfil.disable()
+            if saida:
+                perfil.dump_stats(saida)
+            texto = io.StringIO()
+            pstats.Stats(perfil, stream=texto).sort_stats("cumulative").print_stats(limite)
+            relatorio.write(texto.getvalue())
+        return
+
+    ja_ativo = tracemalloc.is_tracing()
+    if not ja_ativo:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        atual, pico = tracemalloc.get_traced_memory()
+        fotografia = tracemalloc.take_snapshot()
+        if not ja_ativo:
+            tracemalloc.stop()
+        if saida:
+            fotografia.dump(saida)
+        relatorio.write(f"tracemalloc: atual={atual / 2**20:.1f} MiB pico={pico / 2**20:.1f} MiB\n")
+        for estatistica in fotografia.statistics("lineno")[:limite]:
+            relatorio.write(f"{estatistica}\n")
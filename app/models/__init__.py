@@ -3,13 +3,14 @@ Este modelo de arquivo inicializa os objetos usados.
 """
 
 
-from .path_check import PathCheck
+from .path_check import PathCheck, PathSnapshot
 from .file_path_check import FilePathCheck
 from .folder_path_check import FolderPathCheck
 
 
 __all__ = [
     "PathCheck",
+    "PathSnapshot",
     "FilePathCheck",
     "FolderPathCheck",
 ]
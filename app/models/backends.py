@@ -0,0 +1,208 @@
+# pylint: disable=C0114, C0115
+
+"""
+Backends de análise do `AnalisadorHTML.extrair_tags` para conteúdo em texto.
+
+Todos seguem o mesmo contrato: primeiro os registros de todas as tags <H3>,
+depois os de todas as tags <A>, com os campos de `registro_h3` e
+`registro_a` e os valores de atributo decodificados como o BeautifulSoup
+com o "html.parser" faria.
+
+    "regex": varredor com expressões regulares para exportações Netscape
+        bem formadas (DOCTYPE do Netscape, atributos entre aspas duplas,
+        nenhum "<" solto). Qualquer desvio gera `ConteudoNaoSuportado`.
+    "lxml": parser HTML do lxml com um alvo que só recebe as tags de
+        abertura, sem montar a árvore.
+    "tokenizador": o tokenizador do `AnalisadorHTMLStream` (html.parser da
+        biblioteca padrão, sem o BeautifulSoup).
+    "bs4_lxml" e "bs4": BeautifulSoup com o lxml ou com o html.parser.
+
+Na seleção automática (`ORDEM_AUTOMATICA`) vale o primeiro backend que
+estiver instalado e aceitar o conteúdo.
+"""
+
+import importlib.util
+import re
+from html import unescape
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from app.models.registros import registro_a, registro_h3
+from app.models.stream_parser import AnalisadorHTMLStream
+
+ORDEM_AUTOMATICA = ("regex", "lxml", "tokenizador")
+
+_DOCTYPE_NETSCAPE = re.compile(r"\ufeff?\s*<!DOCTYPE\s+NETSCAPE-Bookmark-file-1\s*>", re.IGNORECASE)
+_TOKEN_ESTRITO = re.compile(
+    r"""
+    <(?:
+        !--.*?--                                       # comentário
+      | ![a-zA-Z][^<>]*                                # declaração
+      | /[a-zA-Z][a-zA-Z0-9]*\s*                       # tag de fechamento
+      | ([a-zA-Z][a-zA-Z0-9]*)                         # tag de abertura
+        ((?:\s+[a-zA-Z_:][-a-zA-Z0-9_:.]*(?:\s*=\s*"[^"]*")?)*)
+        \s*/?
+    )>
+    | (<)                                              # qualquer outro "<"
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_ATRIBUTO_ESTRITO = re.compile(r'([a-zA-Z_:][-a-zA-Z0-9_:.]*)(?:\s*=\s*"([^"]*)")?')
+_ELEMENTOS_CDATA = ("script", "style")
+
+
+class ConteudoNaoSuportado(ValueError):
+    """
+    O backend não aceita este conteúdo; a seleção automática passa ao próximo.
+    """
+
+
+def _ordenar(registros) -> List[Dict[str, str]]:
+    pastas, links = [], []
+    for registro in registros:
+        (pastas if registro["tag"] == "H3" else links).append(registro)
+    return pastas + links
+
+
+def _atributos_estritos(texto: str) -> Dict[str, str]:
+    atributos = {}
+    for nome, valor in _ATRIBUTO_ESTRITO.findall(texto):
+        # O findall devolve "" tanto para valor ausente quanto para vazio
+        atributos[nome.lower()] = unescape(valor) if "&" in valor else valor
+    return atributos
+
+
+def extrair_regex(html_conteudo: str) -> List[Dict[str, str]]:
+    """
+    Varredor rápido para exportações Netscape bem formadas.
+    """
+    if not _DOCTYPE_NETSCAPE.match(html_conteudo):
+        raise ConteudoNaoSuportado("O conteúdo não começa com o DOCTYPE do Netscape.")
+    pastas, links = [], []
+    for token in _TOKEN_ESTRITO.finditer(html_conteudo):
+        tag, atributos, solto = token.groups()
+        if solto is not None:
+            raise ConteudoNaoSuportado(f"Marcação fora do padrão na posição {token.start()}.")
+        if tag is None:
+            continue
+        tag = tag.lower()
+        if tag == "a":
+            links.append(registro_a(_atributos_estritos(atributos)))
+        elif tag == "h3":
+            pastas.append(registro_h3(_atributos_estritos(atributos)))
+        elif tag in _ELEMENTOS_CDATA:
+            raise ConteudoNaoSuportado(f"Elemento <{tag}> não é esperado numa exportação.")
+    return pastas + links
+
+
+class _AlvoLxml:
+    """
+    Alvo do parser do lxml: recebe os eventos sem que a árvore seja montada.
+    """
+
+    def __init__(self) -> None:
+        self.registros: List[Dict[str, str]] = []
+
+    def start(self, tag, atributos) -> None:
+        if tag in ("a", "h3"):
+            valores = {nome.lower(): valor or "" for nome, valor in atributos.items()}
+            self.registros.append(registro_a(valores) if tag == "a" else registro_h3(valores))
+
+    def end(self, tag) -> None:
+        pass
+
+    def data(self, dados) -> None:
+        pass
+
+    def close(self) -> List[Dict[str, str]]:
+        return self.registros
+
+
+def extrair_lxml(html_conteudo: str) -> List[Dict[str, str]]:
+    """
+    Parser HTML do lxml com um alvo (sem árvore).
+    """
+    from lxml import etree  # pylint: disable=C0415
+
+    parser = etree.HTMLParser(target=_AlvoLxml(), huge_tree=True)
+    parser.feed(html_conteudo)
+    return _ordenar(parser.close())
+
+
+def extrair_tokenizador(html_conteudo: str) -> List[Dict[str, str]]:
+    """
+    Tokenizador do `AnalisadorHTMLStream` (html.parser sem o BeautifulSoup).
+    """
+    return AnalisadorHTMLStream.de_texto(html_conteudo).extrair_tags()
+
+
+def _extrair_bs4(html_conteudo: str, construtor: str) -> List[Dict[str, str]]:
+    from bs4 import BeautifulSoup  # pylint: disable=C0415
+
+    soup = BeautifulSoup(html_conteudo, construtor)
+    return [registro_h3(h3) for h3 in soup.find_all("h3")] + [registro_a(a) for a in soup.find_all("a")]
+
+
+def extrair_bs4_lxml(html_conteudo: str) -> List[Dict[str, str]]:
+    """
+    BeautifulSoup com o construtor do lxml.
+    """
+    # O bs4 só avisa que falta o lxml ao criar a árvore, com outra exceção
+    if importlib.util.find_spec("lxml") is None:
+        raise ImportError("O backend 'bs4_lxml' exige o pacote lxml.")
+    return _extrair_bs4(html_conteudo, "lxml")
+
+
+def extrair_bs4(html_conteudo: str) -> List[Dict[str, str]]:
+    """
+    BeautifulSoup com o "html.parser" (o comportamento original).
+    """
+    return _extrair_bs4(html_conteudo, "html.parser")
+
+
+BACKENDS: Dict[str, Callable[[str], List[Dict[str, str]]]] = {
+    "regex": extrair_regex,
+    "lxml": extrair_lxml,
+    "tokenizador": extrair_tokenizador,
+    "bs4_lxml": extrair_bs4_lxml,
+    "bs4": extrair_bs4,
+}
+_DEPENDENCIAS = {"lxml": "lxml", "bs4_lxml": "lxml", "bs4": "bs4"}
+
+
+def backend_disponivel(nome: str) -> bool:
+    """
+    Indica se as bibliotecas de que o backend precisa estão instaladas.
+    """
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend inválido. Use um destes: {sorted(BACKENDS)}")
+    dependencia = _DEPENDENCIAS.get(nome)
+    return dependencia is None or importlib.util.find_spec(dependencia) is not None
+
+
+def extrair_tags(
+    html_conteudo: str, backend: Optional[Union[str, Sequence[str]]] = None
+) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    Extrai os registros com o primeiro backend que funcionar e retorna
+    (nome do backend usado, registros).
+
+    Args:
+        html_conteudo: Conteúdo HTML já decodificado.
+        backend: Nome de um backend, uma sequência de nomes em ordem de
+            preferência ou None para `ORDEM_AUTOMATICA`. Com um único nome, os
+            erros dele não são tratados.
+    """
+    if isinstance(backend, str):
+        backend_disponivel(backend)
+        return backend, BACKENDS[backend](html_conteudo)
+    ordem = ORDEM_AUTOMATICA if backend is None else tuple(backend)
+    if not ordem:
+        raise ValueError("Informe ao menos um backend.")
+    for nome in ordem:
+        if not backend_disponivel(nome):
+            continue
+        try:
+            return nome, BACKENDS[nome](html_conteudo)
+        except ConteudoNaoSuportado:
+            continue
+    raise ConteudoNaoSuportado(f"Nenhum backend disponível aceitou o conteúdo: {list(ordem)}")
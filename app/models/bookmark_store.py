@@ -0,0 +1,311 @@
+# pylint: disable=C0114, C0115
+
+"""
+Armazenamento compacto, em colunas, dos registros extraídos dos favoritos.
+
+Cada registro do `AnalisadorHTML` é um dicionário com 4 ou 5 chaves; com
+centenas de milhares de links o custo dos dicionários passa de centenas de
+MB. O `BookmarkStore` guarda os mesmos dados em colunas:
+- timestamps como inteiros em `array('q')`;
+- hosts, ícones, caminhos de pasta e a flag de barra de favoritos
+  codificados em dicionário (cada valor distinto é guardado uma única vez);
+- URLs e títulos internados localmente;
+- identificadores de pasta como inteiros pequenos em `array('i')`.
+
+Os registros originais continuam disponíveis por `to_dict()` e pela
+iteração, com as mesmas chaves e valores.
+"""
+
+import re
+from array import array
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+TAG_H3 = 0
+TAG_A = 1
+
+_SEM_VALOR = -(2**63)  # Atributo vazio ("")
+_FORA_DO_PADRAO = _SEM_VALOR + 1  # Valor não numérico, guardado à parte
+_SEM_PASTA = -1
+_MAX_Q = 2**63 - 1  # Maior valor de um array('q')
+
+# URLs comuns ("esquema://[usuário@]host[:porta][/?#...]"), sem espaços nem
+# colchetes; as demais passam pelo `urlsplit`, que é bem mais lento
+_HOST_SIMPLES = re.compile(
+    r"[A-Za-z][A-Za-z0-9+.-]*://(?:[^/?#@\[\]\s]*@)?([^/?#:@\[\]\s]*)(?=[/?#:]|\Z)"
+)
+
+
+def extrair_host(href: str) -> str:
+    """
+    Retorna o host (em minúsculas) de uma URL, ou "" se não houver.
+    """
+    simples = _HOST_SIMPLES.match(href)
+    if simples is not None:
+        return simples.group(1).lower()
+    try:
+        return urlsplit(href).hostname or ""
+    except ValueError:
+        return ""
+
+
+class _ColunaCategorica:
+    """
+    Coluna codificada em dicionário: guarda cada valor distinto uma vez e
+    um código inteiro por linha.
+    """
+
+    __slots__ = ("valores", "codigos", "_posicoes", "_indice")
+
+    def __init__(self) -> None:
+        self.valores: List[Hashable] = []
+        self.codigos = array("i")
+        self._posicoes: Dict[Hashable, int] = {}
+        self._indice: Optional[Dict[int, array]] = None
+
+    def anexar(self, valor: Hashable) -> None:
+        codigo = self._posicoes.get(valor)
+        if codigo is None:
+            codigo = self._posicoes[valor] = len(self.valores)
+            self.valores.append(valor)
+        self.codigos.append(codigo)
+        self._indice = None
+
+    def __getitem__(self, linha: int) -> Hashable:
+        return self.valores[self.codigos[linha]]
+
+    def linhas_com(self, valor: Hashable) -> array:
+        """
+        Retorna as linhas que têm o valor, usando um índice invertido
+        construído na primeira consulta.
+        """
+        codigo = self._posicoes.get(valor)
+        if codigo is None:
+            return array("l")
+        if self._indice is None:
+            self._indice = {}
+            for linha, atual in enumerate(self.codigos):
+                self._indice.setdefault(atual, array("l")).append(linha)
+        return self._indice.get(codigo, array("l"))
+
+
+class _ColunaTimestamp:
+    """
+    Coluna de timestamps em `array('q')`. Valores que não podem ser
+    reconstruídos a partir do inteiro ficam num dicionário à parte.
+    """
+
+    __slots__ = ("valores", "_fora_do_padrao")
+
+    def __init__(self) -> None:
+        self.valores = array("q")
+        self._fora_do_padrao: Dict[int, str] = {}
+
+    def anexar(self, texto: str) -> None:
+        if not texto:
+            self.valores.append(_SEM_VALOR)
+            return
+        try:
+            numero = int(texto)
+        except ValueError:
+            numero = None
+        if numero is None or str(numero) != texto or not _FORA_DO_PADRAO < numero <= _MAX_Q:
+            self._fora_do_padrao[len(self.valores)] = texto
+            self.valores.append(_FORA_DO_PADRAO)
+        else:
+            self.valores.append(numero)
+
+    def texto(self, linha: int) -> str:
+        numero = self.valores[linha]
+        if numero == _SEM_VALOR:
+            return ""
+        if numero == _FORA_DO_PADRAO:
+            return self._fora_do_padrao[linha]
+        return str(numero)
+
+    def inteiro(self, linha: int) -> Optional[int]:
+        numero = self.valores[linha]
+        return None if numero in (_SEM_VALOR, _FORA_DO_PADRAO) else numero
+
+
+class BookmarkStore:
+    """
+    Coleção compacta de registros de favoritos (tags <H3> e <A>).
+
+    Aceita tanto os registros planos do `AnalisadorHTML` quanto os
+    registros hierárquicos do `AnalisadorHTMLStream(hierarquia=True)`.
+    """
+
+    def __init__(self) -> None:
+        """
+        Inicializa as colunas vazias.
+        """
+        self.hierarchy: Optional[bool] = None
+        self._tags = array("b")
+        self._hrefs: List[str] = []
+        self._titles: List[str] = []
+        self._internados: Dict[str, str] = {}
+        self._hosts = _ColunaCategorica()
+        self._icons = _ColunaCategorica()
+        self._toolbar = _ColunaCategorica()
+        self._paths = _ColunaCategorica()
+        self._add_date = _ColunaTimestamp()
+        self._last_modified = _ColunaTimestamp()
+        self._folder_ids = array("i")
+        self._parent_ids = _ColunaCategorica()
+        self._depths = array("h")
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "BookmarkStore":
+        """
+        Cria o armazenamento a partir de um iterável de registros.
+        """
+        store = cls()
+        store.extend(records)
+        return store
+
+    def _internar(self, texto: str) -> str:
+        return self._internados.setdefault(texto, texto)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """
+        Adiciona um registro ao final do armazenamento.
+        """
+        hierarquico = "PARENT_ID" in record
+        if self.hierarchy is None:
+            self.hierarchy = hierarquico
+        elif self.hierarchy != hierarquico:
+            raise ValueError("Não é possível misturar registros planos e hierárquicos.")
+
+        if record["tag"] == "H3":
+            self._tags.append(TAG_H3)
+            self._hrefs.append("")
+            self._hosts.anexar("")
+            self._icons.anexar("")
+            self._last_modified.anexar(record.get("LAST_MODIFIED", ""))
+            self._toolbar.anexar(record.get("PERSONAL_TOOLBAR_FOLDER", ""))
+            self._folder_ids.append(record.get("FOLDER_ID", _SEM_PASTA))
+        elif record["tag"] == "A":
+            href = self._internar(record.get("HREF", ""))
+            self._tags.append(TAG_A)
+            self._hrefs.append(href)
+            self._hosts.anexar(extrair_host(href))
+            self._icons.anexar(record.get("ICON", ""))
+            self._last_modified.anexar("")
+            self._toolbar.anexar("")
+            self._folder_ids.append(_SEM_PASTA)
+        else:
+            raise ValueError(f"Tag não suportada: {record['tag']!r}")
+
+        self._add_date.anexar(record.get("ADD_DATE", ""))
+        if hierarquico:
+            self._titles.append(self._internar(record.get("TITLE", "")))
+            self._paths.anexar(tuple(record.get("PATH", ())))
+            self._parent_ids.anexar(record["PARENT_ID"])
+            self._depths.append(record.get("DEPTH", 0))
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Adiciona vários registros ao final do armazenamento.
+        """
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.records(range(len(self)))
+
+    def records(self, rows: Iterable[int]) -> Iterator[Dict[str, Any]]:
+        """
+        Gera os registros das linhas informadas, no formato original.
+        """
+        for row in rows:
+            yield self.to_dict(row)
+
+    def to_dict(self, row: int) -> Dict[str, Any]:
+        """
+        Reconstrói o registro da linha no mesmo formato do `AnalisadorHTML`.
+        """
+        if self._tags[row] == TAG_H3:
+            record: Dict[str, Any] = {
+                "tag": "H3",
+                "ADD_DATE": self._add_date.texto(row),
+                "LAST_MODIFIED": self._last_modified.texto(row),
+                "PERSONAL_TOOLBAR_FOLDER": self._toolbar[row],
+            }
+            if self.hierarchy:
+                record["FOLDER_ID"] = self._folder_ids[row]
+        else:
+            record = {
+                "tag": "A",
+                "HREF": self._hrefs[row],
+                "ADD_DATE": self._add_date.texto(row),
+                "ICON": self._icons[row],
+            }
+        if self.hierarchy:
+            record["PARENT_ID"] = self._parent_ids[row]
+            record["DEPTH"] = self._depths[row]
+            record["PATH"] = self._paths[row]
+            record["TITLE"] = self._titles[row]
+        return record
+
+    def host(self, row: int) -> str:
+        """
+        Retorna o host do link da linha ("" para pastas).
+        """
+        return self._hosts[row]
+
+    def add_date(self, row: int) -> Optional[int]:
+        """
+        Retorna o ADD_DATE da linha como inteiro, ou None.
+        """
+        return self._add_date.inteiro(row)
+
+    def hosts(self) -> List[str]:
+        """
+        Retorna a lista de hosts distintos.
+        """
+        return [host for host in self._hosts.valores if host]
+
+    def filter(
+        self,
+        tag: Optional[str] = None,
+        host: Optional[str] = None,
+        parent_id: Optional[int] = None,
+        add_date_min: Optional[int] = None,
+        add_date_max: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Retorna as linhas que atendem a todos os critérios informados.
+
+        Os filtros por host e por pasta usam índices invertidos; os filtros
+        por tag e por intervalo de ADD_DATE percorrem as colunas compactas.
+        """
+        candidatas: Optional[Iterable[int]] = None
+        if host is not None:
+            candidatas = self._hosts.linhas_com(host.lower())
+        if parent_id is not None:
+            if not self.hierarchy:
+                raise ValueError("O filtro por pasta exige registros hierárquicos.")
+            linhas = self._parent_ids.linhas_com(parent_id)
+            if candidatas is None:
+                candidatas = linhas
+            else:
+                conjunto = set(linhas)
+                candidatas = [linha for linha in candidatas if linha in conjunto]
+        if candidatas is None:
+            candidatas = range(len(self))
+
+        resultado = list(candidatas)
+        if tag is not None:
+            codigo = TAG_H3 if tag.upper() == "H3" else TAG_A
+            tags = self._tags
+            resultado = [linha for linha in resultado if tags[linha] == codigo]
+        if add_date_min is not None or add_date_max is not None:
+            minimo = add_date_min if add_date_min is not None else _FORA_DO_PADRAO + 1
+            maximo = add_date_max if add_date_max is not None else 2**63 - 1
+            datas = self._add_date.valores
+            resultado = [linha for linha in resultado if minimo <= datas[linha] <= maximo]
+        return resultado
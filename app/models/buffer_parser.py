@@ -0,0 +1,263 @@
+# pylint: disable=C0114, C0115
+
+"""
+Varredor de favoritos que trabalha diretamente sobre um buffer de bytes.
+
+Pensado para arquivos mapeados em memória (`mmap`): o conteúdo nunca é
+decodificado por inteiro. O varredor localiza as tags nos bytes e só
+decodifica os valores de atributo (e os títulos, no modo hierárquico)
+quando o registro é montado. Os registros são produzidos pelos mesmos
+tokenizadores do `AnalisadorHTMLStream`, então o resultado é idêntico.
+
+As expressões regulares seguem as do módulo `html.parser`, em bytes (ver
+`app.models.tokenizador`).
+"""
+
+import re
+from html import unescape
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.models.icones import ICONES_COMPLETOS, MODOS_ICONES, ReferenciaIcone, TabelaIcones
+from app.models.tokenizador import ATRIBUTO_BYTES, NOME_TAG_BYTES, TokenizadorFavoritos, TokenizadorHierarquico
+
+_FIM_TAG_ABERTURA = re.compile(
+    rb"""
+  <[a-zA-Z][^\t\n\r\f />\x00]*       # nome da tag
+  (?:[\s/]*                          # espacos antes do nome do atributo
+    (?:(?<=['"\s/])[^\s/>][^\s/=>]*  # nome do atributo
+      (?:\s*=+\s*                    # indicador de valor
+        (?:'[^']*'                   # valor entre aspas simples
+          |"[^"]*"                   # valor entre aspas duplas
+          |(?!['"])[^>\s]*           # valor sem aspas
+         )
+        \s*
+       )?(?:\s|/(?!>))*
+     )*
+   )?
+  \s*
+""",
+    re.VERBOSE,
+)
+_NAO_ESPACO = re.compile(rb"\S")
+_ELEMENTOS_CDATA = (b"script", b"style")
+
+
+def limites_tag_abertura(buffer, menor: int, fim: int) -> Tuple[int, int, bool]:
+    """
+    Localiza os limites da tag de abertura que começa em `menor`.
+
+    Returns:
+        Tuple[int, int, bool]: o fim da área de atributos, a posição logo
+        após a tag e se a tag é autocontida (<a ... />).
+    """
+    final = _FIM_TAG_ABERTURA.match(buffer, menor, fim).end()
+    autocontida = buffer[final:final + 2] == b"/>"
+    if autocontida:
+        depois = final + 2
+    elif buffer[final:final + 1] == b">":
+        depois = final + 1
+    else:
+        # Tag malformada: considera o próximo ">" como fechamento
+        fechamento = buffer.find(b">", final, fim)
+        depois = fim if fechamento < 0 else fechamento + 1
+    return final, depois, autocontida
+
+
+class _AtributosBrutos:
+    """
+    Atributos de uma tag guardados como intervalos do buffer. Os valores só
+    são decodificados quando lidos por `get`.
+    """
+
+    __slots__ = ("_buffer", "_intervalos", "_encoding")
+
+    def __init__(self, buffer, intervalos: Dict[str, Optional[Tuple[int, int]]], encoding):
+        self._buffer = buffer
+        self._intervalos = intervalos
+        self._encoding = encoding
+
+    def get(self, nome: str, padrao=None):
+        if nome not in self._intervalos:
+            return padrao
+        intervalo = self._intervalos[nome]
+        if intervalo is None:
+            return ""
+        valor = self._buffer[intervalo[0]:intervalo[1]].decode(self._encoding)
+        return unescape(valor) if "&" in valor else valor
+
+    def referenciar(self, nome: str):
+        """
+        Cria uma referência preguiçosa ao valor do atributo, ou "" se vazio.
+        """
+        intervalo = self._intervalos.get(nome)
+        if intervalo is None or not _NAO_ESPACO.search(self._buffer, *intervalo):
+            return ""
+        inicio, fim = intervalo
+        return ReferenciaIcone(self._buffer, inicio, fim - inicio, self._encoding)
+
+
+class AnalisadorBuffer:
+    """
+    Analisador de favoritos sobre um buffer de bytes (bytes, bytearray ou
+    mmap), com as mesmas opções do `AnalisadorHTMLStream`.
+
+    `inicio` e `fim` limitam a varredura a um trecho do buffer. No modo
+    hierárquico, `estado_inicial` retoma a árvore de pastas de onde um trecho
+    anterior parou e, ao fim da iteração, `estado_final` guarda o estado
+    alcançado (ver `TokenizadorHierarquico.estado`).
+    """
+
+    def __init__(
+        self,
+        buffer,
+        encoding: str = "utf-8",
+        hierarquia: bool = False,
+        icones: str = ICONES_COMPLETOS,
+        tabela_icones: Optional[TabelaIcones] = None,
+        inicio: int = 0,
+        fim: Optional[int] = None,
+        estado_inicial: Optional[tuple] = None,
+    ) -> None:
+        """
+        Inicializa o analisador com o buffer e as opções de extração.
+        """
+        if icones not in MODOS_ICONES:
+            raise ValueError(f"Modo de ícones inválido. Use um dos seguintes: {MODOS_ICONES}")
+        if tabela_icones is not None and icones != ICONES_COMPLETOS:
+            raise ValueError("A tabela de ícones só se aplica ao modo 'completo'.")
+        self.buffer = buffer
+        self.encoding = encoding
+        self.hierarquia = hierarquia
+        self.icones = icones
+        self.tabela_icones = tabela_icones
+        self.inicio = inicio
+        self.fim = len(buffer) if fim is None else fim
+        self.estado_inicial = estado_inicial
+        self.estado_final: Optional[tuple] = None
+
+    def _novo_tokenizador(self) -> TokenizadorFavoritos:
+        opcoes = {
+            "icones": self.icones,
+            "tabela_icones": self.tabela_icones,
+            "fonte_icones": self.buffer,
+            "encoding": self.encoding,
+        }
+        if not self.hierarquia:
+            return TokenizadorFavoritos(**opcoes)
+        tokenizador = TokenizadorHierarquico(**opcoes)
+        if self.estado_inicial is not None:
+            tokenizador.restaurar(self.estado_inicial)
+        return tokenizador
+
+    def _texto(self, inicio: int, fim: int) -> str:
+        texto = self.buffer[inicio:fim].decode(self.encoding)
+        return unescape(texto) if "&" in texto else texto
+
+    def _atributos(self, inicio: int, fim: int) -> _AtributosBrutos:
+        """
+        Localiza os atributos da tag entre `inicio` e `fim` sem decodificá-los.
+        """
+        intervalos: Dict[str, Optional[Tuple[int, int]]] = {}
+        buffer = self.buffer
+        posicao = inicio
+        while posicao < fim:
+            atributo = ATRIBUTO_BYTES.match(buffer, posicao, fim)
+            if not atributo:
+                break
+            nome = atributo.group(1).decode("latin-1").lower()
+            if not atributo.group(2):
+                intervalos[nome] = None
+            else:
+                valor_inicio, valor_fim = atributo.span(3)
+                aspas = buffer[valor_inicio:valor_inicio + 1]
+                if aspas in (b"'", b'"') and buffer[valor_fim - 1:valor_fim] == aspas:
+                    valor_inicio, valor_fim = valor_inicio + 1, max(valor_inicio + 1, valor_fim - 1)
+                intervalos[nome] = (valor_inicio, valor_fim)
+            posicao = atributo.end()
+        return _AtributosBrutos(buffer, intervalos, self.encoding)
+
+    def _eventos(self, tokenizador: TokenizadorFavoritos) -> Iterator[None]:
+        """
+        Percorre o buffer e repassa as tags ao tokenizador. Gera um valor a
+        cada tag para que os registros pendentes sejam entregues aos poucos.
+        """
+        buffer, fim = self.buffer, self.fim
+        posicao = self.inicio
+        while posicao < fim:
+            menor = buffer.find(b"<", posicao, fim)
+            if menor < 0:
+                menor = fim
+            if menor > posicao and tokenizador.aguardando_texto():
+                tokenizador.handle_data(self._texto(posicao, menor))
+            if menor >= fim:
+                break
+
+            proximo = buffer[menor + 1:menor + 2]
+            if buffer[menor:menor + 4] == b"<!--":
+                # Comentário: ignorado até o fechamento
+                final = buffer.find(b"-->", menor + 4, fim)
+                posicao = fim if final < 0 else final + 3
+            elif proximo == b"/":
+                nome = NOME_TAG_BYTES.match(buffer, menor + 2, fim)
+                final = buffer.find(b">", menor + 2, fim)
+                posicao = fim if final < 0 else final + 1
+                if nome:
+                    tokenizador.handle_endtag(nome.group(1).decode("latin-1").lower())
+            elif proximo.isalpha():
+                posicao = self._tag_abertura(tokenizador, menor)
+                yield None
+            elif proximo in (b"!", b"?"):
+                # Declarações (<!DOCTYPE ...>) e instruções de processamento
+                final = buffer.find(b">", menor + 2, fim)
+                posicao = fim if final < 0 else final + 1
+            else:
+                if tokenizador.aguardando_texto():
+                    tokenizador.handle_data("<")
+                posicao = menor + 1
+
+    def _tag_abertura(self, tokenizador: TokenizadorFavoritos, menor: int) -> int:
+        """
+        Trata a tag de abertura que começa em `menor` e retorna a posição
+        seguinte a ela.
+        """
+        buffer, fim = self.buffer, self.fim
+        nome = NOME_TAG_BYTES.match(buffer, menor + 1, fim)
+        final, depois, autocontida = limites_tag_abertura(buffer, menor, fim)
+
+        tag = nome.group(1).lower()
+        nome_tag = tag.decode("latin-1")
+        tokenizador.iniciar_tag(nome_tag, self._atributos(nome.end(), final))
+        if autocontida:
+            # Tag autocontida (<a ... />): o HTMLParser também a fecha na hora
+            tokenizador.handle_endtag(nome_tag)
+        if tag in _ELEMENTOS_CDATA:
+            # Conteúdo de <script>/<style> não contém tags
+            fechamento = re.compile(rb"</" + tag, re.IGNORECASE).search(buffer, depois, fim)
+            depois = fim if fechamento is None else fechamento.start()
+        return depois
+
+    def iterar_tags(self) -> Iterator[Dict[str, str]]:
+        """
+        Percorre o buffer numa única passada e entrega os registros das tags
+        <H3> e <A> em ordem de documento.
+        """
+        tokenizador = self._novo_tokenizador()
+        pendentes = tokenizador.pendentes
+        for _ in self._eventos(tokenizador):
+            while pendentes:
+                yield pendentes.popleft()
+        tokenizador.close()
+        while pendentes:
+            yield pendentes.popleft()
+        if self.hierarquia:
+            self.estado_final = tokenizador.estado()
+
+    def extrair_tags(self) -> List[Dict[str, str]]:
+        """
+        Extrai os registros na mesma ordem do `AnalisadorHTML.extrair_tags`.
+        """
+        pastas: List[Dict[str, str]] = []
+        links: List[Dict[str, str]] = []
+        for registro in self.iterar_tags():
+            (pastas if registro["tag"] == "H3" else links).append(registro)
+        return pastas + links
@@ -12,18 +12,20 @@ class FilePathCheck(PathCheck):
     Classe para verificar se o caminho é um arquivo válido.
     """
 
-    def is_a_real_file(self):
+    def is_a_real_file(self, allowed_extensions=None):
         """
         Verifica se o caminho é um arquivo real
         e atende a critérios de validação.
+        `allowed_extensions` segue as regras de `has_valid_extension`.
         """
+        snapshot = self.snapshot  # Uma única leitura dos metadados
         return (
-            self.path.exists()  # Verifica se o caminho existe
-            and self.path.is_file()  # Verifica se é um arquivo
-            and not self.path.is_symlink()  # Evita links simbólicos
+            snapshot.exists  # Verifica se o caminho existe
+            and snapshot.is_file  # Verifica se é um arquivo
+            and not snapshot.is_symlink  # Evita links simbólicos
             and self.is_readable()  # Verifica se é legível
             and self.is_writable()  # Verifica se é gravável
-            and self.has_valid_extension()  # Verifica a extensão do arquivo
+            and self.has_valid_extension(allowed_extensions)  # Verifica a extensão do arquivo
             and self.is_not_empty()  # Verifica se o arquivo não está vazio
         )
 
@@ -41,10 +43,13 @@ class FilePathCheck(PathCheck):
         """
         Verifica se o arquivo não está vazio (tamanho maior que 0).
         """
-        return self.path.stat().st_size > 0
+        stats = self.get_metadata()
+        if stats is None:
+            raise FileNotFoundError(f"O caminho '{self.path}' não existe.")
+        return stats.st_size > 0
 
     def get_file_size(self):
         """
         Retorna o tamanho do arquivo em bytes.
         """
-        return self.path.stat().st_size if self.path.is_file() else 0
+        return self.snapshot.stat.st_size if self.snapshot.is_file else 0
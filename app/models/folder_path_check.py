@@ -4,8 +4,29 @@
 Classe para verificar caminhos de pastas.
 """
 
+import os
+from pathlib import Path
+from typing import NamedTuple
+
 from app.models.path_check import PathCheck
 
+SCAN_FILE = "file"
+SCAN_FOLDER = "folder"
+
+
+class ScanEntry(NamedTuple):
+    """
+    Item produzido por `FolderPathCheck.scan`.
+
+    Para arquivos, `size` é o tamanho do arquivo; para pastas, é a soma dos
+    arquivos aceitos em toda a subárvore. `depth` é 0 na pasta inicial.
+    """
+
+    kind: str
+    path: str
+    size: int
+    depth: int
+
 
 class FolderPathCheck(PathCheck):
     """
@@ -16,11 +37,12 @@ class FolderPathCheck(PathCheck):
         """
         Verifica se o caminho é uma pasta real e válida.
         """
+        snapshot = self.snapshot  # Uma única leitura dos metadados
         return (
-            self.path.exists()  # Verifica apenas uma vez a existência
-            and self.path.is_dir()  # Verifica se é um diretório
-            and not self.path.is_file()  # Evita arquivos
-            and not self.path.is_symlink()  # Evita links simbólicos
+            snapshot.exists  # Verifica apenas uma vez a existência
+            and snapshot.is_dir  # Verifica se é um diretório
+            and not snapshot.is_file  # Evita arquivos
+            and not snapshot.is_symlink  # Evita links simbólicos
             and self.is_readable()  # Verifica se pode ser lido
             and self.is_writable()  # Verifica se pode ser escrito
             and self.is_not_empty_folder()  # Checa se a pasta não está vazia
@@ -32,16 +54,85 @@ class FolderPathCheck(PathCheck):
         """
         return any(self.path.iterdir())  # Verifica se existe algum item na pasta
 
+    def scan(self, max_depth=None, extensions=None, follow_symlinks=False, onerror=None):
+        """
+        Percorre a pasta recursivamente com `os.scandir`, numa única passada.
+
+        Gera um `ScanEntry` para cada arquivo e, depois de terminar cada
+        subpasta, um `ScanEntry` com o tamanho total dela; o último item é o
+        resumo da própria pasta. A memória usada depende só da profundidade.
+
+        Args:
+            max_depth: Profundidade máxima (0 lista apenas a própria pasta).
+            extensions: Extensões aceitas (ex.: {".html"}); None aceita todas.
+            follow_symlinks: Se deve entrar em links para pastas. Pastas que já
+                estão no caminho atual (mesmo dispositivo e inode) são ignoradas.
+            onerror: Função chamada com o `OSError` de subpastas ilegíveis.
+        """
+        if extensions is not None:
+            extensions = {extension.lower() for extension in extensions}
+        root = os.fspath(self.path)
+        root_stat = os.stat(root)
+        ancestors = {(root_stat.st_dev, root_stat.st_ino)}
+        # Cada nível guarda: caminho, iterador, profundidade, chave e tamanho
+        stack = [[root, os.scandir(root), 0, None, 0]]
+        try:
+            while stack:
+                level = stack[-1]
+                entry = next(level[1], None)
+                if entry is None:
+                    level[1].close()
+                    stack.pop()
+                    ancestors.discard(level[3])
+                    if stack:
+                        stack[-1][4] += level[4]
+                    yield ScanEntry(SCAN_FOLDER, level[0], level[4], level[2])
+                    continue
+
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if max_depth is not None and level[2] >= max_depth:
+                            continue
+                        key = None
+                        if follow_symlinks:
+                            info = entry.stat()
+                            key = (info.st_dev, info.st_ino)
+                            if key in ancestors:
+                                continue  # Link que volta para um ancestral
+                            ancestors.add(key)
+                        try:
+                            stack.append([entry.path, os.scandir(entry.path), level[2] + 1, key, 0])
+                        except OSError:
+                            ancestors.discard(key)
+                            raise
+                    elif entry.is_file():
+                        if extensions is not None and (
+                            os.path.splitext(entry.name)[1].lower() not in extensions
+                        ):
+                            continue
+                        size = entry.stat().st_size
+                        level[4] += size
+                        yield ScanEntry(SCAN_FILE, entry.path, size, level[2])
+                except OSError as error:
+                    if onerror is not None:
+                        onerror(error)
+        finally:
+            for level in stack:
+                level[1].close()
+
     def list_files(self):
         """
         Retorna uma lista de arquivos dentro da pasta.
         """
-        return [file for file in self.path.iterdir() if file.is_file()]
+        return [
+            Path(entry.path) for entry in self.scan(max_depth=0) if entry.kind == SCAN_FILE
+        ]
 
     def get_folder_size(self):
         """
         Retorna o tamanho total da pasta somando os arquivos dentro.
         """
-        return sum(
-            file.stat().st_size for file in self.path.iterdir() if file.is_file()
-        )
+        for entry in self.scan(max_depth=0):
+            if entry.kind == SCAN_FOLDER:
+                return entry.size
+        return 0
@@ -0,0 +1,120 @@
+# pylint: disable=C0114, C0115
+
+"""
+Tratamento dos ícones (atributo ICON) das tags <A>.
+
+Nas exportações reais os ícones são data URIs em base64 de alguns KB cada e
+ocupam a maior parte da memória dos registros. Este módulo oferece:
+- `ReferenciaIcone`: guarda apenas (posição, tamanho) do valor dentro da
+  fonte e só decodifica o ícone quando ele é acessado;
+- `TabelaIcones`: tabela endereçada por conteúdo que guarda uma única cópia
+  de cada ícone, já que milhares de links compartilham o mesmo favicon.
+"""
+
+import hashlib
+from html import unescape
+from pathlib import Path
+from typing import Dict, Iterator, Tuple, Union
+
+ICONES_COMPLETOS = "completo"
+ICONES_IGNORADOS = "ignorar"
+ICONES_SOB_DEMANDA = "sob_demanda"
+MODOS_ICONES = (ICONES_COMPLETOS, ICONES_IGNORADOS, ICONES_SOB_DEMANDA)
+
+
+class ReferenciaIcone:
+    """
+    Referência preguiçosa ao valor bruto do atributo ICON na fonte.
+
+    A fonte pode ser o texto original (posições em caracteres), um buffer de
+    bytes/mmap ou o caminho do arquivo (posições em bytes). O valor é lido,
+    decodificado e tratado como o BeautifulSoup faria a cada acesso, sem
+    ficar guardado na referência.
+    """
+
+    __slots__ = ("fonte", "inicio", "tamanho", "encoding")
+
+    def __init__(
+        self,
+        fonte: Union[str, bytes, Path, memoryview],
+        inicio: int,
+        tamanho: int,
+        encoding: str = "utf-8",
+    ) -> None:
+        self.fonte = fonte
+        self.inicio = inicio
+        self.tamanho = tamanho
+        self.encoding = encoding
+
+    def bruto(self) -> str:
+        """
+        Retorna o trecho da fonte exatamente como aparece no arquivo.
+        """
+        fim = self.inicio + self.tamanho
+        if isinstance(self.fonte, str):
+            return self.fonte[self.inicio:fim]
+        if isinstance(self.fonte, Path):
+            with open(self.fonte, "rb") as arquivo:
+                arquivo.seek(self.inicio)
+                return arquivo.read(self.tamanho).decode(self.encoding)
+        return bytes(self.fonte[self.inicio:fim]).decode(self.encoding)
+
+    @property
+    def valor(self) -> str:
+        """
+        Retorna o ícone decodificado, igual ao do modo completo.
+        """
+        return unescape(self.bruto()).strip()
+
+    def __str__(self) -> str:
+        return self.valor
+
+    def __repr__(self) -> str:
+        return f"ReferenciaIcone(inicio={self.inicio}, tamanho={self.tamanho})"
+
+
+class TabelaIcones:
+    """
+    Tabela de ícones endereçada pelo hash do conteúdo.
+
+    `registrar` devolve sempre a mesma instância de string para ícones
+    iguais, de modo que os registros compartilham uma única cópia.
+    """
+
+    def __init__(self) -> None:
+        self._icones: Dict[str, str] = {}
+        self.referencias = 0
+
+    @staticmethod
+    def chave(icone: str) -> str:
+        """
+        Calcula a chave de conteúdo de um ícone.
+        """
+        return hashlib.blake2b(icone.encode("utf-8"), digest_size=16).hexdigest()
+
+    def registrar(self, icone: str) -> str:
+        """
+        Registra o ícone e retorna a cópia canônica guardada na tabela.
+        """
+        if not icone:
+            return icone
+        self.referencias += 1
+        return self._icones.setdefault(self.chave(icone), icone)
+
+    def obter(self, chave: str) -> str:
+        """
+        Retorna o ícone associado à chave.
+        """
+        return self._icones[chave]
+
+    def itens(self) -> Iterator[Tuple[str, str]]:
+        """
+        Percorre os pares (chave, ícone) da tabela.
+        """
+        return iter(self._icones.items())
+
+    def __contains__(self, chave: str) -> bool:
+        return chave in self._icones
+
+    def __len__(self) -> int:
+        return len(self._icones)
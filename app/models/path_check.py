@@ -4,31 +4,130 @@
 Classe base para verificar caminhos.
 """
 
+import os
+import stat
+import time
 from pathlib import Path
 
+from app.instrumentacao import metricas
+
+
+class PathSnapshot:
+    """
+    Metadados de um caminho obtidos de uma só vez.
+
+    O `lstat` é feito sempre; o `stat` (que segue o link) só é necessário
+    quando o caminho é um link simbólico. Para arquivos e pastas comuns a
+    fotografia custa uma única chamada de sistema.
+    """
+
+    __slots__ = ("lstat", "stat", "taken_at")
+
+    def __init__(self, path):
+        """
+        Lê os metadados do caminho. Caminhos inexistentes (ou links
+        quebrados) ficam com `stat` igual a None.
+        """
+        if not metricas.ativo:
+            self._ler(path)
+            return
+        with metricas.cronometro("path_check.snapshot"):
+            self._ler(path)
+
+    def _ler(self, path):
+        self.taken_at = time.monotonic()
+        try:
+            self.lstat = os.lstat(path)
+        except (OSError, ValueError):
+            self.lstat = self.stat = None
+            return
+        if stat.S_ISLNK(self.lstat.st_mode):
+            try:
+                self.stat = os.stat(path)
+            except (OSError, ValueError):
+                self.stat = None
+        else:
+            self.stat = self.lstat
+
+    @property
+    def exists(self):
+        """
+        Indica se o caminho existe (seguindo links, como `Path.exists`).
+        """
+        return self.stat is not None
+
+    @property
+    def is_symlink(self):
+        """
+        Indica se o próprio caminho é um link simbólico.
+        """
+        return self.lstat is not None and stat.S_ISLNK(self.lstat.st_mode)
+
+    @property
+    def is_file(self):
+        """
+        Indica se o caminho é um arquivo comum (seguindo links).
+        """
+        return self.stat is not None and stat.S_ISREG(self.stat.st_mode)
+
+    @property
+    def is_dir(self):
+        """
+        Indica se o caminho é uma pasta (seguindo links).
+        """
+        return self.stat is not None and stat.S_ISDIR(self.stat.st_mode)
+
+    def is_expired(self, ttl):
+        """
+        Indica se a fotografia é mais antiga que `ttl` segundos.
+        Sem `ttl` ela vale até o próximo `refresh()`.
+        """
+        return ttl is not None and time.monotonic() - self.taken_at >= ttl
+
 
 class PathCheck:
     """
     Classe base para verificar caminhos.
     """
 
-    def __init__(self, path):
+    def __init__(self, path, ttl=None):
         """
         Inicializa a classe com o caminho.
+
+        Os metadados são lidos na primeira verificação e reaproveitados pelas
+        seguintes até `refresh()` ou até passarem `ttl` segundos.
         """
         self.path = Path(path)
+        self.ttl = ttl
+        self._snapshot = None
+
+    @property
+    def snapshot(self):
+        """
+        Retorna a fotografia dos metadados, lendo-a novamente se necessário.
+        """
+        if self._snapshot is None or self._snapshot.is_expired(self.ttl):
+            self._snapshot = PathSnapshot(self.path)
+        return self._snapshot
+
+    def refresh(self):
+        """
+        Descarta os metadados em cache e os lê novamente.
+        """
+        self._snapshot = None
+        return self.snapshot
 
     def path_exists(self):
         """
         Verifica se o caminho existe.
         """
-        return self.path.exists()
+        return self.snapshot.exists
 
     def is_not_symlink(self):
         """
         Verifica se o caminho não é um link simbólico.
         """
-        return not self.path.is_symlink()
+        return not self.snapshot.is_symlink
 
     def get_absolute_path(self):
         """
@@ -40,7 +139,7 @@ class PathCheck:
         """
         Obtém as informações do arquivo/pasta se existir.
         """
-        return self.path.stat() if self.path_exists() else None
+        return self.snapshot.stat
 
     def is_readable(self):
         """
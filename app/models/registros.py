@@ -0,0 +1,29 @@
+# pylint: disable=C0114, C0115
+
+"""
+Registros das tags <H3> e <A>, no formato comum a todos os analisadores.
+"""
+
+from typing import Dict, Mapping
+
+
+def registro_h3(atributos: Mapping[str, str]) -> Dict[str, str]:
+    """Monta o registro de uma tag <H3> a partir dos seus atributos."""
+    return {
+        "tag": "H3",
+        "ADD_DATE": atributos.get("add_date", "").strip(),
+        "LAST_MODIFIED": atributos.get("last_modified", "").strip(),
+        "PERSONAL_TOOLBAR_FOLDER": atributos.get(
+            "personal_toolbar_folder", ""
+        ).strip(),
+    }
+
+
+def registro_a(atributos: Mapping[str, str]) -> Dict[str, str]:
+    """Monta o registro de uma tag <A> a partir dos seus atributos."""
+    return {
+        "tag": "A",
+        "HREF": atributos.get("href", "").strip(),
+        "ADD_DATE": atributos.get("add_date", "").strip(),
+        "ICON": atributos.get("icon", "").strip(),
+    }
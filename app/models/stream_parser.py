@@ -0,0 +1,173 @@
+# pylint: disable=C0114, C0115
+
+"""
+Analisador incremental de arquivos de favoritos no formato Netscape.
+
+Lê o arquivo em blocos e entrega os registros das tags <H3> e <A> em ordem
+de documento, numa única passada e sem construir a árvore do BeautifulSoup.
+O consumo de memória fica limitado ao tamanho do bloco, não ao do arquivo.
+
+No modo hierárquico o analisador acompanha a pilha de <DL>/<H3> durante a
+mesma passada e anota em cada registro a pasta em que ele está. Os registros
+são montados pelos tokenizadores de `app.models.tokenizador`.
+
+Os ícones das tags <A> podem ser mantidos, ignorados ou guardados como
+referências preguiçosas à fonte (ver `app.models.icones`).
+"""
+
+import codecs
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.models.icones import ICONES_COMPLETOS, ICONES_SOB_DEMANDA, MODOS_ICONES, TabelaIcones
+from app.models.tokenizador import TokenizadorFavoritos, TokenizadorHierarquico
+
+TAMANHO_CHUNK_PADRAO = 64 * 1024
+
+
+class AnalisadorHTMLStream:
+    """
+    Versão incremental do `AnalisadorHTML`.
+
+    A fonte pode ser o caminho de um arquivo ou um objeto de arquivo aberto
+    (texto ou binário). Para conteúdo já carregado em memória use
+    `AnalisadorHTMLStream.de_texto`. Com `hierarquia=True` cada registro traz
+    também o título e a pasta em que está (ver `TokenizadorHierarquico`).
+
+    O parâmetro `icones` controla o atributo ICON das tags <A>:
+        "completo": copia o ícone para o registro (comportamento padrão);
+        "ignorar": o registro recebe "" no lugar do ícone;
+        "sob_demanda": o registro recebe uma `ReferenciaIcone` à fonte, que
+            só é lida quando acessada (exige caminho ou texto como fonte).
+    Com `tabela_icones` os ícones completos iguais passam a compartilhar uma
+    única cópia.
+    """
+
+    def __init__(
+        self,
+        fonte,
+        tamanho_chunk: int = TAMANHO_CHUNK_PADRAO,
+        encoding: str = "utf-8",
+        hierarquia: bool = False,
+        icones: str = ICONES_COMPLETOS,
+        tabela_icones: Optional[TabelaIcones] = None,
+    ) -> None:
+        """
+        Inicializa o analisador com a fonte e o tamanho dos blocos de leitura.
+        """
+        if tamanho_chunk <= 0:
+            raise ValueError("O tamanho do chunk deve ser maior que zero.")
+        if icones not in MODOS_ICONES:
+            raise ValueError(f"Modo de ícones inválido. Use um dos seguintes: {MODOS_ICONES}")
+        if tabela_icones is not None and icones != ICONES_COMPLETOS:
+            raise ValueError("A tabela de ícones só se aplica ao modo 'completo'.")
+        self.fonte = fonte
+        self.tamanho_chunk = tamanho_chunk
+        self.encoding = encoding
+        self.hierarquia = hierarquia
+        self.icones = icones
+        self.tabela_icones = tabela_icones
+        self._texto: Optional[str] = None
+
+    @classmethod
+    def de_texto(
+        cls, html_conteudo: str, tamanho_chunk: int = TAMANHO_CHUNK_PADRAO, **opcoes
+    ) -> "AnalisadorHTMLStream":
+        """
+        Cria o analisador a partir de um conteúdo HTML já carregado.
+        """
+        analisador = cls(None, tamanho_chunk, **opcoes)
+        analisador._texto = html_conteudo
+        return analisador
+
+    def _fonte_icones(self):
+        """
+        Retorna a fonte à qual as referências de ícones vão apontar.
+        """
+        if self._texto is not None:
+            return self._texto
+        if isinstance(self.fonte, (str, Path)):
+            return Path(self.fonte)
+        raise ValueError(
+            "O modo de ícones sob demanda exige um caminho ou um texto como fonte."
+        )
+
+    def _ler_chunks(self) -> Iterator[Tuple[str, Optional[int]]]:
+        """
+        Lê a fonte em blocos de até `tamanho_chunk` caracteres/bytes. Cada
+        bloco vem com sua posição em bytes na fonte (None para fontes de texto).
+        """
+        if self._texto is not None:
+            for inicio in range(0, len(self._texto), self.tamanho_chunk):
+                yield self._texto[inicio:inicio + self.tamanho_chunk], None
+            return
+
+        if isinstance(self.fonte, (str, Path)):
+            with open(self.fonte, "rb") as arquivo:
+                yield from self._decodificar(arquivo)
+            return
+
+        # Objeto de arquivo já aberto pelo chamador
+        primeiro = self.fonte.read(self.tamanho_chunk)
+        if isinstance(primeiro, str):
+            yield primeiro, None
+            while bloco := self.fonte.read(self.tamanho_chunk):
+                yield bloco, None
+        else:
+            yield from self._decodificar(self.fonte, primeiro)
+
+    def _decodificar(
+        self, arquivo, primeiro: Optional[bytes] = None
+    ) -> Iterator[Tuple[str, int]]:
+        """
+        Decodifica incrementalmente um arquivo binário, sem quebrar caracteres
+        multibyte entre blocos.
+        """
+        decodificador = codecs.getincrementaldecoder(self.encoding)()
+        lidos = 0
+        bloco = primeiro or arquivo.read(self.tamanho_chunk)
+        while bloco:
+            # Bytes de um caractere incompleto do bloco anterior vêm antes
+            posicao = lidos - len(decodificador.getstate()[0])
+            lidos += len(bloco)
+            yield decodificador.decode(bloco), posicao
+            bloco = arquivo.read(self.tamanho_chunk)
+        posicao = lidos - len(decodificador.getstate()[0])
+        yield decodificador.decode(b"", final=True), posicao
+
+    def iterar_tags(self) -> Iterator[Dict[str, str]]:
+        """
+        Percorre a fonte numa única passada e entrega os registros das tags
+        <H3> e <A> em ordem de documento.
+        """
+        opcoes = {
+            "icones": self.icones,
+            "tabela_icones": self.tabela_icones,
+            "encoding": self.encoding,
+        }
+        if self.icones == ICONES_SOB_DEMANDA:
+            opcoes["fonte_icones"] = self._fonte_icones()
+        tokenizador = (
+            TokenizadorHierarquico(**opcoes)
+            if self.hierarquia
+            else TokenizadorFavoritos(**opcoes)
+        )
+        pendentes = tokenizador.pendentes
+        for chunk, posicao in self._ler_chunks():
+            tokenizador.alimentar(chunk, posicao)
+            while pendentes:
+                yield pendentes.popleft()
+        tokenizador.close()
+        while pendentes:
+            yield pendentes.popleft()
+
+    def extrair_tags(self) -> List[Dict[str, str]]:
+        """
+        Extrai os registros na mesma ordem do `AnalisadorHTML.extrair_tags`:
+        primeiro todas as tags <H3>, depois todas as tags <A>.
+        """
+        pastas: List[Dict[str, str]] = []
+        links: List[Dict[str, str]] = []
+        for registro in self.iterar_tags():
+            (pastas if registro["tag"] == "H3" else links).append(registro)
+        return pastas + links
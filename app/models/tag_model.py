@@ -1,37 +1,121 @@
 # pylint: disable=C0114, C0115
 
+import mmap
+from typing import Optional, Sequence, Union
+
 from bs4 import BeautifulSoup
 
+from app.instrumentacao import metricas
+from app.models.backends import extrair_tags as extrair_com_backend
+from app.models.buffer_parser import AnalisadorBuffer
+from app.models.file_path_check import FilePathCheck
+from app.models.registros import registro_a, registro_h3
+
 
 class AnalisadorHTML:
-    def __init__(self, html_conteudo: str):
-        """Inicializa o analisador com o conteúdo HTML."""
-        self.soup = BeautifulSoup(html_conteudo, "html.parser")
+    def __init__(self, html_conteudo: str, backend: Optional[Union[str, Sequence[str]]] = None):
+        """
+        Inicializa o analisador com o conteúdo HTML. `backend` escolhe quem
+        analisa o conteúdo em `extrair_tags` (ver `app.models.backends`); sem
+        ele vale o primeiro backend instalado que aceitar o conteúdo.
+        """
+        self._iniciar(html_conteudo, None, "utf-8", backend)
+
+    def _iniciar(
+        self,
+        texto: Optional[str],
+        buffer: Optional[mmap.mmap],
+        encoding: str,
+        backend: Optional[Union[str, Sequence[str]]],
+    ) -> None:
+        """Estado comum aos dois construtores: conteúdo em texto ou mapeado."""
+        self._texto = texto
+        self._soup: Optional[BeautifulSoup] = None
+        self._buffer = buffer
+        self.encoding = encoding
+        self.backend = backend
+        self.backend_utilizado: Optional[str] = None
+
+    @classmethod
+    def from_path(cls, caminho, encoding: str = "utf-8", extensoes=None) -> "AnalisadorHTML":
+        """
+        Cria o analisador mapeando o arquivo em memória, sem lê-lo nem
+        decodificá-lo por inteiro. O arquivo passa antes pela validação de
+        `FilePathCheck.is_a_real_file`, com as `extensoes` aceitas (padrão:
+        .html e .htm).
+        """
+        if not FilePathCheck(caminho).is_a_real_file(extensoes):
+            raise ValueError(
+                "O arquivo não é válido conforme os critérios estabelecidos."
+            )
+        with open(caminho, "rb") as arquivo:
+            # O mapeamento continua válido depois que o arquivo é fechado
+            buffer = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        analisador = cls.__new__(cls)
+        analisador._iniciar(None, buffer, encoding, None)
+        return analisador
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Árvore do BeautifulSoup (com o html.parser), construída sob demanda."""
+        if self._soup is None:
+            texto = self._texto if self._texto is not None else self._buffer[:].decode(self.encoding)
+            with metricas.cronometro("analisador_html.arvore"):
+                self._soup = BeautifulSoup(texto, "html.parser")
+        return self._soup
+
+    @property
+    def buffer(self) -> Optional[mmap.mmap]:
+        """Mapeamento do arquivo (somente leitura) ou None se não veio de from_path."""
+        return self._buffer
+
+    def fechar(self) -> None:
+        """Libera o mapeamento do arquivo, se houver."""
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+    def __enter__(self) -> "AnalisadorHTML":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
+
+    def iterar_tags(self, **opcoes):
+        """
+        Percorre o arquivo mapeado numa única passada, em ordem de documento.
+        Aceita as opções do `AnalisadorBuffer` (hierarquia, icones, ...).
+        """
+        if self._buffer is None:
+            raise ValueError("A iteração direta exige um analisador criado por from_path.")
+        return AnalisadorBuffer(self._buffer, self.encoding, **opcoes).iterar_tags()
 
     def extrair_tags(self):
         """Extrai as tags <H3> e <A> e seus atributos relevantes."""
+        if not metricas.ativo:
+            return self._extrair_tags()
+        with metricas.cronometro("analisador_html.extrair_tags"):
+            registros = self._extrair_tags()
+        metricas.contar("analisador_html.registros", len(registros), backend=self.backend_utilizado)
+        return registros
+
+    def _extrair_tags(self):
+        if self._buffer is not None and self._soup is None:
+            pastas, links = [], []
+            for registro in self.iterar_tags():
+                (pastas if registro["tag"] == "H3" else links).append(registro)
+            self.backend_utilizado = "buffer"
+            return pastas + links
+        if self._texto is not None and self._soup is None:
+            self.backend_utilizado, registros = extrair_com_backend(self._texto, self.backend)
+            return registros
+
+        # A árvore já existe: reaproveitá-la é mais barato que analisar de novo
+        self.backend_utilizado = "bs4"
         tags_extraidas = []
 
         # Extrai tags <H3>
-        tags_extraidas.extend(
-            {
-                "tag": "H3",
-                "ADD_DATE": h3.get("add_date", "").strip(),
-                "LAST_MODIFIED": h3.get("last_modified", "").strip(),
-                "PERSONAL_TOOLBAR_FOLDER": h3.get(
-                    "personal_toolbar_folder", ""
-                ).strip(),
-            }
-            for h3 in self.soup.find_all("h3")
-        )
+        tags_extraidas.extend(registro_h3(h3) for h3 in self.soup.find_all("h3"))
         # Extrai tags <A>
-        tags_extraidas.extend(
-            {
-                "tag": "A",
-                "HREF": a.get("href", "").strip(),
-                "ADD_DATE": a.get("add_date", "").strip(),
-                "ICON": a.get("icon", "").strip(),
-            }
-            for a in self.soup.find_all("a")
-        )
+        tags_extraidas.extend(registro_a(a) for a in self.soup.find_all("a"))
         return tags_extraidas
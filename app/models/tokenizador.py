@@ -0,0 +1,315 @@
+# pylint: disable=C0114, C0115
+
+"""
+Tokenizadores compartilhados pelo `AnalisadorHTMLStream` e pelo
+`AnalisadorBuffer`: transformam as tags <H3> e <A> em registros, com ou sem
+a hierarquia de pastas.
+
+`NOME_TAG` e `ATRIBUTO` seguem as expressões (privadas) do `html.parser`.
+Elas são definidas uma única vez, em bytes, e compiladas também para texto.
+"""
+
+import re
+from collections import deque
+from html.parser import HTMLParser
+from typing import Deque, Dict, List, Mapping, Optional, Tuple
+
+from app.models.icones import (
+    ICONES_COMPLETOS,
+    ICONES_IGNORADOS,
+    ICONES_SOB_DEMANDA,
+    ReferenciaIcone,
+    TabelaIcones,
+)
+from app.models.registros import registro_a, registro_h3
+
+_PADRAO_NOME_TAG = rb"([a-zA-Z][^\t\n\r\f />\x00]*)(?:\s|/(?!>))*"
+_PADRAO_ATRIBUTO = (
+    rb"((?<=['\"\s/])[^\s/>][^\s/=>]*)(\s*=+\s*"
+    rb"('[^']*'|\"[^\"]*\"|(?!['\"])[^>\s]*))?(?:\s|/(?!>))*"
+)
+# Versões em bytes, para o varredor de buffers
+NOME_TAG_BYTES = re.compile(_PADRAO_NOME_TAG)
+ATRIBUTO_BYTES = re.compile(_PADRAO_ATRIBUTO)
+# Versões em texto, para o tokenizador baseado no HTMLParser
+NOME_TAG = re.compile(_PADRAO_NOME_TAG.decode("ascii"))
+ATRIBUTO = re.compile(_PADRAO_ATRIBUTO.decode("ascii"))
+
+
+def _atributos(attrs) -> Dict[str, str]:
+    """
+    Converte a lista de atributos do HTMLParser em dicionário, com as mesmas
+    regras do BeautifulSoup: valores ausentes viram "" e o último valor de um
+    atributo repetido prevalece.
+    """
+    return {nome: "" if valor is None else valor for nome, valor in attrs}
+
+
+def _intervalo_icone(texto_tag: str) -> Optional[Tuple[int, int]]:
+    """
+    Localiza o valor bruto do atributo ICON no texto de uma tag de abertura
+    (vale a última ocorrência).
+    """
+    encontrado = NOME_TAG.match(texto_tag, 1)
+    posicao = encontrado.end() if encontrado else 1
+    intervalo = None
+    while posicao < len(texto_tag):
+        atributo = ATRIBUTO.match(texto_tag, posicao)
+        if not atributo:
+            break
+        nome, resto, valor = atributo.group(1, 2, 3)
+        if nome.lower() == "icon":
+            if not resto:
+                intervalo = None
+            else:
+                inicio, fim = atributo.span(3)
+                if valor[:1] == "'" == valor[-1:] or valor[:1] == '"' == valor[-1:]:
+                    inicio, fim = inicio + 1, max(inicio + 1, fim - 1)
+                intervalo = (inicio, fim)
+        posicao = atributo.end()
+    return intervalo
+
+
+class TokenizadorFavoritos(HTMLParser):
+    """
+    Tokenizador que transforma as tags <H3> e <A> em registros pendentes.
+
+    No modo de ícones sob demanda o tokenizador acompanha a posição absoluta
+    de cada tag para criar referências à fonte em vez de copiar o ícone.
+    """
+
+    def __init__(
+        self,
+        icones: str = ICONES_COMPLETOS,
+        tabela_icones: Optional[TabelaIcones] = None,
+        fonte_icones=None,
+        encoding: str = "utf-8",
+    ) -> None:
+        super().__init__()
+        self.pendentes: Deque[Dict[str, str]] = deque()
+        self.icones = icones
+        self.tabela_icones = tabela_icones
+        self._fonte_icones = fonte_icones
+        self._encoding = encoding
+        self._lidos = 0  # Caracteres já entregues ao tokenizador
+        self._base = 0  # Posição absoluta de self.rawdata[0]
+        self._inicio_token = 0
+        # Janelas [inicio_char, inicio_fonte, texto, cursor_char, cursor_fonte]
+        # para converter posições em caracteres em posições em bytes
+        self._janelas: Deque[list] = deque()
+        if icones == ICONES_SOB_DEMANDA:
+            # Só neste modo vale o custo de interceptar cada avanço do parser
+            self.updatepos = self._rastrear_posicao
+
+    def _rastrear_posicao(self, i, j):
+        """
+        Guarda o início do próximo token antes de o HTMLParser processá-lo.
+
+        Depende de detalhes internos do CPython, não da API documentada: o
+        `HTMLParser.goahead` chama `self.updatepos(i, j)` (herdado de
+        `_markupbase.ParserBase`) antes de tratar cada token, com `j` igual
+        à posição do token em `self.rawdata`, o buffer ainda não consumido.
+        `_referenciar_icone` confere essa posição e, se ela não bater, copia
+        o ícone; o teste de ícones sob demanda falha nesse caso.
+        """
+        self._inicio_token = j
+        return HTMLParser.updatepos(self, i, j)
+
+    def alimentar(self, texto: str, posicao_fonte: Optional[int] = None) -> None:
+        """
+        Entrega um bloco ao tokenizador. `posicao_fonte` é a posição em bytes
+        do bloco na fonte, quando a fonte é binária.
+        """
+        if self.icones == ICONES_SOB_DEMANDA:
+            self._base = self._lidos - len(self.rawdata)
+            if posicao_fonte is not None:
+                self._janelas.append([self._lidos, posicao_fonte, texto, 0, 0])
+            self._lidos += len(texto)
+        self.feed(texto)
+        # Descarta as janelas que já saíram do buffer do parser
+        consumido = self._lidos - len(self.rawdata)
+        while self._janelas and self._janelas[0][0] + len(self._janelas[0][2]) <= consumido:
+            self._janelas.popleft()
+
+    def close(self):
+        self._base = self._lidos - len(self.rawdata)
+        super().close()
+
+    def handle_starttag(self, tag, attrs):
+        self.iniciar_tag(tag, _atributos(attrs))
+
+    def iniciar_tag(self, tag: str, atributos: Mapping[str, str]) -> None:
+        """
+        Trata uma tag de abertura. Também é chamado diretamente por
+        varredores que não usam o HTMLParser (ver `app.models.buffer_parser`).
+        """
+        if tag == "h3":
+            self.pendentes.append(registro_h3(atributos))
+        elif tag == "a":
+            self.pendentes.append(self._registro_a(atributos))
+
+    def aguardando_texto(self) -> bool:
+        """
+        Indica se o texto entre as tags é necessário para o registro atual.
+        """
+        return False
+
+    def _registro_a(self, atributos: Mapping[str, str]) -> Dict:
+        """
+        Monta o registro da tag <A> aplicando o modo de ícones escolhido.
+        """
+        registro = registro_a(atributos)
+        if self.icones == ICONES_COMPLETOS:
+            if self.tabela_icones is not None:
+                registro["ICON"] = self.tabela_icones.registrar(registro["ICON"])
+        elif self.icones == ICONES_IGNORADOS:
+            registro["ICON"] = ""
+        else:
+            registro["ICON"] = self._referenciar_icone(atributos)
+        return registro
+
+    def _referenciar_icone(self, atributos: Mapping[str, str]):
+        """
+        Cria a referência ao valor bruto do ICON da tag corrente.
+        """
+        referenciar = getattr(atributos, "referenciar", None)
+        if referenciar is not None:
+            return referenciar("icon")
+        if not atributos.get("icon", "").strip():
+            return ""
+        texto_tag = self.get_starttag_text()
+        intervalo = _intervalo_icone(texto_tag)
+        if intervalo is None:
+            return ""
+        inicio, fim = intervalo
+        if not self.rawdata.startswith(texto_tag, self._inicio_token) or (
+            "&" not in texto_tag[inicio:fim] and texto_tag[inicio:fim] != atributos["icon"]
+        ):
+            # O HTMLParser não avançou como `_rastrear_posicao` espera ou
+            # leu o atributo de outro jeito: a referência apontaria para o
+            # lugar errado, então o ícone é copiado
+            return atributos["icon"]
+        posicao = self._base + self._inicio_token + inicio
+        if not self._janelas:
+            return ReferenciaIcone(self._fonte_icones, posicao, fim - inicio)
+        tamanho = len(texto_tag[inicio:fim].encode(self._encoding))
+        return ReferenciaIcone(
+            self._fonte_icones, self._posicao_em_bytes(posicao), tamanho, self._encoding
+        )
+
+    def _posicao_em_bytes(self, posicao: int) -> int:
+        """
+        Converte uma posição absoluta em caracteres para bytes na fonte. As tags
+        chegam em ordem crescente, então cada janela só é codificada uma vez.
+        """
+        for janela in self._janelas:
+            inicio_char, inicio_fonte, texto = janela[0], janela[1], janela[2]
+            if posicao < inicio_char + len(texto):
+                relativa = posicao - inicio_char
+                if relativa < janela[3]:
+                    janela[3], janela[4] = 0, 0
+                janela[4] += len(texto[janela[3]:relativa].encode(self._encoding))
+                janela[3] = relativa
+                return inicio_fonte + janela[4]
+        raise ValueError("Posição fora das janelas de leitura.")
+
+
+class TokenizadorHierarquico(TokenizadorFavoritos):
+    """
+    Tokenizador que, além dos atributos, registra o título de cada tag e a
+    posição dela na árvore de pastas.
+
+    Cada registro recebe as chaves:
+        TITLE: texto da tag.
+        PATH: tupla com os títulos das pastas ancestrais.
+        DEPTH: quantidade de pastas ancestrais.
+        PARENT_ID: identificador da pasta que contém a tag (None na raiz).
+    Os registros <H3> recebem ainda FOLDER_ID, numerado em ordem de documento.
+    """
+
+    # Tags que encerram implicitamente um <H3> ou <A> sem fechamento
+    _DELIMITADORES = frozenset({"h3", "a", "dl", "dt", "dd"})
+
+    def __init__(self, **opcoes) -> None:
+        super().__init__(**opcoes)
+        # Cada nível guarda (id da pasta, caminho até ela); a raiz fica no fundo
+        self._pilha: List[Tuple[Optional[int], Tuple[str, ...]]] = [(None, ())]
+        self._pasta_pendente: Optional[Tuple[Optional[int], Tuple[str, ...]]] = None
+        self._registro_aberto: Optional[Dict] = None
+        self._titulo: List[str] = []
+        self._proximo_id = 0
+
+    def iniciar_tag(self, tag, atributos):
+        if tag not in self._DELIMITADORES:
+            return
+        self._fechar_registro()
+        id_pai, caminho = self._pilha[-1]
+
+        if tag == "dl":
+            # Uma <DL> logo após um <H3> abre o conteúdo daquela pasta
+            self._pilha.append(self._pasta_pendente or (id_pai, caminho))
+            self._pasta_pendente = None
+            return
+        if tag not in ("h3", "a"):
+            return
+
+        registro = registro_h3(atributos) if tag == "h3" else self._registro_a(atributos)
+        if tag == "h3":
+            registro["FOLDER_ID"] = self._proximo_id
+            self._proximo_id += 1
+        registro["PARENT_ID"] = id_pai
+        registro["DEPTH"] = len(caminho)
+        registro["PATH"] = caminho
+        self._registro_aberto = registro
+
+    def handle_endtag(self, tag):
+        if tag in ("h3", "a"):
+            self._fechar_registro()
+        elif tag == "dl":
+            self._fechar_registro()
+            if len(self._pilha) > 1:
+                self._pilha.pop()
+
+    def handle_data(self, data):
+        if self._registro_aberto is not None:
+            self._titulo.append(data)
+
+    def aguardando_texto(self) -> bool:
+        return self._registro_aberto is not None
+
+    def estado(self) -> Tuple[list, Optional[tuple], int]:
+        """
+        Retorna o estado da árvore de pastas: a pilha, a pasta que aguarda a
+        sua <DL> e o próximo identificador de pasta.
+        """
+        return list(self._pilha), self._pasta_pendente, self._proximo_id
+
+    def restaurar(self, estado: Tuple[list, Optional[tuple], int]) -> None:
+        """
+        Retoma a análise a partir de um estado obtido com `estado()`.
+        """
+        pilha, self._pasta_pendente, self._proximo_id = estado
+        self._pilha = list(pilha)
+
+    def close(self):
+        super().close()
+        self._fechar_registro()
+
+    def _fechar_registro(self) -> None:
+        """
+        Conclui o registro aberto com o título acumulado e o entrega.
+        """
+        registro = self._registro_aberto
+        if registro is None:
+            return
+        registro["TITLE"] = "".join(self._titulo).strip()
+        self._titulo.clear()
+        self._registro_aberto = None
+
+        if registro["tag"] == "H3":
+            # As tags filhas compartilham a mesma tupla de caminho
+            self._pasta_pendente = (
+                registro["FOLDER_ID"],
+                registro["PATH"] + (registro["TITLE"],),
+            )
+        self.pendentes.append(registro)
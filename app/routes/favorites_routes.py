@@ -1,10 +1,150 @@
-#  pylint: disable=C, R, E, W
 #  pylint: disable=C0114, C0115, C0116
 
-# app/routes/routes.py
+# app/routes/favorites_routes.py
 
-from app.controllers.favorite_controller import FavoriteController
-from app.services.global_services import GeneralServices
+"""
+Rotas que devolvem os registros de um arquivo de favoritos em streaming.
 
-service = GeneralServices()
-controller = FavoriteController(service)
+Os registros saem do `AnalisadorHTML.iterar_tags` (arquivo mapeado em
+memória) direto para a resposta, em NDJSON ou num array JSON escrito aos
+poucos, sem montar a lista inteira: o primeiro byte e a memória do servidor
+não dependem do tamanho da exportação.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from app.models.icones import ICONES_COMPLETOS, ICONES_IGNORADOS
+from app.models.tag_model import AnalisadorHTML
+
+favoritos = Blueprint("favoritos", __name__)
+
+TAMANHO_BLOCO = 64 * 1024
+FORMATOS = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+
+def _blocos(partes: Iterable[str]) -> Iterator[bytes]:
+    """
+    Junta pedaços pequenos de texto em blocos de ~64 KiB. O primeiro pedaço
+    sai sozinho, para o cliente receber algo o quanto antes.
+    """
+    acumulado, tamanho = [], 0
+    primeiro = True
+    for parte in partes:
+        acumulado.append(parte)
+        tamanho += len(parte)
+        if primeiro or tamanho >= TAMANHO_BLOCO:
+            yield "".join(acumulado).encode("utf-8")
+            acumulado, tamanho, primeiro = [], 0, False
+    if acumulado:
+        yield "".join(acumulado).encode("utf-8")
+
+
+def ndjson(registros: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Serializa os registros como NDJSON (um objeto JSON por linha).
+    """
+    return _blocos(json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros)
+
+
+def array_json(registros: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Serializa os registros como um único array JSON, escrito aos poucos.
+    """
+
+    def partes() -> Iterator[str]:
+        separador = "["
+        for registro in registros:
+            yield separador + json.dumps(registro, ensure_ascii=False)
+            separador = ","
+        yield "[]" if separador == "[" else "]"
+
+    return _blocos(partes())
+
+
+def caminho_servidor(caminho: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve um caminho do servidor (relativo a PASTA_FAVORITOS) e confere se
+    está dentro dela. Sem PASTA_FAVORITOS configurada nenhum caminho do
+    servidor é aceito. Retorna (caminho, erro).
+    """
+    raiz = current_app.config.get("PASTA_FAVORITOS")
+    if not raiz:
+        return None, "Caminhos do servidor estão desativados (configure PASTA_FAVORITOS)."
+    raiz = Path(raiz).expanduser().resolve()
+    # O "~" do cliente não é expandido: um caminho absoluto substitui a raiz
+    resolvido = (raiz / caminho).resolve()
+    if not resolvido.is_relative_to(raiz):
+        return None, "O caminho está fora da pasta permitida."
+    return str(resolvido), None
+
+
+def salvar_upload(enviado) -> str:
+    """
+    Grava um arquivo enviado num temporário .html e retorna o caminho. O
+    arquivo vai para o disco para ser mapeado como um arquivo do servidor.
+    """
+    descritor, temporario = tempfile.mkstemp(prefix="favoritos-", suffix=".html")
+    os.close(descritor)
+    enviado.save(temporario)
+    return temporario
+
+
+def _registros(analisador: AnalisadorHTML, temporario: Optional[str], opcoes: Dict[str, Any]):
+    """
+    Percorre os registros e, no fim (ou se o cliente desconectar), libera o
+    mapeamento e apaga o arquivo enviado.
+    """
+    try:
+        yield from analisador.iterar_tags(**opcoes)
+    finally:
+        analisador.fechar()
+        if temporario is not None:
+            os.remove(temporario)
+
+
+@favoritos.route("/favoritos", methods=["GET", "POST"])
+def listar_favoritos():
+    """
+    Rota que analisa um arquivo de favoritos enviado (campo `arquivo`) ou do
+    servidor (`caminho`, no formulário, no JSON ou na query string).
+
+    Parâmetros da query string: `formato` (ndjson ou json), `hierarquia`
+    (0 ou 1) e `icones` (ignorar ou completo).
+    """
+    formato = request.args.get("formato", "ndjson")
+    if formato not in FORMATOS:
+        return jsonify({"error": f"Formato inválido. Use um destes: {sorted(FORMATOS)}"}), 400
+    opcoes = {
+        "hierarquia": request.args.get("hierarquia", "0") in ("1", "true"),
+        "icones": ICONES_COMPLETOS if request.args.get("icones") == ICONES_COMPLETOS else ICONES_IGNORADOS,
+    }
+
+    temporario = None
+    enviado = request.files.get("arquivo")
+    if enviado is not None:
+        caminho = temporario = salvar_upload(enviado)
+    else:
+        dados = request.get_json(silent=True) or {}
+        informado = request.values.get("caminho") or dados.get("caminho")
+        if not informado:
+            return jsonify({"error": "Envie um arquivo (campo 'arquivo') ou informe o 'caminho'."}), 400
+        caminho, erro = caminho_servidor(informado)
+        if erro is not None:
+            return jsonify({"error": erro}), 403
+
+    try:
+        analisador = AnalisadorHTML.from_path(caminho)
+    except (OSError, ValueError) as exc:
+        if temporario is not None:
+            os.remove(temporario)
+        return jsonify({"error": str(exc) or "Arquivo inválido."}), 400
+
+    registros = _registros(analisador, temporario, opcoes)
+    serializar = ndjson if formato == "ndjson" else array_json
+    return Response(serializar(registros), mimetype=FORMATOS[formato])
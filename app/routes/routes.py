@@ -1,29 +1,34 @@
-# from flask import Blueprint
-# from app.controllers import arquivo_controller
-# from app.controllers.path_control import analyze_path_controller
+#  pylint: disable=C0114, C0115, C0116
 
-# routes = Blueprint("routes", __name__)
+# app/routes/routes.py
 
-# # Rotas de arquivos
-# routes.route(
-#     "/arquivos",
-#     methods=["GET"]
-# )(arquivo_controller.listar_arquivos)
-# routes.route(
-#     "/arquivos",
-#     methods=["POST"]
-# )(arquivo_controller.criar_arquivo)
-# routes.route(
-#     "/arquivos/<int:id>",
-#     methods=["DELETE"]
-# )(arquivo_controller.deletar_arquivo)
+from flask import Blueprint, jsonify, request
 
-# # Rota para analisar caminhos
-# routes = Blueprint("routes", __name__)
+from app.controllers.path_check_controller import PathCheckController
+from app.routes.favorites_routes import caminho_servidor
 
-# @routes.route("/analyze", methods=["POST"])
-# def analyze_route():
-#     """
-#     Rota para analisar caminhos.
-#     """
-#     return analyze_path_controller()
+routes = Blueprint("routes", __name__)
+
+
+@routes.route("/analyze", methods=["POST"])
+def analyze_route():
+    """
+    Rota para analisar caminhos. Só aceita caminhos dentro de PASTA_FAVORITOS.
+    """
+    data = request.get_json(silent=True) or {}
+    path = data.get("path")
+    if not path:
+        return jsonify({"error": "Path is required"}), 400
+    caminho, erro = caminho_servidor(path)
+    if erro is not None:
+        return jsonify({"error": erro}), 403
+    controle = PathCheckController(caminho)
+    if not controle.check_exists():
+        return jsonify({"error": "Caminho não encontrado."}), 404
+    return jsonify(
+        {
+            "caminho_absoluto": str(controle.get_absolute_path()),
+            "caminho_relativo": path,
+            **controle.get_path_timing(),
+        }
+    )
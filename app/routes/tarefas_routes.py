@@ -0,0 +1,142 @@
+#  pylint: disable=C0114, C0115, C0116
+
+# app/routes/tarefas_routes.py
+
+"""
+Rotas da fila de tarefas: enviar um arquivo para análise, deduplicação ou
+verificação de links, acompanhar o progresso, cancelar e paginar os
+resultados. O trabalho roda nos workers da `FilaTarefas`; a requisição só
+grava a tarefa no banco e volta com o identificador.
+"""
+
+import os
+import threading
+
+from flask import Blueprint, current_app, jsonify, request, url_for
+
+from app.routes.favorites_routes import caminho_servidor, salvar_upload
+from app.services.tarefas import ATIVOS, LIMITE_PAGINA, TIPOS, FilaTarefas
+
+tarefas = Blueprint("tarefas", __name__)
+
+_TRAVA = threading.Lock()
+_VERDADEIROS = ("1", "true")
+
+
+def fila_tarefas() -> FilaTarefas:
+    """
+    Fila da aplicação, criada no primeiro uso em BANCO_TAREFAS (padrão:
+    tarefas.sqlite na pasta de instância) com WORKERS_TAREFAS processos.
+    """
+    with _TRAVA:
+        fila = current_app.extensions.get("tarefas")
+        if fila is None:
+            banco = current_app.config.get("BANCO_TAREFAS")
+            if banco is None:
+                os.makedirs(current_app.instance_path, exist_ok=True)
+                banco = os.path.join(current_app.instance_path, "tarefas.sqlite")
+            fila = FilaTarefas(banco, workers=current_app.config.get("WORKERS_TAREFAS"))
+            current_app.extensions["tarefas"] = fila
+        return fila
+
+
+def _tarefa_json(tarefa):
+    del tarefa["arquivo"]  # Caminho interno do servidor
+    tarefa["links"] = {
+        "estado": url_for("tarefas.consultar_tarefa", tarefa_id=tarefa["id"]),
+        "resultados": url_for("tarefas.listar_resultados", tarefa_id=tarefa["id"]),
+    }
+    return tarefa
+
+
+@tarefas.route("/tarefas", methods=["POST"])
+def criar_tarefa():
+    """
+    Rota que enfileira uma tarefa sobre um arquivo enviado (campo `arquivo`)
+    ou do servidor (`caminho`). Campos: `tipo` (analisar, deduplicar ou
+    verificar), `hierarquia`, `somente_duplicados` e `quebrados` (0 ou 1).
+    """
+    dados = request.get_json(silent=True) or {}
+
+    def campo(nome, padrao=None):
+        return request.values.get(nome, dados.get(nome, padrao))
+
+    tipo = campo("tipo", "analisar")
+    if tipo not in TIPOS:
+        return jsonify({"error": f"Tipo inválido. Use um destes: {sorted(TIPOS)}"}), 400
+    opcoes = ("hierarquia", "somente_duplicados", "quebrados")
+    parametros = {nome: str(campo(nome, "0")).lower() in _VERDADEIROS for nome in opcoes}
+
+    enviado = request.files.get("arquivo")
+    if enviado is not None:
+        caminho, temporario = salvar_upload(enviado), True
+    else:
+        informado = campo("caminho")
+        if not informado:
+            return jsonify({"error": "Envie um arquivo (campo 'arquivo') ou informe o 'caminho'."}), 400
+        caminho, erro = caminho_servidor(informado)
+        if erro is not None:
+            return jsonify({"error": erro}), 403
+        if not os.path.isfile(caminho):
+            return jsonify({"error": "Arquivo não encontrado."}), 404
+        temporario = False
+
+    fila = fila_tarefas()
+    tarefa_id = fila.enviar(tipo, caminho, parametros, temporario=temporario)
+    resposta = jsonify(_tarefa_json(fila.consultar(tarefa_id)))
+    resposta.status_code = 202
+    resposta.headers["Location"] = url_for("tarefas.consultar_tarefa", tarefa_id=tarefa_id)
+    return resposta
+
+
+@tarefas.route("/tarefas/<tarefa_id>", methods=["GET"])
+def consultar_tarefa(tarefa_id):
+    """
+    Rota com o estado e o progresso de uma tarefa.
+    """
+    tarefa = fila_tarefas().consultar(tarefa_id)
+    if tarefa is None:
+        return jsonify({"error": "Tarefa não encontrada."}), 404
+    return jsonify(_tarefa_json(tarefa))
+
+
+@tarefas.route("/tarefas/<tarefa_id>", methods=["DELETE"])
+def cancelar_tarefa(tarefa_id):
+    """
+    Rota que cancela uma tarefa pendente ou em execução.
+    """
+    fila = fila_tarefas()
+    tarefa = fila.consultar(tarefa_id)
+    if tarefa is None:
+        return jsonify({"error": "Tarefa não encontrada."}), 404
+    if tarefa["estado"] not in ATIVOS:
+        return jsonify({"error": f"A tarefa já terminou ({tarefa['estado']})."}), 409
+    return jsonify(_tarefa_json(fila.cancelar(tarefa_id)))
+
+
+@tarefas.route("/tarefas/<tarefa_id>/resultados", methods=["GET"])
+def listar_resultados(tarefa_id):
+    """
+    Rota que pagina os resultados de uma tarefa (`inicio` e `limite` na query
+    string). `proximo` é o `inicio` da página seguinte, ou null quando a
+    tarefa terminou e não há mais resultados.
+    """
+    fila = fila_tarefas()
+    tarefa = fila.consultar(tarefa_id)
+    if tarefa is None:
+        return jsonify({"error": "Tarefa não encontrada."}), 404
+    inicio = request.args.get("inicio", 0, type=int)
+    limite = request.args.get("limite", 100, type=int)
+    if inicio < 0 or not 0 < limite <= LIMITE_PAGINA:
+        return jsonify({"error": f"Use inicio >= 0 e limite entre 1 e {LIMITE_PAGINA}."}), 400
+    resultados = fila.resultados(tarefa_id, inicio, limite)
+    fim = len(resultados) < limite and tarefa["estado"] not in ATIVOS
+    return jsonify(
+        {
+            "id": tarefa_id,
+            "estado": tarefa["estado"],
+            "inicio": inicio,
+            "resultados": resultados,
+            "proximo": None if fim else inicio + len(resultados),
+        }
+    )
@@ -0,0 +1,262 @@
+# app/services/agendador.py
+
+"""
+Agendamento por domínio de operações de rede sobre os favoritos.
+
+O `AgendadorHosts` separa os HREFs em filas por domínio registrável (por
+exemplo "blog.exemplo.com.br" e "www.exemplo.com.br" contam como
+"exemplo.com.br") e as atende em rodízio, uma de cada vez, de modo que 30 mil
+links de um mesmo site não seguram o resto da fila. Cada domínio tem um balde
+de tokens (taxa por segundo e rajada) e um limite de operações simultâneas.
+As métricas (profundidade das filas, em andamento, vazão) ficam disponíveis
+durante a execução.
+"""
+
+import asyncio
+import heapq
+import ipaddress
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+from app.models.bookmark_store import extrair_host
+
+TAXA_POR_DOMINIO = 5.0
+RAJADA = 5
+MAX_POR_DOMINIO = 4
+CONCORRENCIA = 100
+
+# Segundos níveis comuns sob TLDs de países (exemplo.com.br, bbc.co.uk)
+SEGUNDO_NIVEL_GENERICO = frozenset(
+    {"ac", "co", "com", "edu", "gob", "go", "gov", "lg", "mil", "ne", "net", "nic", "or", "org"}
+)
+# Sufixos públicos em que cada subdomínio é de um dono diferente
+SUFIXOS_PUBLICOS = frozenset(
+    {
+        "github.io", "gitlab.io", "blogspot.com", "wordpress.com", "appspot.com", "herokuapp.com",
+        "netlify.app", "vercel.app", "pages.dev", "web.app", "firebaseapp.com", "s3.amazonaws.com",
+    }
+)
+
+
+def dominio_registravel(host: str) -> str:
+    """
+    Estima o domínio registrável de um host sem a lista pública de sufixos:
+    os dois últimos rótulos, ou três quando o penúltimo é um segundo nível
+    genérico sob um TLD de país ou o final é um sufixo público conhecido.
+    Endereços IP e hosts de um rótulo voltam como estão.
+    """
+    host = host.lower().rstrip(".")
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return host
+    except ValueError:
+        pass
+    rotulos = host.split(".")
+    if len(rotulos) <= 2:
+        return host
+    for tamanho in (3, 2):
+        if ".".join(rotulos[-tamanho:]) in SUFIXOS_PUBLICOS:
+            return ".".join(rotulos[-tamanho - 1:])
+    if len(rotulos[-1]) == 2 and rotulos[-2] in SEGUNDO_NIVEL_GENERICO:
+        return ".".join(rotulos[-3:])
+    return ".".join(rotulos[-2:])
+
+
+class BaldeTokens:
+    """
+    Balde de tokens: até `rajada` operações seguidas e depois `taxa` por
+    segundo.
+    """
+
+    __slots__ = ("taxa", "rajada", "tokens", "atualizado")
+
+    def __init__(self, taxa: float, rajada: int, agora: float) -> None:
+        self.taxa = taxa
+        self.rajada = rajada
+        self.tokens = float(rajada)
+        self.atualizado = agora
+
+    def espera(self, agora: float) -> float:
+        """
+        Segundos até haver um token (0 se já houver).
+        """
+        self.tokens = min(self.rajada, self.tokens + (agora - self.atualizado) * self.taxa)
+        self.atualizado = agora
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.taxa
+
+    def consumir(self) -> None:
+        """
+        Gasta um token; chame depois de `espera` retornar 0.
+        """
+        self.tokens -= 1
+
+
+class AgendadorHosts:
+    """
+    Filas por domínio atendidas em rodízio, com limite de taxa por domínio.
+    """
+
+    def __init__(
+        self,
+        taxa_por_dominio: float = TAXA_POR_DOMINIO,
+        rajada: int = RAJADA,
+        max_por_dominio: int = MAX_POR_DOMINIO,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa o agendador.
+
+        Args:
+            taxa_por_dominio: Operações por segundo iniciadas em cada domínio.
+            rajada: Operações que podem começar de uma vez num domínio parado.
+            max_por_dominio: Operações simultâneas por domínio.
+            relogio: Fonte de tempo (em segundos).
+        """
+        if taxa_por_dominio <= 0 or rajada <= 0 or max_por_dominio <= 0:
+            raise ValueError("A taxa, a rajada e o limite por domínio devem ser maiores que zero.")
+        self.taxa_por_dominio = taxa_por_dominio
+        self.rajada = rajada
+        self.max_por_dominio = max_por_dominio
+        self._relogio = relogio
+        self._filas: Dict[str, Deque[Any]] = {}
+        self._rodizio: Deque[str] = deque()
+        self._baldes: Dict[str, BaldeTokens] = {}
+        self._em_andamento: Dict[str, int] = {}
+        self._pendentes = 0
+        self._concluidos = 0
+        self._erros = 0
+        self._inicio: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self._pendentes
+
+    def adicionar(self, href: str, item: Any = None) -> str:
+        """
+        Enfileira um HREF (ou um `item` qualquer associado a ele) e retorna o
+        domínio usado.
+        """
+        dominio = dominio_registravel(extrair_host(href))
+        fila = self._filas.get(dominio)
+        if fila is None:
+            fila = self._filas[dominio] = deque()
+        if not fila:
+            self._rodizio.append(dominio)
+        fila.append(href if item is None else item)
+        self._pendentes += 1
+        return dominio
+
+    def indexar(self, registros: Iterable[Dict[str, Any]]) -> int:
+        """
+        Enfileira o HREF de cada registro <A> (como os de `AnalisadorHTML`)
+        e retorna quantos foram enfileirados.
+        """
+        quantidade = 0
+        for registro in registros:
+            if registro.get("tag", "A") == "A":
+                self.adicionar(registro["HREF"])
+                quantidade += 1
+        return quantidade
+
+    def proximo(self) -> Tuple[Optional[Tuple[str, Any]], Optional[float]]:
+        """
+        Retira o próximo item em rodízio cujo domínio tem token e vaga.
+
+        Returns:
+            ((domínio, item), None) se houver um item pronto; senão (None,
+            segundos até o próximo token), ou (None, None) se só faltam vagas
+            ou a fila está vazia.
+        """
+        agora = self._relogio()
+        menor_espera: Optional[float] = None
+        for _ in range(len(self._rodizio)):
+            dominio = self._rodizio[0]
+            self._rodizio.rotate(-1)
+            if self._em_andamento.get(dominio, 0) >= self.max_por_dominio:
+                continue
+            balde = self._baldes.get(dominio)
+            if balde is None:
+                balde = self._baldes[dominio] = BaldeTokens(self.taxa_por_dominio, self.rajada, agora)
+            espera = balde.espera(agora)
+            if espera > 0:
+                menor_espera = espera if menor_espera is None else min(menor_espera, espera)
+                continue
+            balde.consumir()
+            fila = self._filas[dominio]
+            item = fila.popleft()
+            if not fila:
+                self._rodizio.pop()  # Depois do rotate, o domínio atendido é o último
+                del self._filas[dominio]
+            self._pendentes -= 1
+            self._em_andamento[dominio] = self._em_andamento.get(dominio, 0) + 1
+            return (dominio, item), None
+        return None, menor_espera
+
+    def concluir(self, dominio: str, erro: bool = False) -> None:
+        """
+        Registra o fim de uma operação iniciada com `proximo`.
+        """
+        restantes = self._em_andamento[dominio] - 1
+        if restantes:
+            self._em_andamento[dominio] = restantes
+        else:
+            del self._em_andamento[dominio]
+        self._concluidos += 1
+        self._erros += erro
+
+    def metricas(self, maiores: int = 10) -> Dict[str, Any]:
+        """
+        Profundidade das filas, operações em andamento, concluídas e com
+        erro, vazão (concluídas por segundo desde o início) e os domínios
+        com as maiores filas.
+        """
+        decorrido = self._relogio() - self._inicio if self._inicio is not None else 0.0
+        return {
+            "pendentes": self._pendentes,
+            "dominios_pendentes": len(self._rodizio),
+            "em_andamento": sum(self._em_andamento.values()),
+            "concluidos": self._concluidos,
+            "erros": self._erros,
+            "vazao": self._concluidos / decorrido if decorrido > 0 else 0.0,
+            "maiores_filas": heapq.nlargest(
+                maiores, ((dominio, len(fila)) for dominio, fila in self._filas.items()), key=lambda par: par[1]
+            ),
+        }
+
+    async def executar(
+        self, funcao: Callable[[Any], Awaitable[Any]], concorrencia: int = CONCORRENCIA
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Aplica a corrotina `funcao` a cada item enfileirado, respeitando os
+        limites, e entrega um dict por item (item, dominio, resultado, erro)
+        à medida que terminam. Itens adicionados durante a execução também
+        são atendidos.
+        """
+        if self._inicio is None:
+            self._inicio = self._relogio()
+        tarefas: Dict[asyncio.Future, Tuple[str, Any]] = {}
+        try:
+            while self._pendentes or tarefas:
+                espera = None
+                while len(tarefas) < concorrencia:
+                    pronto, espera = self.proximo()
+                    if pronto is None:
+                        break
+                    tarefas[asyncio.ensure_future(funcao(pronto[1]))] = pronto
+                if not tarefas:
+                    await asyncio.sleep(espera or 0)
+                    continue
+                prontas, _ = await asyncio.wait(tarefas, timeout=espera, return_when=asyncio.FIRST_COMPLETED)
+                for tarefa in prontas:
+                    dominio, item = tarefas.pop(tarefa)
+                    erro = asyncio.CancelledError() if tarefa.cancelled() else tarefa.exception()
+                    self.concluir(dominio, erro is not None)
+                    yield {
+                        "item": item,
+                        "dominio": dominio,
+                        "resultado": None if erro is not None else tarefa.result(),
+                        "erro": None if erro is None else f"{type(erro).__name__}: {erro}",
+                    }
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
@@ -0,0 +1,240 @@
+# app/services/analise_paralela.py
+
+"""
+Análise paralela de um único arquivo de favoritos muito grande.
+
+O arquivo é mapeado em memória e dividido em trechos que começam sempre numa
+tag <DT>, de modo que nenhum favorito fica partido ao meio. Cada trecho é
+analisado por um processo com o `AnalisadorBuffer`, e os resultados são
+entregues na ordem do documento.
+
+No modo hierárquico o contexto de pastas de cada fronteira é obtido por uma
+varredura estrutural rápida (apenas <DL> e <H3>, fora de comentários). Cada processo devolve o
+estado em que terminou o seu trecho; se ele divergir do estado previsto para
+o trecho seguinte, o restante do arquivo é analisado sequencialmente a partir
+do estado real. Assim o resultado é sempre idêntico ao da análise sequencial.
+"""
+
+import mmap
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from html import unescape
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.models.buffer_parser import AnalisadorBuffer, limites_tag_abertura
+from app.models.file_path_check import FilePathCheck
+from app.models.icones import ICONES_COMPLETOS, ICONES_SOB_DEMANDA
+
+TAMANHO_MINIMO_TRECHO = 1024 * 1024
+
+_FRONTEIRA = re.compile(rb"<dt(?=[\s/>])", re.IGNORECASE)
+# Comentários e o conteúdo de <script>/<style> são consumidos inteiros para
+# que um <DT> ou <DL> escrito dentro deles não seja contado
+_OPACO = rb"<!--.*?(?:-->|\Z)|<(script|style)(?=[\s/>]).*?(?:</\1\s*>|\Z)"
+_REGIAO_OPACA = re.compile(_OPACO, re.IGNORECASE | re.DOTALL)
+_ESTRUTURA = re.compile(_OPACO + rb"|<(/?)(dl|h3)(?=[\s/>])", re.IGNORECASE | re.DOTALL)
+_FIM_TITULO = re.compile(rb"<(?:/?(?:h3|a|dl)|dt|dd)(?=[\s/>])", re.IGNORECASE)
+_TAG = re.compile(rb"<[^>]*>")
+
+
+def calcular_trechos(buffer, quantidade: int) -> List[Tuple[int, int]]:
+    """
+    Divide o buffer em até `quantidade` trechos que começam numa tag <DT>
+    fora de comentários e de <script>/<style>.
+    """
+    tamanho = len(buffer)
+    passo = max(1, tamanho // max(1, quantidade))
+    fronteiras = [0]
+    # As regiões opacas são percorridas uma só vez, em ordem, junto com as buscas
+    opacas = _REGIAO_OPACA.finditer(buffer)
+    opaca = next(opacas, None)
+    for indice in range(1, quantidade):
+        posicao = max(indice * passo, fronteiras[-1] + 1)
+        while True:
+            encontrado = _FRONTEIRA.search(buffer, posicao)
+            if encontrado is None:
+                break
+            while opaca is not None and opaca.end() <= encontrado.start():
+                opaca = next(opacas, None)
+            if opaca is None or encontrado.start() < opaca.start():
+                break
+            posicao = opaca.end()  # O <DT> está num comentário ou script
+        if encontrado is None:
+            break
+        fronteiras.append(encontrado.start())
+    fronteiras.append(tamanho)
+    return list(zip(fronteiras, fronteiras[1:]))
+
+
+def posicoes_estrutura(buffer) -> Iterator[Tuple[int, bytes]]:
+    """
+    Gera a posição e o nome (b"dl", b"/dl" ou b"h3") de cada tag que muda a
+    árvore de pastas, sem analisar o restante do documento.
+    """
+    for estrutura in _ESTRUTURA.finditer(buffer):
+        if estrutura.group(3) is None:
+            continue
+        nome = estrutura.group(2) + estrutura.group(3).lower()
+        if nome != b"/h3":
+            yield estrutura.start(), nome
+
+
+def prever_estados(buffer, inicios: List[int], encoding: str = "utf-8") -> List[tuple]:
+    """
+    Calcula, para cada posição em `inicios`, o estado da árvore de pastas
+    (no formato de `TokenizadorHierarquico.estado`) olhando só as tags
+    <DL> e <H3>.
+    """
+    pilha: List[Tuple[Optional[int], Tuple[str, ...]]] = [(None, ())]
+    pendente: Optional[Tuple[Optional[int], Tuple[str, ...]]] = None
+    proximo_id = 0
+    estados: List[tuple] = []
+    alvos = iter(sorted(inicios))
+    alvo = next(alvos, None)
+
+    for estrutura in _ESTRUTURA.finditer(buffer):
+        if estrutura.group(3) is None:
+            continue
+        while alvo is not None and estrutura.start() >= alvo:
+            estados.append((list(pilha), pendente, proximo_id))
+            alvo = next(alvos, None)
+        if alvo is None:
+            break
+
+        fechamento, nome = estrutura.group(2), estrutura.group(3).lower()
+        if nome == b"dl":
+            if not fechamento:
+                pilha.append(pendente or pilha[-1])
+                pendente = None
+            elif len(pilha) > 1:
+                pilha.pop()
+        elif not fechamento:
+            _, depois, _ = limites_tag_abertura(buffer, estrutura.start(), len(buffer))
+            fim_titulo = _FIM_TITULO.search(buffer, depois)
+            bruto = buffer[depois:fim_titulo.start() if fim_titulo else len(buffer)]
+            titulo = unescape(_TAG.sub(b"", bruto).decode(encoding)).strip()
+            pendente = (proximo_id, pilha[-1][1] + (titulo,))
+            proximo_id += 1
+
+    while alvo is not None:
+        estados.append((list(pilha), pendente, proximo_id))
+        alvo = next(alvos, None)
+    return estados
+
+
+def _analisar_trecho(
+    caminho: str, inicio: int, fim: int, estado: Optional[tuple], opcoes: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], Optional[tuple]]:
+    """
+    Tarefa executada em cada processo: mapeia o arquivo e analisa um trecho.
+    """
+    with open(caminho, "rb") as arquivo:
+        buffer = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        analisador = AnalisadorBuffer(
+            buffer, inicio=inicio, fim=fim, estado_inicial=estado, **opcoes
+        )
+        return list(analisador.iterar_tags()), analisador.estado_final
+    finally:
+        buffer.close()
+
+
+class AnalisadorParalelo:
+    """
+    Analisa um arquivo de favoritos dividindo-o em trechos processados em
+    paralelo. Os registros são os mesmos da análise sequencial.
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        workers: Optional[int] = None,
+        trechos_por_worker: int = 4,
+        tamanho_minimo_trecho: int = TAMANHO_MINIMO_TRECHO,
+        hierarquia: bool = False,
+        icones: str = ICONES_COMPLETOS,
+        encoding: str = "utf-8",
+    ) -> None:
+        """
+        Inicializa o analisador e valida o arquivo com `FilePathCheck`.
+        """
+        if not FilePathCheck(caminho).is_a_real_file():
+            raise ValueError(
+                "O arquivo não é válido conforme os critérios estabelecidos."
+            )
+        if icones == ICONES_SOB_DEMANDA:
+            raise ValueError("Ícones sob demanda não podem ser enviados entre processos.")
+        if workers is not None and workers <= 0:
+            raise ValueError("A quantidade de workers deve ser maior que zero.")
+        self.caminho = str(caminho)
+        self.workers = workers or os.cpu_count() or 1
+        self.trechos_por_worker = max(1, trechos_por_worker)
+        self.tamanho_minimo_trecho = max(1, tamanho_minimo_trecho)
+        self.hierarquia = hierarquia
+        self.opcoes = {"encoding": encoding, "hierarquia": hierarquia, "icones": icones}
+
+    def _quantidade_trechos(self, tamanho: int) -> int:
+        por_tamanho = max(1, tamanho // self.tamanho_minimo_trecho)
+        return max(1, min(self.workers * self.trechos_por_worker, por_tamanho))
+
+    def iterar_tags(self, executor: Optional[Executor] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Entrega os registros em ordem de documento, trecho a trecho.
+        """
+        with open(self.caminho, "rb") as arquivo:
+            buffer = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            trechos = calcular_trechos(buffer, self._quantidade_trechos(len(buffer)))
+            if len(trechos) == 1 or (executor is None and self.workers == 1):
+                yield from AnalisadorBuffer(buffer, **self.opcoes).iterar_tags()
+                return
+
+            if self.hierarquia:
+                estados = prever_estados(
+                    buffer, [inicio for inicio, _ in trechos[1:]], self.opcoes["encoding"]
+                )
+                estados.insert(0, None)
+            else:
+                estados = [None] * len(trechos)
+            yield from self._executar(buffer, trechos, estados, executor)
+        finally:
+            buffer.close()
+
+    def _executar(self, buffer, trechos, estados, executor) -> Iterator[Dict[str, Any]]:
+        proprio = executor is None
+        if proprio:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            futuros = [
+                executor.submit(_analisar_trecho, self.caminho, inicio, fim, estado, self.opcoes)
+                for (inicio, fim), estado in zip(trechos, estados)
+            ]
+            for indice, futuro in enumerate(futuros):
+                registros, estado_final = futuro.result()
+                yield from registros
+                proximo = indice + 1
+                if proximo < len(trechos) and self.hierarquia and estado_final != estados[proximo]:
+                    # A previsão falhou: continua sequencialmente do estado real
+                    for pendente in futuros[proximo:]:
+                        pendente.cancel()
+                    yield from AnalisadorBuffer(
+                        buffer,
+                        inicio=trechos[proximo][0],
+                        estado_inicial=estado_final,
+                        **self.opcoes,
+                    ).iterar_tags()
+                    return
+        finally:
+            if proprio:
+                executor.shutdown(cancel_futures=True)
+
+    def extrair_tags(self, executor: Optional[Executor] = None) -> List[Dict[str, Any]]:
+        """
+        Extrai os registros na mesma ordem do `AnalisadorHTML.extrair_tags`.
+        """
+        pastas: List[Dict[str, Any]] = []
+        links: List[Dict[str, Any]] = []
+        for registro in self.iterar_tags(executor):
+            (pastas if registro["tag"] == "H3" else links).append(registro)
+        return pastas + links
@@ -0,0 +1,251 @@
+# app/services/deduplicacao.py
+
+"""
+Normalização e deduplicação de URLs de favoritos.
+
+Cada HREF é reduzido a uma chave canônica segundo `RegrasCanonicas` (http e
+https equivalentes, sem "www.", sem barra final, sem parâmetros de
+rastreamento como utm_*, parâmetros ordenados, sem fragmento...). O
+`Deduplicador` percorre os registros uma única vez, agrupando-os num
+dicionário pela chave, e guarda por grupo apenas o favorito com o menor
+ADD_DATE, a contagem e algumas variantes do HREF.
+
+Para dezenas de milhões de URLs a memória é limitada: quando o dicionário
+passa de `limite_grupos`, os grupos são gravados ordenados num arquivo
+temporário (um "run") e o dicionário é esvaziado. No final os runs são
+intercalados com `heapq.merge`, e os grupos com a mesma chave são somados.
+"""
+
+import heapq
+import json
+import os
+import tempfile
+from itertools import groupby
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+LIMITE_GRUPOS = 1_000_000
+MAX_VARIANTES = 10
+
+PREFIXOS_RASTREAMENTO = ("utm_",)
+PARAMETROS_RASTREAMENTO = frozenset(
+    {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "yclid", "_ga"}
+)
+_PORTAS_PADRAO = {"http": 80, "https": 443}
+_SEM_DATA = float("inf")
+
+
+class RegrasCanonicas:
+    """
+    Regras que definem quando dois HREFs são o mesmo favorito.
+    """
+
+    def __init__(
+        self,
+        ignorar_esquema: bool = True,
+        remover_www: bool = True,
+        remover_barra_final: bool = True,
+        remover_fragmento: bool = True,
+        ordenar_parametros: bool = True,
+        prefixos_removidos: Iterable[str] = PREFIXOS_RASTREAMENTO,
+        parametros_removidos: Iterable[str] = PARAMETROS_RASTREAMENTO,
+    ) -> None:
+        """
+        Inicializa as regras. Os nomes de parâmetros são comparados em
+        minúsculas.
+        """
+        self.ignorar_esquema = ignorar_esquema
+        self.remover_www = remover_www
+        self.remover_barra_final = remover_barra_final
+        self.remover_fragmento = remover_fragmento
+        self.ordenar_parametros = ordenar_parametros
+        self.prefixos_removidos = tuple(prefixo.lower() for prefixo in prefixos_removidos)
+        self.parametros_removidos = frozenset(nome.lower() for nome in parametros_removidos)
+
+    def _parametro_removido(self, nome: str) -> bool:
+        nome = nome.lower()
+        return nome in self.parametros_removidos or nome.startswith(self.prefixos_removidos)
+
+    def canonicalizar(self, href: str) -> str:
+        """
+        Retorna a chave canônica do HREF. URLs que não são http(s) voltam
+        apenas sem espaços nas pontas.
+        """
+        href = href.strip()
+        try:
+            partes = urlsplit(href)
+            porta = partes.port
+        except ValueError:
+            return href
+        esquema = partes.scheme.lower()
+        if esquema not in _PORTAS_PADRAO or not partes.hostname:
+            return href
+
+        host = partes.hostname
+        if self.remover_www and host.startswith("www."):
+            host = host[4:]
+        if porta is not None and porta != _PORTAS_PADRAO[esquema]:
+            host = f"{host}:{porta}"
+        caminho = partes.path or "/"
+        if self.remover_barra_final:
+            caminho = caminho.rstrip("/")
+
+        chave = ("//" if self.ignorar_esquema else esquema + "://") + host + caminho
+        if partes.query:
+            # Os pares são comparados como estão, sem decodificar e codificar de novo
+            parametros = [
+                par
+                for par in partes.query.split("&")
+                if par and not self._parametro_removido(par.partition("=")[0])
+            ]
+            if self.ordenar_parametros:
+                parametros.sort()
+            if parametros:
+                chave += "?" + "&".join(parametros)
+        if partes.fragment and not self.remover_fragmento:
+            chave += "#" + partes.fragment
+        return chave
+
+
+def _data(add_date: Any) -> float:
+    texto = str(add_date).strip()
+    # isdigit() aceita "²", que o int() recusa
+    return int(texto) if texto.isascii() and texto.isdecimal() else _SEM_DATA
+
+
+def _juntar(grupo: List[Any], outro: List[Any], max_variantes: int) -> None:
+    """
+    Soma `outro` em `grupo`. Cada grupo é [data, href, add_date, título,
+    ocorrências, variantes].
+    """
+    if outro[0] < grupo[0]:
+        grupo[0:4] = outro[0:4]
+    grupo[4] += outro[4]
+    variantes = grupo[5]
+    for variante in outro[5]:
+        if len(variantes) >= max_variantes:
+            break
+        if variante not in variantes:
+            variantes.append(variante)
+
+
+class Deduplicador:
+    """
+    Agrupa registros de favoritos pela URL canônica numa única passada.
+    """
+
+    def __init__(
+        self,
+        regras: Optional[RegrasCanonicas] = None,
+        limite_grupos: int = LIMITE_GRUPOS,
+        max_variantes: int = MAX_VARIANTES,
+        pasta_temporaria: Optional[str] = None,
+    ) -> None:
+        """
+        Inicializa o deduplicador.
+
+        Args:
+            regras: Regras de canonicalização (padrão: `RegrasCanonicas()`).
+            limite_grupos: Grupos mantidos em memória antes de gravar um run.
+            max_variantes: Quantos HREFs distintos guardar por grupo.
+            pasta_temporaria: Onde gravar os runs (padrão: a do sistema).
+        """
+        if limite_grupos <= 0:
+            raise ValueError("O limite de grupos deve ser maior que zero.")
+        self.regras = regras or RegrasCanonicas()
+        self.limite_grupos = limite_grupos
+        self.max_variantes = max_variantes
+        self.pasta_temporaria = pasta_temporaria
+        self._grupos: Dict[str, List[Any]] = {}
+        self._runs: List[str] = []
+        self.registros = 0
+
+    def adicionar(self, registro: Dict[str, Any]) -> None:
+        """
+        Conta um registro <A>; registros de pastas são ignorados.
+        """
+        if registro.get("tag", "A") != "A":
+            return
+        self.registros += 1
+        href = registro["HREF"]
+        add_date = registro.get("ADD_DATE", "")
+        chave = self.regras.canonicalizar(href)
+        grupo = self._grupos.get(chave)
+        if grupo is None:
+            self._grupos[chave] = [_data(add_date), href, add_date, registro.get("TITLE", ""), 1, [href]]
+            if len(self._grupos) >= self.limite_grupos:
+                self._gravar_run()
+            return
+        data = _data(add_date)
+        if data < grupo[0]:
+            grupo[0:4] = [data, href, add_date, registro.get("TITLE", "")]
+        grupo[4] += 1
+        variantes = grupo[5]
+        if len(variantes) < self.max_variantes and href not in variantes:
+            variantes.append(href)
+
+    def processar(self, registros: Iterable[Dict[str, Any]]) -> "Deduplicador":
+        """
+        Conta todos os registros e retorna o próprio deduplicador.
+        """
+        for registro in registros:
+            self.adicionar(registro)
+        return self
+
+    def _gravar_run(self) -> None:
+        descritor, caminho = tempfile.mkstemp(
+            prefix="dedup-", suffix=".jsonl", dir=self.pasta_temporaria
+        )
+        with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+            for chave in sorted(self._grupos):
+                grupo = self._grupos[chave]
+                data = None if grupo[0] == _SEM_DATA else grupo[0]
+                arquivo.write(json.dumps([chave, data] + grupo[1:], ensure_ascii=False))
+                arquivo.write("\n")
+        self._runs.append(caminho)
+        self._grupos = {}
+
+    @staticmethod
+    def _ler_run(caminho: str) -> Iterator[Tuple[str, List[Any]]]:
+        with open(caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                chave, data, *grupo = json.loads(linha)
+                yield chave, [_SEM_DATA if data is None else data] + grupo
+
+    def _intercalar(self) -> Iterator[Tuple[str, List[Any]]]:
+        if self._grupos:
+            self._gravar_run()
+        runs = [self._ler_run(caminho) for caminho in self._runs]
+        try:
+            intercalados = heapq.merge(*runs, key=lambda item: item[0])
+            for chave, itens in groupby(intercalados, key=lambda item: item[0]):
+                _, grupo = next(itens)
+                for _, outro in itens:
+                    _juntar(grupo, outro, self.max_variantes)
+                yield chave, grupo
+        finally:
+            for caminho in self._runs:
+                os.remove(caminho)
+            self._runs = []
+
+    def grupos(self, somente_duplicados: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Entrega um resumo por URL canônica e libera o estado. Sem runs em
+        disco os grupos saem na ordem em que apareceram; com runs, em ordem
+        de chave canônica.
+        """
+        if self._runs:
+            itens: Iterable[Tuple[str, List[Any]]] = self._intercalar()
+        else:
+            itens, self._grupos = self._grupos.items(), {}
+        for chave, (_, href, add_date, titulo, ocorrencias, variantes) in itens:
+            if somente_duplicados and ocorrencias < 2:
+                continue
+            yield {
+                "canonica": chave,
+                "HREF": href,
+                "ADD_DATE": add_date,
+                "TITLE": titulo,
+                "ocorrencias": ocorrencias,
+                "variantes": variantes,
+            }
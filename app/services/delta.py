@@ -0,0 +1,283 @@
+# app/services/delta.py
+
+"""
+Comparação de uma exportação de favoritos com a fotografia da anterior.
+
+A fotografia (`SnapshotFavoritos`) guarda, para cada pasta, o ADD_DATE, o
+LAST_MODIFIED e os favoritos que ela contém diretamente, identificados por
+HREF + ADD_DATE. Ela é salva em JSON.
+
+Os navegadores atualizam o LAST_MODIFIED de uma pasta sempre que um favorito
+entra ou sai dela. Por isso `comparar` analisa só os trechos das pastas cujo
+LAST_MODIFIED mudou: uma varredura estrutural (apenas <DL> e <H3>) divide o
+arquivo mapeado em trechos por pasta, e os trechos das pastas inalteradas
+são pulados, com os favoritos reaproveitados da fotografia. Se a varredura
+estrutural errar (um <DL> dentro do valor de um atributo, por exemplo), o
+arquivo inteiro é analisado.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.models.buffer_parser import AnalisadorBuffer
+from app.models.icones import ICONES_IGNORADOS
+from app.models.tag_model import AnalisadorHTML
+from app.services.analise_paralela import posicoes_estrutura, prever_estados
+
+VERSAO_SNAPSHOT = 1
+
+ADICIONADO = "adicionado"
+REMOVIDO = "removido"
+MOVIDO = "movido"
+
+_RAIZ = ""
+
+
+def chave_pasta(caminho: Iterable[str], add_date: str) -> str:
+    """
+    Identifica uma pasta pelos títulos até ela (inclusive) e pelo seu ADD_DATE.
+    """
+    return "\x1f".join(caminho) + "\x1e" + add_date
+
+
+class SnapshotFavoritos:
+    """
+    Fotografia indexada de uma exportação: pastas e favoritos de cada uma.
+    """
+
+    def __init__(self, pastas: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        Inicializa a fotografia. A raiz (favoritos fora de pastas) tem a
+        chave "" e nunca é pulada.
+        """
+        self.pastas = pastas if pastas is not None else {}
+        self.pastas.setdefault(_RAIZ, self._nova_pasta((), "", ""))
+
+    @staticmethod
+    def _nova_pasta(caminho, add_date: str, last_modified: str) -> Dict[str, Any]:
+        return {
+            "PATH": list(caminho),
+            "ADD_DATE": add_date,
+            "LAST_MODIFIED": last_modified,
+            "ocorrencias": 0,
+            "links": [],
+        }
+
+    @staticmethod
+    def chave(registro: Dict[str, Any]) -> str:
+        """
+        Chave da pasta de um registro <H3> hierárquico.
+        """
+        return chave_pasta(registro["PATH"] + (registro["TITLE"],), registro["ADD_DATE"])
+
+    def adicionar_pasta(self, registro: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Registra a pasta de um registro <H3> hierárquico e retorna a entrada.
+        """
+        chave = self.chave(registro)
+        pasta = self.pastas.get(chave)
+        if pasta is None:
+            pasta = self.pastas[chave] = self._nova_pasta(
+                registro["PATH"] + (registro["TITLE"],),
+                registro["ADD_DATE"],
+                registro["LAST_MODIFIED"],
+            )
+        pasta["ocorrencias"] += 1
+        return pasta
+
+    @classmethod
+    def de_registros(cls, registros: Iterable[Dict[str, Any]]) -> "SnapshotFavoritos":
+        """
+        Monta a fotografia a partir de registros hierárquicos (em ordem de
+        documento, como os de `iterar_tags(hierarquia=True)`).
+        """
+        snapshot = cls()
+        por_id = {None: snapshot.pastas[_RAIZ]}
+        for registro in registros:
+            if registro["tag"] == "H3":
+                por_id[registro["FOLDER_ID"]] = snapshot.adicionar_pasta(registro)
+            else:
+                por_id[registro["PARENT_ID"]]["links"].append(
+                    [registro["HREF"], registro["ADD_DATE"], registro["TITLE"]]
+                )
+        return snapshot
+
+    @classmethod
+    def de_arquivo(cls, caminho, encoding: str = "utf-8") -> "SnapshotFavoritos":
+        """
+        Analisa a exportação inteira e monta a sua fotografia.
+        """
+        with AnalisadorHTML.from_path(caminho, encoding) as analisador:
+            return cls.de_registros(
+                analisador.iterar_tags(hierarquia=True, icones=ICONES_IGNORADOS)
+            )
+
+    @classmethod
+    def carregar(cls, caminho) -> "SnapshotFavoritos":
+        """
+        Lê a fotografia de um arquivo JSON.
+        """
+        with open(caminho, encoding="utf-8") as arquivo:
+            dados = json.load(arquivo)
+        if dados.get("versao") != VERSAO_SNAPSHOT:
+            raise ValueError(f"Versão de snapshot não suportada: {dados.get('versao')}")
+        return cls(dados["pastas"])
+
+    def salvar(self, caminho) -> None:
+        """
+        Grava a fotografia em JSON.
+        """
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"versao": VERSAO_SNAPSHOT, "pastas": self.pastas}, arquivo, ensure_ascii=False)
+
+    def indice(self, ignorar: Set[str] = frozenset()) -> Dict[Tuple[str, str], List[Tuple[str, ...]]]:
+        """
+        Indexa os favoritos por (HREF, ADD_DATE), com as pastas onde aparecem.
+        As pastas em `ignorar` ficam de fora.
+        """
+        indice: Dict[Tuple[str, str], List[Tuple[str, ...]]] = {}
+        for href, add_date, _, caminho in self.favoritos(ignorar):
+            indice.setdefault((href, add_date), []).append(caminho)
+        return indice
+
+    def favoritos(self, ignorar: Set[str] = frozenset()) -> Iterator[Tuple[str, str, str, Tuple[str, ...]]]:
+        """
+        Percorre os favoritos como (HREF, ADD_DATE, TITLE, PATH), exceto os
+        das pastas em `ignorar`.
+        """
+        for chave, pasta in self.pastas.items():
+            if chave in ignorar:
+                continue
+            caminho = tuple(pasta["PATH"])
+            for href, add_date, titulo in pasta["links"]:
+                yield href, add_date, titulo, caminho
+
+
+def _pasta_inalterada(anterior: Optional[Dict[str, Any]], registro: Dict[str, Any]) -> bool:
+    return (
+        anterior is not None
+        and anterior["ocorrencias"] == 1
+        and bool(registro["LAST_MODIFIED"])
+        and anterior["LAST_MODIFIED"] == registro["LAST_MODIFIED"]
+    )
+
+
+def _snapshot_incremental(
+    buffer, encoding: str, anterior: SnapshotFavoritos
+) -> Optional[Tuple[SnapshotFavoritos, Set[str]]]:
+    """
+    Monta a fotografia da nova exportação pulando as pastas inalteradas e
+    retorna também as chaves delas. Retorna None se a varredura estrutural
+    não bater com a análise real.
+    """
+    eventos = list(posicoes_estrutura(buffer))
+    for posicao, _ in eventos:
+        # Um "<DL" depois de um "<" sem ">" está dentro de outra tag (num atributo)
+        if buffer.rfind(b"<", 0, posicao) > buffer.rfind(b">", 0, posicao):
+            return None
+    inicios = [0] + [posicao for posicao, _ in eventos if posicao > 0]
+    tipos = dict(eventos)
+    fins = inicios[1:] + [len(buffer)]
+    # O estado antes (posição) e depois (posição + 1) da tag que abre cada trecho
+    posicoes = sorted(set(inicios) | {inicio + 1 for inicio in inicios})
+    estados = dict(zip(posicoes, prever_estados(buffer, posicoes, encoding)))
+
+    snapshot = SnapshotFavoritos()
+    por_id: Dict[Optional[int], Dict[str, Any]] = {None: snapshot.pastas[_RAIZ]}
+    puladas, chaves_puladas = set(), set()
+    for inicio, fim in zip(inicios, fins):
+        dono = estados[inicio + 1][0][-1][0]
+        if tipos.get(inicio) != b"h3" and dono in puladas:
+            continue
+        analisador = AnalisadorBuffer(
+            buffer,
+            encoding,
+            hierarquia=True,
+            icones=ICONES_IGNORADOS,
+            inicio=inicio,
+            fim=fim,
+            estado_inicial=estados[inicio],
+        )
+        for registro in analisador.iterar_tags():
+            if registro["tag"] == "H3":
+                pasta = snapshot.adicionar_pasta(registro)
+                if pasta["ocorrencias"] > 1:
+                    return None  # Pastas repetidas não podem ser puladas com segurança
+                por_id[registro["FOLDER_ID"]] = pasta
+                chave = SnapshotFavoritos.chave(registro)
+                antiga = anterior.pastas.get(chave)
+                if _pasta_inalterada(antiga, registro):
+                    puladas.add(registro["FOLDER_ID"])
+                    chaves_puladas.add(chave)
+                    pasta["links"] = antiga["links"]
+            elif registro["PARENT_ID"] not in puladas:
+                por_id[registro["PARENT_ID"]]["links"].append(
+                    [registro["HREF"], registro["ADD_DATE"], registro["TITLE"]]
+                )
+        if fim < len(buffer) and analisador.estado_final != estados[fim]:
+            return None
+    return snapshot, chaves_puladas
+
+
+def diferencas(
+    anterior: SnapshotFavoritos, novo: SnapshotFavoritos, inalteradas: Set[str] = frozenset()
+) -> List[Dict[str, Any]]:
+    """
+    Lista os favoritos adicionados, removidos e movidos de pasta. As pastas
+    em `inalteradas` (iguais nas duas fotografias) não são comparadas.
+    """
+    indice_anterior = anterior.indice(inalteradas)
+    indice_novo = novo.indice(inalteradas)
+    eventos: List[Dict[str, Any]] = []
+    for href, add_date, titulo, caminho in novo.favoritos(inalteradas):
+        chave = (href, add_date)
+        caminhos_anteriores = indice_anterior.get(chave)
+        if caminhos_anteriores is None:
+            eventos.append(
+                {"tipo": ADICIONADO, "HREF": href, "ADD_DATE": add_date, "TITLE": titulo, "PATH": caminho}
+            )
+        elif sorted(caminhos_anteriores) != sorted(indice_novo[chave]) and caminho not in caminhos_anteriores:
+            eventos.append(
+                {
+                    "tipo": MOVIDO,
+                    "HREF": href,
+                    "ADD_DATE": add_date,
+                    "TITLE": titulo,
+                    "PATH": caminho,
+                    "PATH_ANTERIOR": caminhos_anteriores[0],
+                }
+            )
+    for href, add_date, titulo, caminho in anterior.favoritos(inalteradas):
+        if (href, add_date) not in indice_novo:
+            eventos.append(
+                {"tipo": REMOVIDO, "HREF": href, "ADD_DATE": add_date, "TITLE": titulo, "PATH": caminho}
+            )
+    return eventos
+
+
+def comparar(
+    caminho, anterior: Optional[SnapshotFavoritos], encoding: str = "utf-8"
+) -> Dict[str, Any]:
+    """
+    Compara a exportação em `caminho` com a fotografia `anterior`.
+
+    Returns:
+        Dict com os `eventos` (adicionados, removidos e movidos), o novo
+        `snapshot`, a quantidade de `pastas_puladas` e se a análise foi
+        `incremental`.
+    """
+    if anterior is None:
+        anterior = SnapshotFavoritos()
+    with AnalisadorHTML.from_path(caminho, encoding) as analisador:
+        incremental = _snapshot_incremental(analisador.buffer, encoding, anterior)
+        if incremental is None:
+            registros = analisador.iterar_tags(hierarquia=True, icones=ICONES_IGNORADOS)
+            snapshot, puladas = SnapshotFavoritos.de_registros(registros), set()
+        else:
+            snapshot, puladas = incremental
+    return {
+        "eventos": diferencas(anterior, snapshot, puladas),
+        "snapshot": snapshot,
+        "pastas_puladas": len(puladas),
+        "incremental": incremental is not None,
+    }
@@ -0,0 +1,177 @@
+# app/services/descoberta.py
+
+"""
+Descoberta concorrente de arquivos de favoritos em árvores de pastas grandes.
+
+Em pastas de rede (NFS, SMB) o tempo é dominado pela latência de cada
+`scandir`/`stat`. Aqui a listagem de cada pasta e a validação de cada
+candidato viram tarefas de um `ThreadPoolExecutor`, para que essas esperas se
+sobreponham. A quantidade de tarefas em andamento é limitada, a busca pode ser
+cancelada por um `threading.Event` e só são entregues os arquivos que passam
+no `FilePathCheck.is_a_real_file` e começam com o DOCTYPE do formato Netscape.
+"""
+
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from app.models.file_path_check import FilePathCheck
+
+BYTES_INSPECIONADOS = 1024
+
+_DOCTYPE = re.compile(rb"<!doctype\s+netscape-bookmark-file-1\s*>", re.IGNORECASE)
+
+
+def eh_arquivo_de_favoritos(caminho, limite: int = BYTES_INSPECIONADOS) -> bool:
+    """
+    Verifica se o arquivo traz `<!DOCTYPE NETSCAPE-Bookmark-file-1>` nos
+    primeiros `limite` bytes.
+    """
+    try:
+        with open(caminho, "rb") as arquivo:
+            inicio = arquivo.read(limite)
+    except OSError:
+        return False
+    return _DOCTYPE.search(inicio) is not None
+
+
+def _listar_pasta(caminho: str, seguir_links: bool) -> Tuple[list, List[str]]:
+    """
+    Tarefa: lista uma pasta e separa as subpastas dos arquivos candidatos.
+    Cada subpasta vem com a chave (dispositivo, inode) quando os links são
+    seguidos, para evitar ciclos.
+    """
+    pastas, arquivos = [], []
+    with os.scandir(caminho) as entradas:
+        for entrada in entradas:
+            try:
+                if entrada.is_dir(follow_symlinks=seguir_links):
+                    chave = None
+                    if seguir_links:
+                        info = entrada.stat()
+                        chave = (info.st_dev, info.st_ino)
+                    pastas.append((entrada.path, chave))
+                elif entrada.is_file() and FilePathCheck(entrada.path).has_valid_extension():
+                    arquivos.append(entrada.path)
+            except OSError:
+                continue
+    return pastas, arquivos
+
+
+def _validar_candidato(caminho: str) -> bool:
+    """
+    Tarefa: valida o arquivo e confere o DOCTYPE.
+    """
+    return FilePathCheck(caminho).is_a_real_file() and eh_arquivo_de_favoritos(caminho)
+
+
+class DescobertaFavoritos:
+    """
+    Procura arquivos de favoritos exportados em uma ou mais pastas.
+    """
+
+    def __init__(
+        self,
+        raizes: Union[str, Path, Iterable[Union[str, Path]]],
+        workers: int = 8,
+        max_em_voo: int = 64,
+        profundidade_maxima: Optional[int] = None,
+        seguir_links: bool = False,
+        ordenado: bool = False,
+    ) -> None:
+        """
+        Inicializa a descoberta.
+
+        Args:
+            raizes: Pasta (ou pastas) onde a busca começa.
+            workers: Quantidade de threads.
+            max_em_voo: Máximo de tarefas enviadas ao pool ao mesmo tempo.
+            profundidade_maxima: Profundidade máxima (0 olha só as raízes).
+            seguir_links: Se deve entrar em links simbólicos para pastas.
+            ordenado: Se os arquivos devem ser entregues em ordem alfabética
+                (ao final da busca) em vez da ordem em que ficam prontos.
+        """
+        if workers <= 0:
+            raise ValueError("A quantidade de workers deve ser maior que zero.")
+        if max_em_voo <= 0:
+            raise ValueError("O limite de tarefas em andamento deve ser maior que zero.")
+        if isinstance(raizes, (str, Path)):
+            raizes = [raizes]
+        self.raizes = [Path(raiz) for raiz in raizes]
+        self.workers = workers
+        self.max_em_voo = max_em_voo
+        self.profundidade_maxima = profundidade_maxima
+        self.seguir_links = seguir_links
+        self.ordenado = ordenado
+        self.erros: List[Tuple[str, str]] = []
+
+    def executar(self, cancelar: Optional[threading.Event] = None) -> Iterator[Path]:
+        """
+        Entrega os arquivos de favoritos encontrados. A busca termina cedo se
+        `cancelar` for sinalizado ou se o consumidor parar de iterar.
+        """
+        encontrados = self._buscar(cancelar or threading.Event())
+        if self.ordenado:
+            yield from sorted(encontrados)
+        else:
+            yield from encontrados
+
+    def _buscar(self, cancelar: threading.Event) -> Iterator[Path]:
+        self.erros = []
+        visitadas = set()
+        pendentes = deque()
+        for raiz in self.raizes:
+            if not raiz.is_dir():
+                self.erros.append((str(raiz), "A pasta não é válida."))
+                continue
+            info = raiz.stat()
+            chave = (info.st_dev, info.st_ino)
+            if chave not in visitadas:
+                visitadas.add(chave)
+                pendentes.append((_listar_pasta, str(raiz), 0))
+
+        em_voo = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while (pendentes or em_voo) and not cancelar.is_set():
+                while pendentes and len(em_voo) < self.max_em_voo:
+                    tarefa, caminho, profundidade = pendentes.popleft()
+                    if tarefa is _listar_pasta:
+                        futuro = executor.submit(tarefa, caminho, self.seguir_links)
+                    else:
+                        futuro = executor.submit(tarefa, caminho)
+                    em_voo[futuro] = (tarefa, caminho, profundidade)
+
+                # O timeout permite perceber o cancelamento durante esperas longas
+                prontos, _ = wait(em_voo, timeout=0.1, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    tarefa, caminho, profundidade = em_voo.pop(futuro)
+                    try:
+                        resultado = futuro.result()
+                    except OSError as erro:
+                        self.erros.append((caminho, f"{type(erro).__name__}: {erro}"))
+                        continue
+                    if tarefa is _validar_candidato:
+                        if resultado:
+                            yield Path(caminho)
+                        continue
+
+                    pastas, arquivos = resultado
+                    pendentes.extend(
+                        (_validar_candidato, arquivo, profundidade) for arquivo in arquivos
+                    )
+                    limite = self.profundidade_maxima
+                    if limite is not None and profundidade >= limite:
+                        continue
+                    for pasta, chave in pastas:
+                        if chave is not None:
+                            if chave in visitadas:
+                                continue  # Link que leva a uma pasta já visitada
+                            visitadas.add(chave)
+                        pendentes.append((_listar_pasta, pasta, profundidade + 1))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,230 @@
+# app/services/exportacao.py
+
+"""
+Exportação dos favoritos em formatos tabulares: CSV, JSON Lines e, com o
+pyarrow instalado, Parquet e Arrow (formato de streaming do IPC).
+
+Os registros chegam do analisador um a um e são gravados em lotes de
+`tamanho_lote` linhas (um row group por lote no Parquet, um record batch no
+Arrow), de modo que a memória não depende do tamanho do arquivo. Cada linha
+traz o arquivo de origem, a tag, a URL e o host, o título, a pasta (os
+títulos das pastas ancestrais separados por "/"), a profundidade e as datas.
+
+No Parquet e no Arrow as datas são colunas `timestamp[s, UTC]` (o Parquet as
+guarda em milissegundos) e as colunas repetitivas (arquivo, tag, host e
+pasta) são codificadas em dicionário; no CSV e no JSON Lines as datas vão em
+ISO 8601 (UTC). Datas além de `MAX_SEGUNDOS` ficam nulas em todos os
+formatos. O pandas lê os quatro:
+`read_csv(..., parse_dates=[...])`, `read_json(..., lines=True)`,
+`read_parquet` e `pyarrow.ipc.open_stream(...).read_pandas()`.
+"""
+
+import csv
+import json
+import os
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # O pyarrow é opcional: sem ele só há CSV e JSON Lines
+    pa = pq = None
+
+from app.models.bookmark_store import extrair_host
+from app.models.icones import ICONES_IGNORADOS
+from app.models.tag_model import AnalisadorHTML
+
+COLUNAS = ("arquivo", "tag", "href", "host", "titulo", "pasta", "profundidade", "add_date", "last_modified")
+FORMATOS = ("csv", "jsonl", "parquet", "arrow")
+TAMANHO_LOTE = 65_536
+SEPARADOR_PASTA = "/"
+# Maior data aceita: o Parquet grava timestamp[s] em milissegundos de 64 bits
+MAX_SEGUNDOS = (2**63 - 1) // 1000
+
+_EXTENSOES = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".arrows": "arrow",
+}
+
+_Linha = Tuple[Any, ...]
+
+
+def _timestamp(valor: Optional[str]) -> Optional[int]:
+    valor = (valor or "").strip()
+    # isdigit() aceita "²", que o int() recusa
+    if not (valor.isascii() and valor.isdecimal()):
+        return None
+    segundos = int(valor)
+    return segundos if segundos <= MAX_SEGUNDOS else None
+
+
+def _iso(segundos: Optional[int]) -> Optional[str]:
+    if segundos is None:
+        return None
+    try:
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(segundos))
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def linha(registro: Dict[str, Any], arquivo: str = "") -> _Linha:
+    """
+    Converte um registro (plano ou hierárquico) numa linha com as `COLUNAS`.
+    Registros planos ficam sem título, pasta e profundidade.
+    """
+    href = registro.get("HREF")
+    caminho = registro.get("PATH")
+    return (
+        arquivo,
+        registro["tag"],
+        href,
+        None if href is None else extrair_host(href),
+        registro.get("TITLE"),
+        None if caminho is None else SEPARADOR_PASTA.join(caminho),
+        registro.get("DEPTH"),
+        _timestamp(registro.get("ADD_DATE")),
+        _timestamp(registro.get("LAST_MODIFIED")),
+    )
+
+
+def formato_do_destino(destino: str) -> str:
+    """
+    Deduz o formato pela extensão do arquivo de destino.
+    """
+    extensao = os.path.splitext(str(destino))[1].lower()
+    if extensao not in _EXTENSOES:
+        raise ValueError(f"Extensão desconhecida: {extensao!r}. Informe o formato: {list(FORMATOS)}")
+    return _EXTENSOES[extensao]
+
+
+def _esquema_arrow():
+    dicionario = pa.dictionary(pa.int32(), pa.string())
+    data = pa.timestamp("s", tz="UTC")
+    return pa.schema(
+        [
+            ("arquivo", dicionario),
+            ("tag", dicionario),
+            ("href", pa.string()),
+            ("host", dicionario),
+            ("titulo", pa.string()),
+            ("pasta", dicionario),
+            ("profundidade", pa.int16()),
+            ("add_date", data),
+            ("last_modified", data),
+        ]
+    )
+
+
+class ExportadorFavoritos:
+    """
+    Grava registros de um ou mais arquivos de favoritos num único arquivo
+    tabular, em lotes.
+    """
+
+    def __init__(self, destino: str, formato: Optional[str] = None, tamanho_lote: int = TAMANHO_LOTE) -> None:
+        """
+        Abre o destino para escrita.
+
+        Args:
+            destino: Arquivo de saída (substituído se existir).
+            formato: Um dos `FORMATOS`; sem ele, vale a extensão do destino.
+            tamanho_lote: Linhas por lote (row group no Parquet).
+        """
+        formato = formato or formato_do_destino(destino)
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato inválido. Use um destes: {list(FORMATOS)}")
+        if tamanho_lote <= 0:
+            raise ValueError("O tamanho do lote deve ser maior que zero.")
+        if formato in ("parquet", "arrow") and pa is None:
+            raise ImportError(f"O formato {formato!r} exige o pacote pyarrow.")
+        self.destino = str(destino)
+        self.formato = formato
+        self.tamanho_lote = tamanho_lote
+        self.total = 0
+        self._pendentes: List[_Linha] = []
+        self._arquivo = None
+        self._escritor = None
+        if formato == "parquet":
+            self._esquema = _esquema_arrow()
+            self._escritor = pq.ParquetWriter(self.destino, self._esquema, compression="zstd")
+        elif formato == "arrow":
+            self._esquema = _esquema_arrow()
+            self._escritor = pa.ipc.new_stream(self.destino, self._esquema)
+        else:
+            self._arquivo = open(self.destino, "w", encoding="utf-8", newline="")  # pylint: disable=R1732
+            if formato == "csv":
+                self._escritor = csv.writer(self._arquivo)
+                self._escritor.writerow(COLUNAS)
+
+    def escrever(self, registros: Iterable[Dict[str, Any]], arquivo: str = "") -> int:
+        """
+        Acrescenta os registros, com `arquivo` na coluna de origem, e retorna
+        quantos foram lidos.
+        """
+        quantidade = 0
+        iterador = iter(registros)
+        while True:
+            falta = self.tamanho_lote - len(self._pendentes)
+            lote = [linha(registro, arquivo) for registro in islice(iterador, falta)]
+            if not lote:
+                return quantidade
+            quantidade += len(lote)
+            self._pendentes.extend(lote)
+            if len(self._pendentes) >= self.tamanho_lote:
+                self._gravar()
+
+    def exportar_arquivo(self, caminho, encoding: str = "utf-8") -> int:
+        """
+        Analisa o arquivo (com hierarquia, sem ícones) e acrescenta os registros.
+        """
+        with AnalisadorHTML.from_path(caminho, encoding) as analisador:
+            return self.escrever(analisador.iterar_tags(hierarquia=True, icones=ICONES_IGNORADOS), str(caminho))
+
+    def _gravar(self) -> None:
+        lote, self._pendentes = self._pendentes, []
+        if not lote:
+            return
+        self.total += len(lote)
+        if self.formato in ("parquet", "arrow"):
+            colunas = list(zip(*lote))
+            tabela = pa.Table.from_arrays(
+                [pa.array(valores, type=campo.type) for valores, campo in zip(colunas, self._esquema)],
+                schema=self._esquema,
+            )
+            if self.formato == "parquet":
+                self._escritor.write_table(tabela, row_group_size=len(lote))
+            else:
+                self._escritor.write_table(tabela)
+            return
+        # As datas são as duas últimas colunas
+        convertidas = [item[:-2] + (_iso(item[-2]), _iso(item[-1])) for item in lote]
+        if self.formato == "csv":
+            self._escritor.writerows(convertidas)
+        else:
+            self._arquivo.write(
+                "".join(json.dumps(dict(zip(COLUNAS, item)), ensure_ascii=False) + "\n" for item in convertidas)
+            )
+
+    def fechar(self) -> None:
+        """
+        Grava o último lote e fecha o destino.
+        """
+        try:
+            self._gravar()
+        finally:
+            if self.formato in ("parquet", "arrow"):
+                self._escritor.close()
+            else:
+                self._arquivo.close()
+
+    def __enter__(self) -> "ExportadorFavoritos":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
@@ -4,11 +4,140 @@
 Arquivo global dos serviços de manipulação de dados para análises de tags, caminhos, arquivos e diretórios.
 """
 
+from collections import OrderedDict
 from os import stat_result
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Literal, Union
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union
+import functools
+import math
+import os
 import platform
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # O NumPy é opcional: sem ele a conversão em lote é feita em Python puro
+    np = None
+
+from app.instrumentacao import metricas
+
+FORMATO_DATA = "%d/%m/%Y %H:%M:%S"
+SEGUNDOS_DIA = 86_400
+LIMITE_CACHE_METADADOS = 100_000
+_EPOCA = datetime(1970, 1, 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _sistema_operacional() -> str:
+    # Constante durante todo o processo; o platform.system() consulta o uname
+    return platform.system()
+
+
+def _segundos(timestamp: float) -> int:
+    """
+    Segundo inteiro que `datetime.fromtimestamp(timestamp)` mostraria: os
+    microssegundos são arredondados (metade para o par) antes do corte.
+    """
+    fracao, inteiro = math.modf(timestamp)
+    microssegundos = round(fracao * 1e6)
+    segundos = int(inteiro)
+    if microssegundos >= 1_000_000:
+        segundos += 1
+    elif microssegundos < 0:
+        segundos -= 1
+    return segundos
+
+
+class _CacheMetadados:
+    """
+    LRU dos metadados já formatados. Cada caminho guarda os tempos do stat
+    (modificação, mudança de inode e acesso, em ns) com que foi formatado; se
+    algum deles mudou, a entrada não vale mais.
+    """
+
+    def __init__(self, limite: int) -> None:
+        self.limite = limite
+        self._itens: "OrderedDict[str, Tuple[Tuple[int, int, int], Dict]]" = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, caminho: str, tempos: Tuple[int, int, int]) -> Optional[Dict[str, Union[str, int, float]]]:
+        with self._trava:
+            item = self._itens.get(caminho)
+            if item is None or item[0] != tempos:
+                return None
+            self._itens.move_to_end(caminho)
+            return item[1]
+
+    def guardar(self, caminho: str, tempos: Tuple[int, int, int], metadados: Dict) -> None:
+        with self._trava:
+            self._itens[caminho] = (tempos, metadados)
+            self._itens.move_to_end(caminho)
+            while len(self._itens) > self.limite:
+                self._itens.popitem(last=False)
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._itens.clear()
+
+
+_cache_metadados = _CacheMetadados(LIMITE_CACHE_METADADOS)
+
+
+class _ConversorTimestamps:
+    """
+    Converte colunas de timestamps inteiros para o horário local com os mesmos
+    resultados de `datetime.fromtimestamp`, calculando o fuso uma vez por dia.
+    """
+
+    def __init__(self) -> None:
+        self._deslocamentos: Dict[int, Optional[int]] = {}
+        self._datas: Dict[int, str] = {}
+        self._horarios: Dict[int, str] = {}
+
+    def deslocamento(self, dia: int) -> Optional[int]:
+        """
+        Diferença (em segundos) entre o horário local e o UTC durante o dia
+        UTC `dia`, ou None se ela muda nesse dia (horário de verão) ou se o
+        dia está fora do alcance do sistema.
+        """
+        if dia not in self._deslocamentos:
+            try:
+                inicio = time.localtime(dia * SEGUNDOS_DIA).tm_gmtoff
+                fim = time.localtime(dia * SEGUNDOS_DIA + SEGUNDOS_DIA - 1).tm_gmtoff
+                # Os anos fora de 1000..9999 têm outra largura no strftime
+                ano_valido = 1000 <= (_EPOCA + timedelta(days=dia)).year <= 9999
+                self._deslocamentos[dia] = inicio if inicio == fim and ano_valido else None
+            except (OverflowError, OSError, ValueError):
+                self._deslocamentos[dia] = None
+        return self._deslocamentos[dia]
+
+    def data(self, dia: int) -> str:
+        """
+        Formata um dia local (dias desde 1970) como "dd/mm/aaaa ".
+        """
+        texto = self._datas.get(dia)
+        if texto is None:
+            texto = self._datas[dia] = (_EPOCA + timedelta(days=dia)).strftime("%d/%m/%Y ")
+        return texto
+
+    def horario(self, segundos: int) -> str:
+        """
+        Formata os segundos desde a meia-noite como "HH:MM:SS".
+        """
+        texto = self._horarios.get(segundos)
+        if texto is None:
+            horas, resto = divmod(segundos, 3600)
+            texto = self._horarios[segundos] = f"{horas:02d}:{resto // 60:02d}:{resto % 60:02d}"
+        return texto
+
+    def texto(self, local: int) -> str:
+        """
+        Formata segundos locais desde 1970 como "dd/mm/aaaa HH:MM:SS".
+        """
+        dia, segundos = divmod(local, SEGUNDOS_DIA)
+        return self.data(dia) + self.horario(segundos)
 
 
 class GeneralServices:
@@ -29,7 +158,76 @@ class GeneralServices:
         """
         Formata um timestamp para o formato "dd/mm/aaaa HH:MM:SS".
         """
-        return datetime.fromtimestamp(timestamp).strftime("%d/%m/%Y %H:%M:%S")
+        return datetime.fromtimestamp(timestamp).strftime(FORMATO_DATA)
+
+    @staticmethod
+    @metricas.cronometrar("global_services.formatar_timestamps")
+    def formatar_timestamps(
+        timestamps: Iterable[Union[int, str]], tipado: bool = False, usar_numpy: Optional[bool] = None
+    ) -> Union[List[str], List[datetime]]:
+        """
+        Converte uma coluna de timestamps (como os ADD_DATE e LAST_MODIFIED)
+        de uma vez, com os mesmos resultados de `_formatar_timestamp`.
+
+        Args:
+            timestamps: Timestamps inteiros (ou textos com dígitos).
+            tipado: Retorna objetos `datetime` em vez de textos.
+            usar_numpy: Usa `datetime64` do NumPy (padrão: se estiver instalado).
+
+        Returns:
+            Lista na mesma ordem da entrada.
+        """
+        valores = [int(timestamp) for timestamp in timestamps]
+        metricas.contar("global_services.timestamps", len(valores))
+        conversor = _ConversorTimestamps()
+        if usar_numpy is None:
+            usar_numpy = np is not None
+        if usar_numpy and valores:
+            return GeneralServices._formatar_timestamps_numpy(valores, tipado, conversor)
+
+        resultado: list = []
+        for valor in valores:
+            deslocamento = conversor.deslocamento(valor // SEGUNDOS_DIA)
+            if deslocamento is None:
+                data = datetime.fromtimestamp(valor)
+                resultado.append(data if tipado else data.strftime(FORMATO_DATA))
+            elif tipado:
+                resultado.append(_EPOCA + timedelta(seconds=valor + deslocamento))
+            else:
+                resultado.append(conversor.texto(valor + deslocamento))
+        return resultado
+
+    @staticmethod
+    def _formatar_timestamps_numpy(
+        valores: List[int], tipado: bool, conversor: _ConversorTimestamps
+    ) -> Union[List[str], List[datetime]]:
+        """
+        Variante de `formatar_timestamps` com arrays do NumPy.
+        """
+        if np is None:
+            raise ImportError("O NumPy não está instalado.")
+        segundos = np.asarray(valores, dtype=np.int64)
+        dias, posicoes = np.unique(segundos // SEGUNDOS_DIA, return_inverse=True)
+        deslocamentos = [conversor.deslocamento(dia) for dia in dias.tolist()]
+        invalidos = np.array([deslocamento is None for deslocamento in deslocamentos])[posicoes]
+        locais = segundos + np.array([deslocamento or 0 for deslocamento in deslocamentos], dtype=np.int64)[posicoes]
+
+        if tipado:
+            resultado = locais.astype("datetime64[s]").tolist()
+        else:
+            # Cada dia e cada horário distintos são formatados uma única vez
+            dias_locais, segundos_locais = np.divmod(locais, SEGUNDOS_DIA)
+            dias_unicos, por_dia = np.unique(dias_locais, return_inverse=True)
+            horarios_unicos, por_horario = np.unique(segundos_locais, return_inverse=True)
+            textos_dias = np.array([conversor.data(dia) for dia in dias_unicos.tolist()], dtype=object)
+            textos_horarios = np.array(
+                [conversor.horario(segundo) for segundo in horarios_unicos.tolist()], dtype=object
+            )
+            resultado = (textos_dias[por_dia] + textos_horarios[por_horario]).tolist()
+        for indice in np.flatnonzero(invalidos).tolist():
+            data = datetime.fromtimestamp(valores[indice])
+            resultado[indice] = data if tipado else data.strftime(FORMATO_DATA)
+        return resultado
 
     @staticmethod
     def _converter_tamanho(tamanho_bytes: int, unidade: str = "auto") -> str:
@@ -97,8 +295,9 @@ class GeneralServices:
         """
         Retorna o nome do sistema operacional.
         """
-        return platform.system()
+        return _sistema_operacional()
 
+    @metricas.cronometrar("global_services.obter_metadados")
     def obter_metadados(self) -> Dict[str, Union[str, int, float]]:
         """
         Obtém todos os metadados do arquivo ou diretório.
@@ -116,6 +315,89 @@ class GeneralServices:
         except FileNotFoundError as exc:
             raise FileNotFoundError("O arquivo ou diretório não existe.") from exc
 
+    @staticmethod
+    def _estatisticas_em_lote(
+        caminhos: Union[str, os.PathLike, Iterable[Union[str, os.PathLike]]]
+    ) -> Iterator[Tuple[str, Optional[stat_result]]]:
+        """
+        Gera (caminho, stat) com um único stat por caminho; None se o caminho
+        não existe. Numa pasta, os dados vêm das entradas do `os.scandir`.
+        """
+        if isinstance(caminhos, (str, os.PathLike)):
+            if not os.path.isdir(caminhos):
+                caminhos = [caminhos]
+            else:
+                with os.scandir(caminhos) as entradas:
+                    for entrada in entradas:
+                        try:
+                            yield entrada.path, entrada.stat()
+                        except OSError:
+                            yield entrada.path, None
+                return
+        for caminho in caminhos:
+            caminho = os.fspath(caminho)
+            try:
+                yield caminho, os.stat(caminho)
+            except (OSError, ValueError):
+                yield caminho, None
+
+    @classmethod
+    @metricas.cronometrar("global_services.obter_metadados_em_lote")
+    def obter_metadados_em_lote(
+        cls, caminhos: Union[str, os.PathLike, Iterable[Union[str, os.PathLike]]]
+    ) -> Dict[str, Optional[Dict[str, Union[str, int, float]]]]:
+        """
+        Obtém os metadados (os mesmos de `obter_metadados`) de vários caminhos
+        de uma vez.
+
+        Args:
+            caminhos: Uma pasta (são lidos os itens dentro dela) ou uma lista
+                de caminhos.
+
+        Returns:
+            Dicionário caminho -> metadados, na ordem de leitura, com None
+            para os caminhos que não existem. Os caminhos que não mudaram
+            desde a última consulta vêm do cache, sem nova formatação.
+        """
+        resultado: Dict[str, Optional[Dict[str, Union[str, int, float]]]] = {}
+        pendentes = []
+        acertos = 0
+        for caminho, estatisticas in cls._estatisticas_em_lote(caminhos):
+            resultado[caminho] = None
+            if estatisticas is None:
+                continue
+            tempos = (estatisticas.st_mtime_ns, estatisticas.st_ctime_ns, estatisticas.st_atime_ns)
+            metadados = _cache_metadados.obter(caminho, tempos)
+            if metadados is None:
+                pendentes.append((caminho, tempos, estatisticas))
+            else:
+                acertos += 1
+                resultado[caminho] = dict(metadados)
+        metricas.contar("global_services.cache_metadados", acertos, resultado="acerto")
+        metricas.contar("global_services.cache_metadados", len(pendentes), resultado="falta")
+
+        # Uma única conversão para as três colunas de tempo de todos os pendentes
+        textos = cls.formatar_timestamps(
+            [
+                _segundos(tempo)
+                for _, _, estatisticas in pendentes
+                for tempo in (estatisticas.st_atime, estatisticas.st_mtime, estatisticas.st_ctime)
+            ]
+        )
+        sistema = _sistema_operacional()
+        for indice, (caminho, tempos, estatisticas) in enumerate(pendentes):
+            metadados = {
+                "tamanho_formatado": cls._converter_tamanho(estatisticas.st_size),
+                "ultimo_acesso": textos[3 * indice],
+                "ultima_modificacao": textos[3 * indice + 1],
+                "data_criacao": textos[3 * indice + 2],
+                "permissoes": oct(estatisticas.st_mode),
+                "sistema_operacional": sistema,
+            }
+            _cache_metadados.guardar(caminho, tempos, metadados)
+            resultado[caminho] = dict(metadados)
+        return resultado
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,312 @@
+# app/services/indice.py
+
+"""
+Índice persistente dos favoritos em SQLite.
+
+Os registros extraídos são gravados em lote (`executemany` em transações
+grandes, com o banco em modo WAL) numa tabela de pastas e numa de favoritos,
+com índices por URL, host, pasta e ADD_DATE e uma tabela FTS5 com os títulos.
+Depois disso as consultas (`buscar`, `contar`) respondem em milissegundos,
+sem analisar os arquivos de novo. Se o SQLite não tiver FTS5, a busca por
+texto usa LIKE.
+"""
+
+import sqlite3
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.models.bookmark_store import extrair_host
+from app.models.icones import ICONES_IGNORADOS
+from app.models.tag_model import AnalisadorHTML
+
+TAMANHO_TRANSACAO = 100_000
+SEPARADOR_PASTA = "\x1f"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    id INTEGER PRIMARY KEY,
+    caminho TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS pastas (
+    id INTEGER PRIMARY KEY,
+    arquivo_id INTEGER NOT NULL,
+    pai_id INTEGER,
+    titulo TEXT NOT NULL,
+    caminho TEXT NOT NULL,
+    add_date INTEGER,
+    last_modified INTEGER
+);
+CREATE TABLE IF NOT EXISTS favoritos (
+    id INTEGER PRIMARY KEY,
+    arquivo_id INTEGER NOT NULL,
+    pasta_id INTEGER,
+    href TEXT NOT NULL,
+    host TEXT NOT NULL,
+    titulo TEXT NOT NULL,
+    add_date INTEGER
+);
+"""
+
+_NOMES_INDICES = (
+    "favoritos_href",
+    "favoritos_host",
+    "favoritos_pasta",
+    "favoritos_add_date",
+    "favoritos_arquivo",
+    "pastas_caminho",
+    "pastas_arquivo",
+)
+
+_INDICES = """
+CREATE INDEX IF NOT EXISTS favoritos_href ON favoritos (href);
+CREATE INDEX IF NOT EXISTS favoritos_host ON favoritos (host);
+CREATE INDEX IF NOT EXISTS favoritos_pasta ON favoritos (pasta_id);
+CREATE INDEX IF NOT EXISTS favoritos_add_date ON favoritos (add_date);
+CREATE INDEX IF NOT EXISTS favoritos_arquivo ON favoritos (arquivo_id);
+CREATE INDEX IF NOT EXISTS pastas_caminho ON pastas (caminho);
+CREATE INDEX IF NOT EXISTS pastas_arquivo ON pastas (arquivo_id);
+"""
+
+_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS favoritos_fts
+USING fts5 (titulo, content='favoritos', content_rowid='id')
+"""
+
+
+def _timestamp(valor: str) -> Optional[int]:
+    valor = valor.strip()
+    # isdigit() aceita "²", que o int() recusa
+    if not (valor.isascii() and valor.isdecimal()):
+        return None
+    numero = int(valor)
+    # O SQLite só guarda inteiros de 64 bits
+    return numero if numero <= 2**63 - 1 else None
+
+
+def _lotes(itens: Iterable, tamanho: int) -> Iterator[list]:
+    iterador = iter(itens)
+    while lote := list(islice(iterador, tamanho)):
+        yield lote
+
+
+class IndiceFavoritos:
+    """
+    Banco SQLite com os favoritos de um ou mais arquivos exportados.
+    """
+
+    def __init__(self, caminho: str = ":memory:", tamanho_transacao: int = TAMANHO_TRANSACAO) -> None:
+        """
+        Abre (ou cria) o banco em `caminho`.
+        """
+        if tamanho_transacao <= 0:
+            raise ValueError("O tamanho da transação deve ser maior que zero.")
+        self.caminho = str(caminho)
+        self.tamanho_transacao = tamanho_transacao
+        self._conexao = sqlite3.connect(self.caminho)
+        self._conexao.execute("PRAGMA journal_mode = WAL")
+        self._conexao.execute("PRAGMA synchronous = NORMAL")
+        self._conexao.execute("PRAGMA temp_store = MEMORY")
+        self._conexao.execute("PRAGMA cache_size = -65536")  # 64 MiB
+        self._conexao.executescript(_ESQUEMA + _INDICES)
+        try:
+            self._conexao.execute(_FTS)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        self._conexao.commit()
+
+    def fechar(self) -> None:
+        """
+        Fecha o banco.
+        """
+        self._conexao.close()
+
+    def __enter__(self) -> "IndiceFavoritos":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
+
+    def _proximo_id(self, tabela: str) -> int:
+        return self._conexao.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {tabela}").fetchone()[0]
+
+    def remover_arquivo(self, arquivo: str) -> None:
+        """
+        Remove do índice os favoritos e as pastas de um arquivo.
+        """
+        linha = self._conexao.execute("SELECT id FROM arquivos WHERE caminho = ?", (arquivo,)).fetchone()
+        if linha is None:
+            return
+        with self._conexao:
+            if self.fts:
+                self._conexao.execute(
+                    "INSERT INTO favoritos_fts (favoritos_fts, rowid, titulo) "
+                    "SELECT 'delete', id, titulo FROM favoritos WHERE arquivo_id = ?",
+                    linha,
+                )
+            self._conexao.execute("DELETE FROM favoritos WHERE arquivo_id = ?", linha)
+            self._conexao.execute("DELETE FROM pastas WHERE arquivo_id = ?", linha)
+            self._conexao.execute("DELETE FROM arquivos WHERE id = ?", linha)
+
+    def carregar(self, registros: Iterable[Dict[str, Any]], arquivo: str = "") -> int:
+        """
+        Grava os registros (planos ou hierárquicos, em ordem de documento) e
+        retorna a quantidade de favoritos gravados. Se o `arquivo` já estava
+        no índice, os seus registros anteriores são substituídos.
+        """
+        self.remover_arquivo(arquivo)
+        # Numa carga inicial é mais rápido criar os índices depois dos dados
+        vazio = self._conexao.execute("SELECT 1 FROM favoritos LIMIT 1").fetchone() is None
+        if vazio:
+            for nome in _NOMES_INDICES:
+                self._conexao.execute(f"DROP INDEX IF EXISTS {nome}")
+        with self._conexao:
+            cursor = self._conexao.execute("INSERT INTO arquivos (caminho) VALUES (?)", (arquivo,))
+        arquivo_id = cursor.lastrowid
+        # Os identificadores de pasta são locais ao arquivo; no banco eles
+        # ganham um deslocamento, o que dispensa consultas durante a carga
+        base_pasta = self._proximo_id("pastas")
+        primeiro_favorito = self._proximo_id("favoritos")
+
+        total = pastas_lidas = 0
+        for lote in _lotes(registros, self.tamanho_transacao):
+            pastas, favoritos = [], []
+            for registro in lote:
+                pai = registro.get("PARENT_ID")
+                pai = None if pai is None else base_pasta + pai
+                if registro["tag"] == "H3":
+                    pastas.append(
+                        (
+                            base_pasta + registro.get("FOLDER_ID", pastas_lidas),
+                            arquivo_id,
+                            pai,
+                            registro.get("TITLE", ""),
+                            SEPARADOR_PASTA.join(registro.get("PATH", ()) + (registro.get("TITLE", ""),)),
+                            _timestamp(registro["ADD_DATE"]),
+                            _timestamp(registro["LAST_MODIFIED"]),
+                        )
+                    )
+                    pastas_lidas += 1
+                else:
+                    href = registro["HREF"]
+                    favoritos.append(
+                        (
+                            arquivo_id,
+                            pai,
+                            href,
+                            extrair_host(href),
+                            registro.get("TITLE", ""),
+                            _timestamp(registro["ADD_DATE"]),
+                        )
+                    )
+            with self._conexao:
+                self._conexao.executemany("INSERT INTO pastas VALUES (?, ?, ?, ?, ?, ?, ?)", pastas)
+                self._conexao.executemany(
+                    "INSERT INTO favoritos (arquivo_id, pasta_id, href, host, titulo, add_date) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    favoritos,
+                )
+            total += len(favoritos)
+
+        if vazio:
+            self._conexao.executescript(_INDICES)
+        if self.fts:
+            with self._conexao:
+                self._conexao.execute(
+                    "INSERT INTO favoritos_fts (rowid, titulo) "
+                    "SELECT id, titulo FROM favoritos WHERE id >= ? AND arquivo_id = ?",
+                    (primeiro_favorito, arquivo_id),
+                )
+        return total
+
+    def indexar_arquivo(self, caminho, encoding: str = "utf-8") -> int:
+        """
+        Analisa o arquivo (com hierarquia, sem ícones) e grava os registros.
+        """
+        with AnalisadorHTML.from_path(caminho, encoding) as analisador:
+            return self.carregar(
+                analisador.iterar_tags(hierarquia=True, icones=ICONES_IGNORADOS), str(caminho)
+            )
+
+    def _filtros(
+        self,
+        href: Optional[str] = None,
+        host: Optional[str] = None,
+        pasta: Optional[Sequence[str]] = None,
+        add_date_min: Optional[int] = None,
+        add_date_max: Optional[int] = None,
+        texto: Optional[str] = None,
+        arquivo: Optional[str] = None,
+    ) -> Tuple[str, List[Any]]:
+        condicoes, parametros = [], []
+        if href is not None:
+            condicoes.append("f.href = ?")
+            parametros.append(href)
+        if host is not None:
+            condicoes.append("f.host = ?")
+            parametros.append(host.lower())
+        if pasta is not None:
+            # A pasta e todas as suas subpastas: um intervalo no índice de caminho
+            prefixo = SEPARADOR_PASTA.join(pasta)
+            condicoes.append(
+                "f.pasta_id IN (SELECT id FROM pastas WHERE caminho = ? OR (caminho > ? AND caminho < ?))"
+            )
+            parametros.extend([prefixo, prefixo + SEPARADOR_PASTA, prefixo + chr(ord(SEPARADOR_PASTA) + 1)])
+        if add_date_min is not None:
+            condicoes.append("f.add_date >= ?")
+            parametros.append(add_date_min)
+        if add_date_max is not None:
+            condicoes.append("f.add_date <= ?")
+            parametros.append(add_date_max)
+        if texto is not None:
+            if self.fts:
+                condicoes.append("f.id IN (SELECT rowid FROM favoritos_fts WHERE favoritos_fts MATCH ?)")
+                parametros.append(texto)
+            else:
+                condicoes.append("f.titulo LIKE ?")
+                parametros.append(f"%{texto}%")
+        if arquivo is not None:
+            condicoes.append("f.arquivo_id = (SELECT id FROM arquivos WHERE caminho = ?)")
+            parametros.append(str(arquivo))
+        return (" WHERE " + " AND ".join(condicoes)) if condicoes else "", parametros
+
+    def buscar(self, limite: int = 100, deslocamento: int = 0, **filtros) -> List[Dict[str, Any]]:
+        """
+        Busca favoritos pelos filtros `href`, `host`, `pasta` (tupla de
+        títulos; inclui as subpastas), `add_date_min`, `add_date_max`,
+        `texto` (consulta FTS5 nos títulos) e `arquivo`.
+        """
+        where, parametros = self._filtros(**filtros)
+        linhas = self._conexao.execute(
+            "SELECT f.href, f.host, f.titulo, f.add_date, p.caminho, a.caminho "
+            "FROM favoritos f JOIN arquivos a ON a.id = f.arquivo_id "
+            f"LEFT JOIN pastas p ON p.id = f.pasta_id{where} ORDER BY f.id LIMIT ? OFFSET ?",
+            parametros + [limite, deslocamento],
+        )
+        return [
+            {
+                "HREF": href,
+                "host": host,
+                "TITLE": titulo,
+                "ADD_DATE": add_date,
+                "PATH": tuple(caminho.split(SEPARADOR_PASTA)) if caminho else (),
+                "arquivo": arquivo,
+            }
+            for href, host, titulo, add_date, caminho, arquivo in linhas
+        ]
+
+    def contar(self, **filtros) -> int:
+        """
+        Conta os favoritos que atendem aos filtros de `buscar`.
+        """
+        where, parametros = self._filtros(**filtros)
+        return self._conexao.execute(f"SELECT COUNT(*) FROM favoritos f{where}", parametros).fetchone()[0]
+
+    def hosts(self, limite: int = 100) -> List[Tuple[str, int]]:
+        """
+        Retorna os hosts com mais favoritos e as suas contagens.
+        """
+        return self._conexao.execute(
+            "SELECT host, COUNT(*) AS total FROM favoritos GROUP BY host ORDER BY total DESC, host LIMIT ?",
+            (limite,),
+        ).fetchall()
@@ -0,0 +1,254 @@
+# app/services/ingestao.py
+
+"""
+Ingestão em lote de arquivos de favoritos de uma pasta.
+
+Os arquivos da pasta são filtrados pela extensão e analisados em paralelo
+num `ProcessPoolExecutor`. Os resultados são entregues à medida que cada
+arquivo termina, com o tempo de análise e o erro (se houver) de cada um,
+sem que a falha de um arquivo interrompa os demais.
+
+Com um manifesto (ver `app.services.manifesto`), os arquivos que não mudaram
+desde a última execução são servidos do cache sem serem analisados.
+"""
+
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from app.instrumentacao import metricas
+from app.models.file_path_check import FilePathCheck
+from app.models.folder_path_check import FolderPathCheck
+from app.models.icones import ICONES_COMPLETOS, ICONES_SOB_DEMANDA
+from app.models.tag_model import AnalisadorHTML
+from app.services.manifesto import ManifestoIngestao, hash_arquivo
+
+
+def processar_arquivo(caminho: str, opcoes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analisa um arquivo e retorna o resultado com o tempo gasto. Qualquer
+    erro fica registrado no próprio resultado.
+    """
+    inicio = time.perf_counter()
+    resultado: Dict[str, Any] = {"arquivo": caminho, "total": 0, "erro": None, "cache": False}
+    try:
+        if opcoes.get("hash", False):
+            # Calculado antes da análise: se o arquivo mudar no meio, o hash
+            # antigo apenas força uma nova análise na próxima execução
+            resultado["hash"] = hash_arquivo(caminho)
+        with AnalisadorHTML.from_path(caminho, extensoes=opcoes.get("extensoes")) as analisador:
+            registros = list(
+                analisador.iterar_tags(
+                    hierarquia=opcoes.get("hierarquia", False),
+                    icones=opcoes.get("icones", ICONES_COMPLETOS),
+                )
+            )
+        resultado["total"] = len(registros)
+        if opcoes.get("incluir_registros", True):
+            resultado["registros"] = registros
+    except Exception as exc:  # pylint: disable=W0718
+        resultado["erro"] = f"{type(exc).__name__}: {exc}"
+    resultado["duracao"] = time.perf_counter() - inicio
+    return resultado
+
+
+def _processar_lote(caminhos: List[str], opcoes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Tarefa executada em cada processo: analisa um lote de arquivos.
+    """
+    return [processar_arquivo(caminho, opcoes) for caminho in caminhos]
+
+
+def _resultado_com_erro(caminho: str, exc: BaseException) -> Dict[str, Any]:
+    """
+    Resultado de um arquivo cuja tarefa falhou fora de `processar_arquivo`
+    (por exemplo, quando o processo do worker morreu).
+    """
+    return {
+        "arquivo": caminho,
+        "total": 0,
+        "erro": f"{type(exc).__name__}: {exc}".rstrip(": "),
+        "cache": False,
+        "duracao": 0.0,
+    }
+
+
+class IngestaoEmLote:
+    """
+    Analisa todos os arquivos de favoritos de uma pasta em paralelo.
+    """
+
+    def __init__(
+        self,
+        pasta: str,
+        workers: Optional[int] = None,
+        tamanho_lote: int = 1,
+        extensoes: Optional[Iterable[str]] = None,
+        hierarquia: bool = False,
+        icones: str = ICONES_COMPLETOS,
+        incluir_registros: bool = True,
+        manifesto: Optional[str] = None,
+    ) -> None:
+        """
+        Inicializa a ingestão com a pasta e as opções de paralelismo.
+
+        Args:
+            pasta: Pasta com os arquivos exportados.
+            workers: Quantidade de processos (padrão: número de CPUs).
+            tamanho_lote: Quantidade de arquivos enviada a cada tarefa.
+            extensoes: Extensões aceitas (padrão: .html e .htm).
+            hierarquia: Se os registros devem trazer a pasta de cada favorito.
+            icones: Modo de ícones; "sob_demanda" não é aceito entre processos.
+            incluir_registros: Se os registros voltam junto com o resultado.
+            manifesto: Arquivo SQLite do manifesto; sem ele tudo é reanalisado.
+        """
+        if tamanho_lote <= 0:
+            raise ValueError("O tamanho do lote deve ser maior que zero.")
+        if workers is not None and workers <= 0:
+            raise ValueError("A quantidade de workers deve ser maior que zero.")
+        if icones == ICONES_SOB_DEMANDA:
+            raise ValueError("Ícones sob demanda não podem ser enviados entre processos.")
+        self.pasta = FolderPathCheck(pasta)
+        self.workers = workers or os.cpu_count() or 1
+        self.tamanho_lote = tamanho_lote
+        self.extensoes = set(extensoes) if extensoes is not None else None
+        self.opcoes = {
+            "hierarquia": hierarquia,
+            "icones": icones,
+            "incluir_registros": incluir_registros,
+            "extensoes": self.extensoes,
+        }
+        self.manifesto = manifesto
+
+    def listar_arquivos(self) -> List[Path]:
+        """
+        Lista os arquivos da pasta com extensão válida, em ordem alfabética.
+        """
+        if not self.pasta.path.is_dir():
+            raise ValueError(f"A pasta '{self.pasta.path}' não é válida.")
+        return sorted(
+            arquivo
+            for arquivo in self.pasta.list_files()
+            if FilePathCheck(arquivo).has_valid_extension(self.extensoes)
+        )
+
+    def _lotes(self, arquivos: List[Path]) -> Iterator[List[str]]:
+        for inicio in range(0, len(arquivos), self.tamanho_lote):
+            yield [str(arquivo) for arquivo in arquivos[inicio:inicio + self.tamanho_lote]]
+
+    def executar(self, executor: Optional[Executor] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Processa os arquivos e entrega cada resultado assim que fica pronto.
+
+        Com um único worker (e sem executor externo) o processamento ocorre
+        no próprio processo, sem o custo de criar o pool. Com manifesto, os
+        resultados vindos do cache são entregues primeiro, com "cache": True.
+        """
+        for resultado in self._executar(executor):
+            if metricas.ativo:
+                # Medido aqui, no processo principal: as métricas dos workers ficam neles
+                origem = "cache" if resultado["cache"] else "analise"
+                metricas.observar("ingestao.arquivo_segundos", resultado["duracao"], origem=origem)
+                metricas.contar("ingestao.registros", resultado["total"], origem=origem)
+                metricas.contar("ingestao.erros", resultado["erro"] is not None)
+            yield resultado
+
+    def _executar(self, executor: Optional[Executor]) -> Iterator[Dict[str, Any]]:
+        arquivos = self.listar_arquivos()
+        if self.manifesto is None:
+            yield from self._processar(arquivos, self.opcoes, executor)
+            return
+
+        extracao = {"hierarquia": self.opcoes["hierarquia"], "icones": self.opcoes["icones"]}
+        with ManifestoIngestao(self.manifesto, extracao) as manifesto:
+            estados, pendentes = {}, []
+            for arquivo in arquivos:
+                inicio = time.perf_counter()
+                stats = FilePathCheck(arquivo).get_metadata()
+                resultado = stats and manifesto.consultar(
+                    str(arquivo),
+                    stats.st_mtime_ns,
+                    stats.st_size,
+                    com_registros=self.opcoes["incluir_registros"],
+                )
+                if resultado:
+                    resultado["cache"] = True
+                    resultado["duracao"] = time.perf_counter() - inicio
+                    yield self._sem_registros(resultado)
+                    continue
+                if stats:
+                    estados[str(arquivo)] = (stats.st_mtime_ns, stats.st_size)
+                pendentes.append(arquivo)
+
+            opcoes = dict(self.opcoes, incluir_registros=True, hash=True)
+            for resultado in self._processar(pendentes, opcoes, executor):
+                hash_ = resultado.pop("hash", None)
+                estado = estados.get(resultado["arquivo"])
+                if resultado["erro"] is None and estado and hash_:
+                    manifesto.registrar(
+                        resultado["arquivo"], *estado, hash_, resultado["registros"]
+                    )
+                yield self._sem_registros(resultado)
+            manifesto.remover_ausentes((str(arquivo) for arquivo in arquivos), self.pasta.path)
+
+    def _sem_registros(self, resultado: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.opcoes["incluir_registros"]:
+            resultado.pop("registros", None)
+        return resultado
+
+    def _processar(
+        self, arquivos: List[Path], opcoes: Dict[str, Any], executor: Optional[Executor]
+    ) -> Iterator[Dict[str, Any]]:
+        if executor is None and self.workers == 1:
+            for lote in self._lotes(arquivos):
+                yield from _processar_lote(lote, opcoes)
+            return
+
+        proprio = executor is None
+        if proprio:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        interrompidos: List[str] = []
+        try:
+            futuros = {
+                executor.submit(_processar_lote, lote, opcoes): lote
+                for lote in self._lotes(arquivos)
+            }
+            for futuro in as_completed(futuros):
+                try:
+                    resultados = futuro.result()
+                except BrokenProcessPool:
+                    # Um worker morreu e levou junto todos os lotes em andamento
+                    interrompidos.extend(futuros[futuro])
+                    continue
+                except Exception as exc:  # pylint: disable=W0718
+                    resultados = [_resultado_com_erro(caminho, exc) for caminho in futuros[futuro]]
+                yield from resultados
+        finally:
+            if proprio:
+                executor.shutdown(cancel_futures=True)
+        if interrompidos:
+            yield from self._reprocessar(interrompidos, opcoes, proprio)
+
+    def _reprocessar(self, caminhos: List[str], opcoes: Dict[str, Any], proprio: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Tenta de novo, num pool novo e com um arquivo por tarefa, os arquivos
+        dos lotes interrompidos; assim só o arquivo que derruba o worker fica
+        com erro. Um executor externo quebrado não pode ser recriado.
+        """
+        if not proprio:
+            erro = BrokenProcessPool("O pool de processos foi interrompido.")
+            yield from (_resultado_com_erro(caminho, erro) for caminho in caminhos)
+            return
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            futuros = {executor.submit(processar_arquivo, caminho, opcoes): caminho for caminho in caminhos}
+            for futuro in as_completed(futuros):
+                try:
+                    yield futuro.result()
+                except Exception as exc:  # pylint: disable=W0718
+                    yield _resultado_com_erro(futuros[futuro], exc)
+        finally:
+            executor.shutdown(cancel_futures=True)
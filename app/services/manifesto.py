@@ -0,0 +1,167 @@
+# app/services/manifesto.py
+
+"""
+Manifesto persistente da ingestão, guardado num arquivo SQLite.
+
+Para cada arquivo analisado o manifesto registra o `st_mtime_ns`, o tamanho,
+um hash BLAKE2b do conteúdo e os registros extraídos (JSON comprimido com
+zlib). Numa nova execução, o arquivo cujo tamanho e data de modificação não
+mudaram é servido do cache sem ser lido. Se apenas a data mudou (um `touch`,
+uma cópia), o hash decide se o conteúdo é o mesmo.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+TAMANHO_HASH = 16
+TAMANHO_BLOCO = 1 << 20  # Leitura do arquivo em blocos de 1 MiB
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    caminho TEXT NOT NULL,
+    opcoes TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    tamanho INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    registros BLOB NOT NULL,
+    PRIMARY KEY (caminho, opcoes)
+)
+"""
+
+
+def hash_arquivo(caminho) -> str:
+    """
+    Calcula o hash BLAKE2b (128 bits) do conteúdo do arquivo.
+    """
+    resumo = hashlib.blake2b(digest_size=TAMANHO_HASH)
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(TAMANHO_BLOCO):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def _comprimir(registros) -> bytes:
+    return zlib.compress(json.dumps(registros, ensure_ascii=False).encode("utf-8"))
+
+
+def _descomprimir(dados: bytes):
+    registros = json.loads(zlib.decompress(dados))
+    for registro in registros:
+        # O JSON transforma as tuplas em listas
+        if "PATH" in registro:
+            registro["PATH"] = tuple(registro["PATH"])
+    return registros
+
+
+class ManifestoIngestao:
+    """
+    Guarda o estado de cada arquivo já analisado e os seus registros.
+    """
+
+    def __init__(self, caminho: str, opcoes: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Abre (ou cria) o manifesto. As `opcoes` de extração fazem parte da
+        chave, pois registros com e sem hierarquia não são intercambiáveis.
+        """
+        self.caminho = str(caminho)
+        self.opcoes = json.dumps(opcoes or {}, sort_keys=True)
+        self._conexao = sqlite3.connect(self.caminho)
+        self._conexao.execute(_ESQUEMA)
+        self._conexao.commit()
+        self._estados = {
+            caminho: (mtime_ns, tamanho, hash_)
+            for caminho, mtime_ns, tamanho, hash_ in self._conexao.execute(
+                "SELECT caminho, mtime_ns, tamanho, hash FROM arquivos WHERE opcoes = ?",
+                (self.opcoes,),
+            )
+        }
+
+    def __len__(self) -> int:
+        return len(self._estados)
+
+    def consultar(
+        self, caminho: str, mtime_ns: int, tamanho: int, com_registros: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o resultado guardado se o arquivo não mudou, ou None. Sem
+        `com_registros` os registros não são lidos nem descomprimidos.
+        """
+        estado = self._estados.get(caminho)
+        if estado is None or estado[1] != tamanho:
+            return None
+        if estado[0] != mtime_ns:
+            try:
+                if hash_arquivo(caminho) != estado[2]:
+                    return None
+            except OSError:
+                return None
+            self._conexao.execute(
+                "UPDATE arquivos SET mtime_ns = ? WHERE caminho = ? AND opcoes = ?",
+                (mtime_ns, caminho, self.opcoes),
+            )
+            self._estados[caminho] = (mtime_ns, tamanho, estado[2])
+
+        if not com_registros:
+            (total,) = self._conexao.execute(
+                "SELECT total FROM arquivos WHERE caminho = ? AND opcoes = ?",
+                (caminho, self.opcoes),
+            ).fetchone()
+            return {"arquivo": caminho, "total": total, "erro": None}
+        total, dados = self._conexao.execute(
+            "SELECT total, registros FROM arquivos WHERE caminho = ? AND opcoes = ?",
+            (caminho, self.opcoes),
+        ).fetchone()
+        return {"arquivo": caminho, "total": total, "erro": None, "registros": _descomprimir(dados)}
+
+    def registrar(
+        self, caminho: str, mtime_ns: int, tamanho: int, hash_: str, registros: list
+    ) -> None:
+        """
+        Grava (ou substitui) o estado e os registros de um arquivo.
+        """
+        self._conexao.execute(
+            "INSERT OR REPLACE INTO arquivos VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (caminho, self.opcoes, mtime_ns, tamanho, hash_, len(registros), _comprimir(registros)),
+        )
+        self._estados[caminho] = (mtime_ns, tamanho, hash_)
+
+    def remover_ausentes(self, caminhos: Iterable[str], pasta: Optional[str] = None) -> int:
+        """
+        Remove as entradas de arquivos que não estão em `caminhos`. Com
+        `pasta`, só as entradas dos arquivos que estão diretamente nela são
+        consideradas: o manifesto pode ser compartilhado por várias pastas.
+        """
+        ausentes = set(self._estados) - set(caminhos)
+        if pasta is not None:
+            ausentes = {caminho for caminho in ausentes if os.path.dirname(caminho) == str(pasta)}
+        self._conexao.executemany(
+            "DELETE FROM arquivos WHERE caminho = ? AND opcoes = ?",
+            [(caminho, self.opcoes) for caminho in ausentes],
+        )
+        for caminho in ausentes:
+            del self._estados[caminho]
+        return len(ausentes)
+
+    def salvar(self) -> None:
+        """
+        Confirma as alterações pendentes.
+        """
+        self._conexao.commit()
+
+    def fechar(self) -> None:
+        """
+        Confirma as alterações e fecha o arquivo.
+        """
+        self._conexao.commit()
+        self._conexao.close()
+
+    def __enter__(self) -> "ManifestoIngestao":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
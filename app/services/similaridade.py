@@ -0,0 +1,250 @@
+# app/services/similaridade.py
+
+"""
+Detecção de favoritos quase duplicados com MinHash e LSH.
+
+Cada favorito vira um conjunto de tokens (partes do host, do caminho e
+palavras do título) e uma assinatura MinHash de `bandas * linhas` valores: a
+fração de valores iguais entre duas assinaturas estima a similaridade de
+Jaccard entre os conjuntos. Para não comparar todos os pares, a assinatura é
+dividida em bandas (LSH) e só são comparados os favoritos que coincidem em
+pelo menos uma banda inteira. Pares com similaridade estimada a partir de
+`limiar` são unidos em grupos (union-find).
+
+Os hashes dos tokens saem de uma única chamada SHAKE-128 por token, com
+`bandas * linhas` valores de 32 bits cada, e o mínimo por posição é feito
+com `map(min, ...)`, sem laços em Python por permutação.
+"""
+
+import hashlib
+import re
+from array import array
+from operator import eq
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+BANDAS = 8
+LINHAS = 4
+LIMIAR = 0.6
+MAX_BALDE = 500
+MAX_CACHE_TOKENS = 500_000
+
+PALAVRAS_IGNORADAS = frozenset(
+    {
+        "http", "https", "www", "com", "org", "net", "br", "html", "htm", "php", "asp", "aspx",
+        "index", "amp", "the", "and", "of", "to", "in", "de", "da", "do", "e", "o", "a", "em",
+    }
+)
+
+_PALAVRA = re.compile(r"[^\W_]+")
+
+
+def tokens_favorito(href: str, titulo: str = "") -> Set[str]:
+    """
+    Tokens do favorito: palavras da URL (sem o esquema) e do título, em
+    minúsculas, sem palavras muito comuns e com pelo menos dois caracteres.
+    """
+    _, _, resto = href.partition("://")
+    return {
+        palavra
+        for palavra in _PALAVRA.findall(f"{resto or href} {titulo}".lower())
+        if len(palavra) > 1 and palavra not in PALAVRAS_IGNORADAS
+    }
+
+
+class DetectorSimilares:
+    """
+    Agrupa favoritos parecidos (mesmo artigo em outro caminho, espelhos,
+    títulos alterados) em tempo subquadrático.
+    """
+
+    def __init__(
+        self,
+        bandas: int = BANDAS,
+        linhas: int = LINHAS,
+        limiar: float = LIMIAR,
+        max_balde: int = MAX_BALDE,
+    ) -> None:
+        """
+        Inicializa o detector.
+
+        Args:
+            bandas: Quantidade de bandas LSH.
+            linhas: Valores da assinatura por banda. Com mais bandas (ou
+                menos linhas) mais pares parecidos viram candidatos; a
+                similaridade a partir da qual um par quase sempre é
+                candidato fica perto de (1 / bandas) ** (1 / linhas).
+            limiar: Similaridade estimada mínima para unir dois favoritos.
+            max_balde: Baldes com mais favoritos do que isso são ignorados,
+                pois tokens muito comuns gerariam pares demais.
+        """
+        if bandas <= 0 or linhas <= 0:
+            raise ValueError("As bandas e as linhas devem ser maiores que zero.")
+        if not 0 < limiar <= 1:
+            raise ValueError("O limiar deve estar entre 0 (exclusive) e 1.")
+        self.bandas = bandas
+        self.linhas = linhas
+        self.limiar = limiar
+        self.max_balde = max_balde
+        self.permutacoes = bandas * linhas
+        self._assinaturas = array("I")
+        self._favoritos: List[Tuple[str, str, str]] = []
+        self._cache: Dict[str, Tuple[int, ...]] = {}
+        self._ignorados: Set[Tuple[int, bytes]] = set()
+        self.comparacoes = 0
+
+    def __len__(self) -> int:
+        return len(self._favoritos)
+
+    @property
+    def baldes_ignorados(self) -> int:
+        """
+        Quantos baldes passaram de `max_balde` e não foram comparados.
+        """
+        return len(self._ignorados)
+
+    def _hashes(self, token: str) -> Tuple[int, ...]:
+        valores = self._cache.get(token)
+        if valores is None:
+            if len(self._cache) >= MAX_CACHE_TOKENS:
+                self._cache.clear()
+            # Tupla: percorrer um array criaria um int novo a cada valor
+            valores = tuple(array("I", hashlib.shake_128(token.encode("utf-8")).digest(4 * self.permutacoes)))
+            self._cache[token] = valores
+        return valores
+
+    def assinatura(self, tokens: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        """
+        Assinatura MinHash de um conjunto de tokens (None se estiver vazio).
+        """
+        hashes = [self._hashes(token) for token in tokens]
+        if not hashes:
+            return None
+        if len(hashes) == 1:
+            return hashes[0]
+        return tuple(map(min, *hashes))
+
+    def adicionar(self, registro: Dict[str, Any]) -> None:
+        """
+        Inclui um registro <A>; pastas e favoritos sem tokens são ignorados.
+        """
+        if registro.get("tag", "A") != "A":
+            return
+        titulo = registro.get("TITLE", "")
+        assinatura = self.assinatura(tokens_favorito(registro["HREF"], titulo))
+        if assinatura is None:
+            return
+        self._assinaturas.extend(assinatura)
+        self._favoritos.append((registro["HREF"], titulo, registro.get("ADD_DATE", "")))
+
+    def processar(self, registros: Iterable[Dict[str, Any]]) -> "DetectorSimilares":
+        """
+        Inclui todos os registros e retorna o próprio detector.
+        """
+        for registro in registros:
+            self.adicionar(registro)
+        return self
+
+    def similaridade(self, primeiro: int, segundo: int) -> float:
+        """
+        Similaridade de Jaccard estimada entre dois favoritos (por índice).
+        """
+        k = self.permutacoes
+        assinaturas = self._assinaturas
+        iguais = sum(
+            map(eq, assinaturas[primeiro * k:(primeiro + 1) * k], assinaturas[segundo * k:(segundo + 1) * k])
+        )
+        return iguais / k
+
+    def _baldes(self, banda: int) -> Iterator[Tuple[bytes, List[int]]]:
+        """
+        Favoritos com a mesma faixa da assinatura na banda (só os baldes com
+        dois ou mais), com a faixa.
+        """
+        k, linhas = self.permutacoes, self.linhas
+        dados = memoryview(self._assinaturas).cast("B")
+        largura = 4 * linhas
+        baldes: Dict[bytes, Any] = {}
+        for indice in range(len(self._favoritos)):
+            inicio = 4 * (indice * k + banda * linhas)
+            chave = bytes(dados[inicio:inicio + largura])
+            atual = baldes.get(chave)
+            if atual is None:
+                baldes[chave] = indice
+            elif isinstance(atual, int):
+                baldes[chave] = [atual, indice]
+            else:
+                atual.append(indice)
+        for chave, membros in baldes.items():
+            if isinstance(membros, list):
+                yield chave, membros
+
+    def _primeira_banda_comum(self, primeiro: int, segundo: int) -> int:
+        k, linhas = self.permutacoes, self.linhas
+        a = self._assinaturas[primeiro * k:(primeiro + 1) * k]
+        b = self._assinaturas[segundo * k:(segundo + 1) * k]
+        for banda in range(self.bandas):
+            faixa = a[banda * linhas:(banda + 1) * linhas]
+            if faixa == b[banda * linhas:(banda + 1) * linhas] and (banda, faixa.tobytes()) not in self._ignorados:
+                return banda
+        return self.bandas
+
+    def pares(self) -> Iterator[Tuple[int, int, float]]:
+        """
+        Entrega os pares (índice, índice, similaridade) candidatos pelo LSH
+        com similaridade estimada a partir do limiar, cada um uma vez.
+        """
+        for banda in range(self.bandas):
+            for chave, membros in self._baldes(banda):
+                if len(membros) > self.max_balde:
+                    self._ignorados.add((banda, chave))
+                    continue
+                for posicao, primeiro in enumerate(membros):
+                    for segundo in membros[posicao + 1:]:
+                        # Um par que coincide em várias bandas só é comparado na
+                        # primeira (fora dos baldes ignorados), sem guardar os
+                        # pares já vistos
+                        if banda and self._primeira_banda_comum(primeiro, segundo) < banda:
+                            continue
+                        self.comparacoes += 1
+                        similaridade = self.similaridade(primeiro, segundo)
+                        if similaridade >= self.limiar:
+                            yield primeiro, segundo, similaridade
+
+    def grupos(self) -> List[Dict[str, Any]]:
+        """
+        Agrupa os pares parecidos (transitivamente) e retorna os grupos com
+        dois ou mais favoritos, dos maiores para os menores. Cada grupo traz
+        os `favoritos` (HREF, TITLE, ADD_DATE) e a menor `similaridade`
+        entre os pares que o formaram.
+        """
+        pais = list(range(len(self._favoritos)))
+
+        def raiz(indice: int) -> int:
+            while pais[indice] != indice:
+                pais[indice] = pais[pais[indice]]
+                indice = pais[indice]
+            return indice
+
+        menores: Dict[int, float] = {}
+        for primeiro, segundo, similaridade in self.pares():
+            a, b = raiz(primeiro), raiz(segundo)
+            minimo = min(similaridade, menores.pop(a, 1.0), menores.pop(b, 1.0) if a != b else 1.0)
+            if a != b:
+                pais[max(a, b)] = min(a, b)
+            menores[min(a, b)] = minimo
+
+        membros: Dict[int, List[int]] = {}
+        for indice in range(len(pais)):
+            if pais[indice] != indice or indice in menores:
+                membros.setdefault(raiz(indice), []).append(indice)
+        grupos = [
+            {
+                "similaridade": menores[chave],
+                "favoritos": [
+                    dict(zip(("HREF", "TITLE", "ADD_DATE"), self._favoritos[indice])) for indice in indices
+                ],
+            }
+            for chave, indices in membros.items()
+        ]
+        grupos.sort(key=lambda grupo: -len(grupo["favoritos"]))
+        return grupos
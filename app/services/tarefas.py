@@ -0,0 +1,430 @@
+# app/services/tarefas.py
+
+"""
+Fila de tarefas longas (análise, deduplicação e verificação de links) com o
+estado guardado em SQLite.
+
+Quem envia a tarefa só grava uma linha no banco e recebe o identificador; o
+trabalho roda num `ProcessPoolExecutor`. O worker grava os resultados em
+lotes (a cada `TAMANHO_LOTE` resultados ou `INTERVALO_GRAVACAO` segundos),
+atualiza o progresso e, a cada lote, confere se a tarefa foi cancelada.
+Como todo o estado está no banco (em modo WAL), consultar o progresso ou
+paginar os resultados não depende do processo que executa a tarefa, e uma
+API com vários uploads simultâneos continua respondendo.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from app.models.icones import ICONES_IGNORADOS
+from app.models.tag_model import AnalisadorHTML
+from app.services.agendador import AgendadorHosts
+from app.services.deduplicacao import Deduplicador
+from app.services.verificacao import VerificadorLinks
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluida"
+CANCELADA = "cancelada"
+ERRO = "erro"
+ATIVOS = (PENDENTE, EXECUTANDO)
+
+TAMANHO_LOTE = 1000
+INTERVALO_GRAVACAO = 0.5
+LIMITE_PAGINA = 1000
+TIMEOUT_BANCO = 30.0
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tarefas (
+    id TEXT PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    arquivo TEXT NOT NULL,
+    temporario INTEGER NOT NULL,
+    parametros TEXT NOT NULL,
+    criada REAL NOT NULL,
+    iniciada REAL,
+    finalizada REAL,
+    progresso INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    erro TEXT
+);
+CREATE TABLE IF NOT EXISTS resultados (
+    tarefa_id TEXT NOT NULL,
+    ordem INTEGER NOT NULL,
+    dados TEXT NOT NULL,
+    PRIMARY KEY (tarefa_id, ordem)
+) WITHOUT ROWID;
+"""
+
+_COLUNAS = (
+    "id", "tipo", "estado", "arquivo", "parametros", "criada", "iniciada", "finalizada", "progresso", "total", "erro"
+)
+
+
+def _conectar(banco: str) -> sqlite3.Connection:
+    conexao = sqlite3.connect(banco, timeout=TIMEOUT_BANCO)
+    conexao.execute("PRAGMA synchronous = NORMAL")
+    return conexao
+
+
+class _Execucao:
+    """
+    Lado do worker: acumula os resultados de uma tarefa e os grava em lotes.
+    """
+
+    def __init__(self, conexao: sqlite3.Connection, tarefa_id: str) -> None:
+        self._conexao = conexao
+        self.tarefa_id = tarefa_id
+        self._pendentes: List[str] = []
+        self._gravados = 0
+        self._processados = 0
+        self._ultima_gravacao = time.monotonic()
+        self.cancelada = False
+
+    def definir_total(self, total: int) -> None:
+        """
+        Informa quantos itens a tarefa vai processar, quando se sabe.
+        """
+        with self._conexao:
+            self._conexao.execute("UPDATE tarefas SET total = ? WHERE id = ?", (total, self.tarefa_id))
+
+    def publicar(self, resultado: Any) -> bool:
+        """
+        Acrescenta um resultado. Retorna False se a tarefa foi cancelada e o
+        trabalho deve parar.
+        """
+        self._pendentes.append(json.dumps(resultado, ensure_ascii=False))
+        return self.avancar()
+
+    def avancar(self) -> bool:
+        """
+        Conta um item processado (com ou sem resultado) e grava o lote quando
+        ele enche ou o intervalo passa. Retorna False se a tarefa foi cancelada.
+        """
+        self._processados += 1
+        if len(self._pendentes) >= TAMANHO_LOTE or time.monotonic() - self._ultima_gravacao >= INTERVALO_GRAVACAO:
+            self.gravar()
+        return not self.cancelada
+
+    def gravar(self) -> None:
+        """
+        Grava os resultados acumulados e o progresso, se a tarefa ainda estiver
+        em execução.
+        """
+        with self._conexao:
+            cursor = self._conexao.execute(
+                "UPDATE tarefas SET progresso = ? WHERE id = ? AND estado = ?",
+                (self._processados, self.tarefa_id, EXECUTANDO),
+            )
+            if cursor.rowcount:
+                self._conexao.executemany(
+                    "INSERT INTO resultados VALUES (?, ?, ?)",
+                    ((self.tarefa_id, self._gravados + ordem, dados) for ordem, dados in enumerate(self._pendentes)),
+                )
+                self._gravados += len(self._pendentes)
+            else:
+                self.cancelada = True
+        self._pendentes.clear()
+        self._ultima_gravacao = time.monotonic()
+
+
+def _analisar(arquivo: str, parametros: Dict[str, Any], execucao: _Execucao) -> None:
+    with AnalisadorHTML.from_path(arquivo) as analisador:
+        registros = analisador.iterar_tags(hierarquia=parametros.get("hierarquia", False), icones=ICONES_IGNORADOS)
+        for registro in registros:
+            if not execucao.publicar(registro):
+                return
+
+
+def _deduplicar(arquivo: str, parametros: Dict[str, Any], execucao: _Execucao) -> None:
+    deduplicador = Deduplicador()
+    with AnalisadorHTML.from_path(arquivo) as analisador:
+        deduplicador.processar(analisador.iterar_tags(hierarquia=True, icones=ICONES_IGNORADOS))
+    for grupo in deduplicador.grupos(somente_duplicados=parametros.get("somente_duplicados", False)):
+        if not execucao.publicar(grupo):
+            return
+
+
+def _verificar(arquivo: str, parametros: Dict[str, Any], execucao: _Execucao) -> None:
+    agendador = AgendadorHosts()
+    with AnalisadorHTML.from_path(arquivo) as analisador:
+        hrefs = dict.fromkeys(
+            registro["HREF"] for registro in analisador.iterar_tags(icones=ICONES_IGNORADOS) if registro["tag"] == "A"
+        )
+    for href in hrefs:
+        agendador.adicionar(href)
+    execucao.definir_total(len(hrefs))
+    somente_quebrados = parametros.get("quebrados", False)
+
+    async def verificar() -> None:
+        async with VerificadorLinks() as verificador:
+            async for saida in agendador.executar(verificador.verificar_link):
+                resultado = saida["resultado"] or {"HREF": saida["item"], "ok": False, "erro": saida["erro"]}
+                if somente_quebrados and resultado["ok"] is not False:
+                    continuar = execucao.avancar()
+                else:
+                    continuar = execucao.publicar(resultado)
+                if not continuar:
+                    return
+
+    asyncio.run(verificar())
+
+
+TIPOS: Dict[str, Callable[[str, Dict[str, Any], _Execucao], None]] = {
+    "analisar": _analisar,
+    "deduplicar": _deduplicar,
+    "verificar": _verificar,
+}
+
+
+def executar_tarefa(banco: str, tarefa_id: str) -> str:
+    """
+    Executa uma tarefa pendente (no processo do worker) e retorna o estado
+    final. Uma tarefa cancelada antes de começar não é executada.
+    """
+    conexao = _conectar(banco)
+    try:
+        with conexao:
+            cursor = conexao.execute(
+                "UPDATE tarefas SET estado = ?, iniciada = ? WHERE id = ? AND estado = ?",
+                (EXECUTANDO, time.time(), tarefa_id, PENDENTE),
+            )
+        tipo, arquivo, temporario, parametros = conexao.execute(
+            "SELECT tipo, arquivo, temporario, parametros FROM tarefas WHERE id = ?", (tarefa_id,)
+        ).fetchone()
+        if not cursor.rowcount:
+            if temporario and os.path.exists(arquivo):
+                os.remove(arquivo)
+            return conexao.execute("SELECT estado FROM tarefas WHERE id = ?", (tarefa_id,)).fetchone()[0]
+
+        execucao = _Execucao(conexao, tarefa_id)
+        try:
+            TIPOS[tipo](arquivo, json.loads(parametros), execucao)
+            execucao.gravar()
+        except Exception as exc:  # pylint: disable=W0718
+            with conexao:
+                conexao.execute(
+                    "UPDATE tarefas SET estado = ?, finalizada = ?, erro = ? WHERE id = ? AND estado = ?",
+                    (ERRO, time.time(), f"{type(exc).__name__}: {exc}", tarefa_id, EXECUTANDO),
+                )
+        finally:
+            if temporario:
+                os.remove(arquivo)
+
+        with conexao:
+            if execucao.cancelada:
+                # Resultados parciais de uma tarefa cancelada não são servidos
+                conexao.execute("DELETE FROM resultados WHERE tarefa_id = ?", (tarefa_id,))
+            conexao.execute(
+                "UPDATE tarefas SET estado = ?, finalizada = ? WHERE id = ? AND estado = ?",
+                (CONCLUIDA, time.time(), tarefa_id, EXECUTANDO),
+            )
+        return conexao.execute("SELECT estado FROM tarefas WHERE id = ?", (tarefa_id,)).fetchone()[0]
+    finally:
+        conexao.close()
+
+
+class FilaTarefas:
+    """
+    Envia tarefas a um pool de workers e consulta o estado delas no banco.
+    """
+
+    def __init__(self, banco: str, workers: Optional[int] = None, executor: Optional[Executor] = None) -> None:
+        """
+        Abre (ou cria) o banco de tarefas.
+
+        Args:
+            banco: Arquivo SQLite com o estado e os resultados das tarefas.
+            workers: Quantidade de processos (padrão: número de CPUs).
+            executor: Executor já existente; sem ele um `ProcessPoolExecutor`
+                é criado no primeiro envio.
+
+        Tarefas que estavam em execução quando o processo anterior terminou
+        são marcadas com erro; as pendentes voltam para a fila.
+        """
+        if workers is not None and workers <= 0:
+            raise ValueError("A quantidade de workers deve ser maior que zero.")
+        self.banco = str(banco)
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = executor
+        self._proprio = executor is None
+        self._fechada = False
+        self._trava = threading.Lock()
+        conexao = _conectar(self.banco)
+        try:
+            conexao.execute("PRAGMA journal_mode = WAL")
+            conexao.executescript(_ESQUEMA)
+            with conexao:
+                conexao.execute(
+                    "UPDATE tarefas SET estado = ?, finalizada = ?, erro = ? WHERE estado = ?",
+                    (ERRO, time.time(), "Interrompida antes de terminar.", EXECUTANDO),
+                )
+            pendentes = [linha[0] for linha in conexao.execute(
+                "SELECT id FROM tarefas WHERE estado = ? ORDER BY criada", (PENDENTE,)
+            )]
+        finally:
+            conexao.close()
+        for tarefa_id in pendentes:
+            self._submeter(tarefa_id)
+
+    def _submeter(self, tarefa_id: str) -> None:
+        try:
+            with self._trava:
+                futuro = self._enviar_ao_pool(tarefa_id)
+        except Exception as exc:  # pylint: disable=W0718
+            # Nenhum pool aceitou a tarefa: ela não pode ficar pendente para sempre
+            self._registrar_falha(tarefa_id, exc)
+            return
+        futuro.add_done_callback(lambda futuro: self._finalizar(tarefa_id, futuro))
+
+    def _enviar_ao_pool(self, tarefa_id: str) -> Future:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            return self._executor.submit(executar_tarefa, self.banco, tarefa_id)
+        except BrokenProcessPool:
+            if not self._proprio:
+                raise
+            # Um worker morreu (falta de memória, segfault) e o pool não aceita
+            # mais tarefas; o pool próprio é recriado
+            self._executor.shutdown(wait=False)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor.submit(executar_tarefa, self.banco, tarefa_id)
+
+    def _finalizar(self, tarefa_id: str, futuro: Future) -> None:
+        if futuro.cancelled() or futuro.exception() is None:
+            return
+        if (
+            isinstance(futuro.exception(), BrokenProcessPool)
+            and self._proprio
+            and not self._fechada
+            and (self.consultar(tarefa_id) or {}).get("estado") == PENDENTE
+        ):
+            # A tarefa nem começou (quem derrubou o pool foi outra): vai para um pool novo
+            self._submeter(tarefa_id)
+            return
+        self._registrar_falha(tarefa_id, futuro.exception())
+
+    def _registrar_falha(self, tarefa_id: str, exc: BaseException) -> None:
+        """
+        Marca com erro uma tarefa que o worker não terminou (ou que nem chegou
+        a ele) e apaga o arquivo enviado, que o worker não vai mais apagar.
+        """
+        conexao = _conectar(self.banco)
+        try:
+            with conexao:
+                conexao.execute(
+                    "UPDATE tarefas SET estado = ?, finalizada = ?, erro = ? WHERE id = ? AND estado IN (?, ?)",
+                    (ERRO, time.time(), f"{type(exc).__name__}: {exc}", tarefa_id, *ATIVOS),
+                )
+            arquivo, temporario = conexao.execute(
+                "SELECT arquivo, temporario FROM tarefas WHERE id = ?", (tarefa_id,)
+            ).fetchone()
+        finally:
+            conexao.close()
+        if temporario and os.path.exists(arquivo):
+            os.remove(arquivo)
+
+    def enviar(
+        self, tipo: str, arquivo: str, parametros: Optional[Dict[str, Any]] = None, temporario: bool = False
+    ) -> str:
+        """
+        Enfileira uma tarefa sobre um arquivo e retorna o identificador dela.
+
+        Args:
+            tipo: "analisar", "deduplicar" ou "verificar".
+            arquivo: Arquivo de favoritos a processar.
+            parametros: Opções do tipo (hierarquia, somente_duplicados, quebrados).
+            temporario: Se o arquivo deve ser apagado quando a tarefa terminar.
+        """
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de tarefa inválido. Use um destes: {sorted(TIPOS)}")
+        tarefa_id = uuid.uuid4().hex
+        conexao = _conectar(self.banco)
+        try:
+            with conexao:
+                conexao.execute(
+                    "INSERT INTO tarefas (id, tipo, estado, arquivo, temporario, parametros, criada) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (tarefa_id, tipo, PENDENTE, str(arquivo), temporario, json.dumps(parametros or {}), time.time()),
+                )
+        finally:
+            conexao.close()
+        self._submeter(tarefa_id)
+        return tarefa_id
+
+    def consultar(self, tarefa_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o estado, o progresso e os tempos da tarefa, ou None.
+        """
+        conexao = _conectar(self.banco)
+        try:
+            linha = conexao.execute(f"SELECT {', '.join(_COLUNAS)} FROM tarefas WHERE id = ?", (tarefa_id,)).fetchone()
+        finally:
+            conexao.close()
+        if linha is None:
+            return None
+        tarefa = dict(zip(_COLUNAS, linha))
+        tarefa["parametros"] = json.loads(tarefa["parametros"])
+        return tarefa
+
+    def cancelar(self, tarefa_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancela a tarefa se ela ainda estiver pendente ou em execução e
+        retorna o estado dela, ou None. Uma tarefa em execução para no
+        próximo lote; uma pendente é descartada quando chega ao worker, que
+        também apaga o arquivo enviado.
+        """
+        conexao = _conectar(self.banco)
+        try:
+            with conexao:
+                conexao.execute(
+                    "UPDATE tarefas SET estado = ?, finalizada = ? WHERE id = ? AND estado IN (?, ?)",
+                    (CANCELADA, time.time(), tarefa_id, *ATIVOS),
+                )
+        finally:
+            conexao.close()
+        return self.consultar(tarefa_id)
+
+    def resultados(self, tarefa_id: str, inicio: int = 0, limite: int = 100) -> List[Any]:
+        """
+        Retorna até `limite` resultados a partir da posição `inicio`. Os
+        resultados já gravados podem ser lidos durante a execução.
+        """
+        if inicio < 0 or not 0 < limite <= LIMITE_PAGINA:
+            raise ValueError(f"Use inicio >= 0 e limite entre 1 e {LIMITE_PAGINA}.")
+        conexao = _conectar(self.banco)
+        try:
+            return [
+                json.loads(dados)
+                for (dados,) in conexao.execute(
+                    "SELECT dados FROM resultados WHERE tarefa_id = ? AND ordem >= ? ORDER BY ordem LIMIT ?",
+                    (tarefa_id, inicio, limite),
+                )
+            ]
+        finally:
+            conexao.close()
+
+    def fechar(self, esperar: bool = True) -> None:
+        """
+        Encerra o pool criado pela fila. Sem `esperar`, as tarefas que ainda
+        não começaram continuam pendentes no banco para a próxima execução.
+        """
+        self._fechada = True
+        if self._proprio and self._executor is not None:
+            self._executor.shutdown(wait=esperar, cancel_futures=not esperar)
+
+    def __enter__(self) -> "FilaTarefas":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
@@ -0,0 +1,373 @@
+# app/services/verificacao.py
+
+"""
+Verificação assíncrona dos links dos favoritos (quais ainda respondem).
+
+O `VerificadorLinks` usa apenas `asyncio` (streams com HTTP/1.1 e keep-alive,
+sem dependências externas). Cada host tem o seu pool de conexões reutilizáveis
+e um limite de requisições simultâneas, além do limite global. Cada link é
+consultado com HEAD e, se o servidor não aceitar HEAD, com GET; falhas de rede,
+timeouts e respostas 429/5xx são repetidas com espera exponencial. Os
+resultados ficam num cache com validade (TTL) e são entregues à medida que
+ficam prontos.
+"""
+
+import asyncio
+import ssl
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+TIMEOUT = 10.0
+TENTATIVAS = 2
+ESPERA_INICIAL = 0.5
+MAX_CONEXOES = 100
+MAX_POR_HOST = 4
+TTL_CACHE = 3600.0
+OCIOSIDADE_MAXIMA = 30.0
+MAX_CORPO_REUTILIZAVEL = 64 * 1024
+AGENTE = "BookmarkHunter/1.0"
+
+# Respostas a HEAD que costumam significar "este servidor não aceita HEAD"
+STATUS_SEM_HEAD = frozenset({403, 404, 405, 501})
+STATUS_REPETIR = frozenset({429, 500, 502, 503, 504})
+
+_PORTAS_PADRAO = {"http": 80, "https": 443}
+_LIMITE_CABECALHOS = 64 * 1024
+
+
+class _Conexao:
+    """
+    Conexão aberta com um host, com o instante do último uso.
+    """
+
+    __slots__ = ("leitor", "escritor", "ultimo_uso")
+
+    def __init__(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        self.leitor = leitor
+        self.escritor = escritor
+        self.ultimo_uso = time.monotonic()
+
+    def fechar(self) -> None:
+        self.escritor.close()
+
+
+class _PoolHost:
+    """
+    Conexões ociosas e limite de requisições simultâneas de um host.
+    """
+
+    def __init__(self, limite: int) -> None:
+        self.semaforo = asyncio.Semaphore(limite)
+        self.ociosas: List[_Conexao] = []
+        self.limite = limite
+
+    def obter(self) -> Optional[_Conexao]:
+        agora = time.monotonic()
+        while self.ociosas:
+            conexao = self.ociosas.pop()
+            if agora - conexao.ultimo_uso < OCIOSIDADE_MAXIMA and not conexao.leitor.at_eof():
+                return conexao
+            conexao.fechar()
+        return None
+
+    def devolver(self, conexao: _Conexao) -> None:
+        if len(self.ociosas) >= self.limite:
+            conexao.fechar()
+            return
+        conexao.ultimo_uso = time.monotonic()
+        self.ociosas.append(conexao)
+
+    def fechar(self) -> None:
+        for conexao in self.ociosas:
+            conexao.fechar()
+        self.ociosas.clear()
+
+
+def _destino(href: str) -> Optional[Tuple[str, str, int, str, str]]:
+    """
+    Separa um HREF http(s) em (esquema, host, porta, alvo, cabeçalho Host).
+    Retorna None para outros esquemas ou URLs inválidas.
+    """
+    try:
+        partes = urlsplit(href.strip())
+        porta = partes.port
+    except ValueError:
+        return None
+    esquema = partes.scheme.lower()
+    if esquema not in _PORTAS_PADRAO or not partes.hostname:
+        return None
+    try:
+        host = partes.hostname.encode("idna").decode("ascii")
+    except UnicodeError:
+        return None
+    porta = porta or _PORTAS_PADRAO[esquema]
+    alvo = (partes.path or "/") + (f"?{partes.query}" if partes.query else "")
+    cabecalho_host = host if porta == _PORTAS_PADRAO[esquema] else f"{host}:{porta}"
+    if ":" in host:
+        cabecalho_host = f"[{host}]" if porta == _PORTAS_PADRAO[esquema] else f"[{host}]:{porta}"
+    return esquema, host, porta, alvo, cabecalho_host
+
+
+def _decimal(texto: str) -> bool:
+    # isdigit() aceita "²" (os cabeçalhos vêm em latin-1), que o int() recusa
+    return texto.isascii() and texto.isdecimal()
+
+
+async def _ler_resposta(conexao: _Conexao, metodo: str) -> Tuple[int, Dict[str, str], bool]:
+    """
+    Lê status e cabeçalhos de uma resposta e retorna também se a conexão pode
+    ser reutilizada (o corpo, se houver, é descartado ou a conexão é fechada).
+    """
+    leitor = conexao.leitor
+    while True:
+        bloco = await leitor.readuntil(b"\r\n\r\n")
+        linhas = bloco.decode("latin-1").split("\r\n")
+        versao, _, resto = linhas[0].partition(" ")
+        if not versao.startswith("HTTP/"):
+            raise ValueError(f"Resposta HTTP inválida: {linhas[0][:80]!r}")
+        status = int(resto[:3])
+        if status >= 200 or status == 101:
+            break  # Respostas 1xx informativas são puladas
+    cabecalhos: Dict[str, str] = {}
+    for linha in linhas[1:]:
+        nome, separador, valor = linha.partition(":")
+        if separador:
+            cabecalhos[nome.strip().lower()] = valor.strip()
+
+    reutilizavel = versao == "HTTP/1.1" and cabecalhos.get("connection", "").lower() != "close"
+    if metodo == "HEAD" or status in (204, 304):
+        return status, cabecalhos, reutilizavel
+    tamanho = cabecalhos.get("content-length", "")
+    if "transfer-encoding" not in cabecalhos and _decimal(tamanho) and int(tamanho) <= MAX_CORPO_REUTILIZAVEL:
+        await leitor.readexactly(int(tamanho))
+        return status, cabecalhos, reutilizavel
+    # Corpo grande, chunked ou sem tamanho: só o status interessa
+    return status, cabecalhos, False
+
+
+async def _trocar(conexao: _Conexao, requisicao: bytes, metodo: str) -> Tuple[int, Dict[str, str], bool]:
+    """
+    Envia a requisição pela conexão e lê a resposta.
+    """
+    conexao.escritor.write(requisicao)
+    await conexao.escritor.drain()
+    return await _ler_resposta(conexao, metodo)
+
+
+class VerificadorLinks:
+    """
+    Verifica se os links respondem, com pools de conexão por host.
+    """
+
+    def __init__(
+        self,
+        timeout: float = TIMEOUT,
+        tentativas: int = TENTATIVAS,
+        espera_inicial: float = ESPERA_INICIAL,
+        max_conexoes: int = MAX_CONEXOES,
+        max_por_host: int = MAX_POR_HOST,
+        ttl_cache: float = TTL_CACHE,
+        contexto_ssl: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        """
+        Inicializa o verificador.
+
+        Args:
+            timeout: Segundos para conectar e receber a resposta, por tentativa.
+            tentativas: Repetições após a primeira tentativa que falhar.
+            espera_inicial: Espera antes da primeira repetição; dobra a cada uma.
+            max_conexoes: Requisições simultâneas no total.
+            max_por_host: Requisições simultâneas (e conexões ociosas) por host.
+            ttl_cache: Segundos em que um resultado é reaproveitado.
+            contexto_ssl: Contexto TLS (padrão: `ssl.create_default_context()`).
+        """
+        if max_conexoes <= 0 or max_por_host <= 0:
+            raise ValueError("Os limites de conexões devem ser maiores que zero.")
+        self.timeout = timeout
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.max_conexoes = max_conexoes
+        self.max_por_host = max_por_host
+        self.ttl_cache = ttl_cache
+        self.contexto_ssl = contexto_ssl
+        self._global: Optional[asyncio.Semaphore] = None
+        self._pools: Dict[Tuple[str, str, int], _PoolHost] = {}
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._em_andamento: Dict[str, asyncio.Task] = {}
+        self.conexoes_abertas = 0
+
+    async def __aenter__(self) -> "VerificadorLinks":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.fechar()
+
+    async def fechar(self) -> None:
+        """
+        Cancela as verificações em andamento e fecha as conexões ociosas.
+        """
+        for tarefa in list(self._em_andamento.values()):
+            tarefa.cancel()
+        for pool in self._pools.values():
+            pool.fechar()
+        self._pools.clear()
+
+    def _pool(self, esquema: str, host: str, porta: int) -> _PoolHost:
+        chave = (esquema, host, porta)
+        pool = self._pools.get(chave)
+        if pool is None:
+            pool = self._pools[chave] = _PoolHost(self.max_por_host)
+        return pool
+
+    async def _conectar(self, esquema: str, host: str, porta: int) -> _Conexao:
+        contexto = None
+        if esquema == "https":
+            if self.contexto_ssl is None:
+                self.contexto_ssl = ssl.create_default_context()
+            contexto = self.contexto_ssl
+        leitor, escritor = await asyncio.open_connection(
+            host, porta, ssl=contexto, server_hostname=host if contexto else None, limit=_LIMITE_CABECALHOS
+        )
+        self.conexoes_abertas += 1
+        return _Conexao(leitor, escritor)
+
+    async def _requisitar(
+        self, destino: Tuple[str, str, int, str, str], metodo: str
+    ) -> Tuple[int, Dict[str, str]]:
+        """
+        Faz uma requisição, reaproveitando uma conexão ociosa do host se houver.
+        """
+        esquema, host, porta, alvo, cabecalho_host = destino
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.max_conexoes)
+        pool = self._pool(esquema, host, porta)
+        requisicao = (
+            f"{metodo} {alvo} HTTP/1.1\r\nHost: {cabecalho_host}\r\nUser-Agent: {AGENTE}\r\n"
+            "Accept: */*\r\nConnection: keep-alive\r\n\r\n"
+        ).encode("latin-1", "replace")
+        async with self._global, pool.semaforo:
+            while True:
+                conexao = pool.obter()
+                reutilizada = conexao is not None
+                # O prazo vale para a conexão e a resposta juntas
+                limite = asyncio.get_running_loop().time() + self.timeout
+                try:
+                    if conexao is None:
+                        conexao = await asyncio.wait_for(self._conectar(esquema, host, porta), self.timeout)
+                    restante = max(limite - asyncio.get_running_loop().time(), 0.0)
+                    status, cabecalhos, reutilizavel = await asyncio.wait_for(
+                        _trocar(conexao, requisicao, metodo), restante
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if conexao is not None:
+                        conexao.fechar()
+                    if reutilizada:
+                        continue  # O servidor fechou a conexão ociosa: tenta com uma nova
+                    raise
+                except BaseException:
+                    if conexao is not None:
+                        conexao.fechar()
+                    raise
+                if reutilizavel:
+                    pool.devolver(conexao)
+                else:
+                    conexao.fechar()
+                return status, cabecalhos
+
+    def _espera(self, tentativa: int, cabecalhos: Optional[Dict[str, str]] = None) -> float:
+        espera = self.espera_inicial * 2**tentativa
+        retry_after = (cabecalhos or {}).get("retry-after", "")
+        if _decimal(retry_after):
+            espera = max(espera, min(float(retry_after), 60.0))
+        return espera
+
+    async def _verificar(self, href: str) -> Dict[str, Any]:
+        inicio = time.perf_counter()
+        resultado: Dict[str, Any] = {
+            "HREF": href,
+            "ok": None,
+            "status": None,
+            "metodo": None,
+            "location": None,
+            "erro": None,
+            "tentativas": 0,
+        }
+        destino = _destino(href)
+        if destino is None:
+            resultado["erro"] = "URL não suportada"
+            resultado["duracao"] = 0.0
+            return resultado
+
+        for tentativa in range(self.tentativas + 1):
+            resultado["tentativas"] = tentativa + 1
+            cabecalhos: Dict[str, str] = {}
+            try:
+                metodo = "HEAD"
+                status, cabecalhos = await self._requisitar(destino, metodo)
+                if status in STATUS_SEM_HEAD:
+                    metodo = "GET"
+                    status, cabecalhos = await self._requisitar(destino, metodo)
+                resultado.update(status=status, metodo=metodo, erro=None, location=cabecalhos.get("location"))
+            # No Python 3.10 o asyncio.TimeoutError não é um OSError
+            except (OSError, asyncio.TimeoutError, EOFError, asyncio.LimitOverrunError, ValueError) as exc:
+                resultado.update(status=None, metodo=None, erro=f"{type(exc).__name__}: {exc}".rstrip(": "))
+            if resultado["erro"] is None and resultado["status"] not in STATUS_REPETIR:
+                break
+            if tentativa < self.tentativas:
+                await asyncio.sleep(self._espera(tentativa, cabecalhos))
+
+        resultado["ok"] = resultado["status"] is not None and resultado["status"] < 400
+        resultado["duracao"] = time.perf_counter() - inicio
+        return resultado
+
+    async def verificar_link(self, href: str) -> Dict[str, Any]:
+        """
+        Verifica um link (ou reaproveita o resultado do cache) e retorna um
+        dict com HREF, ok, status, metodo, location, erro, tentativas,
+        duracao e cache.
+        """
+        agora = time.monotonic()
+        guardado = self._cache.get(href)
+        if guardado is not None and guardado[0] > agora:
+            return dict(guardado[1], cache=True)
+
+        # O mesmo link pedido duas vezes ao mesmo tempo gera uma só verificação
+        tarefa = self._em_andamento.get(href)
+        compartilhada = tarefa is not None
+        if tarefa is None:
+            tarefa = self._em_andamento[href] = asyncio.ensure_future(self._verificar(href))
+            tarefa.add_done_callback(lambda concluida: self._concluir(href, concluida))
+        resultado = await asyncio.shield(tarefa)
+        return dict(resultado, cache=compartilhada)
+
+    def _concluir(self, href: str, tarefa: asyncio.Task) -> None:
+        del self._em_andamento[href]
+        if not tarefa.cancelled() and tarefa.exception() is None:
+            self._cache[href] = (time.monotonic() + self.ttl_cache, tarefa.result())
+
+    async def verificar(
+        self, hrefs: Iterable[str], max_pendentes: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Verifica os links e entrega cada resultado assim que fica pronto (fora
+        da ordem de entrada). No máximo `max_pendentes` verificações (padrão:
+        4 x `max_conexoes`) existem ao mesmo tempo, o que permite passar
+        iteradores enormes.
+        """
+        limite = max_pendentes or 4 * self.max_conexoes
+        pendentes = set()
+        try:
+            for href in hrefs:
+                pendentes.add(asyncio.ensure_future(self.verificar_link(href)))
+                if len(pendentes) >= limite:
+                    prontos, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+                    for tarefa in prontos:
+                        yield tarefa.result()
+            while pendentes:
+                prontos, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+                for tarefa in prontos:
+                    yield tarefa.result()
+        finally:
+            for tarefa in pendentes:
+                tarefa.cancel()
@@ -0,0 +1,243 @@
+# benchmarks/bench_analisadores.py
+
+"""
+Mede os analisadores de favoritos em arquivos sintéticos de vários tamanhos.
+
+Uso:
+    python -m benchmarks.bench_analisadores --links 1000 10000 100000 1000000
+    python -m benchmarks.bench_analisadores --analisadores mmap stream --saida atual.json
+    python -m benchmarks.bench_analisadores --comparar anterior.json --tolerancia 0.1
+
+Cada medição roda num processo novo (spawn), de modo que o pico de memória
+(RSS) de um analisador não contamina o do próximo. Para cada analisador e
+tamanho o resultado, em JSON, traz o melhor tempo, os registros por segundo
+e o pico de RSS (com o RSS do processo antes da análise, para descontar o
+interpretador). Com `--comparar`, as medições são comparadas com as de um
+JSON anterior (por exemplo, de outro commit) e as mais lentas que a
+tolerância são marcadas como regressão.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from app.models.backends import BACKENDS, backend_disponivel
+from app.models.stream_parser import AnalisadorHTMLStream
+from app.models.tag_model import AnalisadorHTML
+from app.services.analise_paralela import AnalisadorParalelo
+from benchmarks.gerador_sintetico import gerar_arquivo
+
+TAMANHOS = (1_000, 10_000, 100_000, 1_000_000)
+LIMITE_BS4 = 100_000
+
+
+def _texto(backend: str) -> Callable[[str], int]:
+    def analisar(caminho: str) -> int:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return len(AnalisadorHTML(arquivo.read(), backend=backend).extrair_tags())
+
+    return analisar
+
+
+def _mmap(caminho: str) -> int:
+    with AnalisadorHTML.from_path(caminho) as analisador:
+        return len(analisador.extrair_tags())
+
+
+def _mmap_hierarquia(caminho: str) -> int:
+    with AnalisadorHTML.from_path(caminho) as analisador:
+        return sum(1 for _ in analisador.iterar_tags(hierarquia=True))
+
+
+def _stream(caminho: str) -> int:
+    return len(AnalisadorHTMLStream(caminho).extrair_tags())
+
+
+def _paralelo(caminho: str) -> int:
+    return len(AnalisadorParalelo(caminho).extrair_tags())
+
+
+# Os backends de texto (app.models.backends) levam o próprio nome; o RSS do
+# "paralelo" cobre só o processo principal, não os workers
+ANALISADORES: Dict[str, Callable[[str], int]] = {
+    **{backend: _texto(backend) for backend in BACKENDS},
+    "mmap": _mmap,
+    "mmap_hierarquia": _mmap_hierarquia,
+    "stream": _stream,
+    "paralelo": _paralelo,
+}
+
+
+def _rss_pico_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB no Linux, bytes no macOS
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def medir(analisador: str, caminho: str, repeticoes: int) -> Dict[str, Any]:
+    """
+    Executa o analisador `repeticoes` vezes no processo atual e retorna o
+    melhor tempo, a quantidade de registros e o pico de RSS.
+    """
+    funcao = ANALISADORES[analisador]
+    rss_base = _rss_pico_mb()
+    melhor = float("inf")
+    registros = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        registros = funcao(caminho)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return {
+        "segundos": melhor,
+        "registros": registros,
+        "registros_por_segundo": registros / melhor if melhor > 0 else None,
+        "rss_pico_mb": _rss_pico_mb(),
+        "rss_base_mb": rss_base,
+    }
+
+
+def _medir_isolado(analisador: str, caminho: str, repeticoes: int) -> Dict[str, Any]:
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+        return executor.submit(medir, analisador, caminho, repeticoes).result()
+
+
+def _commit() -> Optional[str]:
+    try:
+        saida = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return saida.stdout.strip() or None
+
+
+def executar(
+    tamanhos=TAMANHOS,
+    analisadores=tuple(ANALISADORES),
+    repeticoes: int = 3,
+    limite_bs4: int = LIMITE_BS4,
+    **opcoes_gerador,
+) -> Dict[str, Any]:
+    """
+    Gera um arquivo sintético por tamanho e mede cada analisador sobre ele.
+    As `opcoes_gerador` vão para `gerar_arquivo` (profundidade,
+    proporcao_icones, proporcao_unicode, ...).
+    """
+    resultado: Dict[str, Any] = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeticoes": repeticoes,
+        "gerador": opcoes_gerador,
+        "medicoes": [],
+    }
+    with tempfile.TemporaryDirectory() as pasta:
+        for links in tamanhos:
+            caminho = gerar_arquivo(os.path.join(pasta, f"favoritos-{links}.html"), links, **opcoes_gerador)
+            for analisador in analisadores:
+                medicao: Dict[str, Any] = {
+                    "analisador": analisador,
+                    "links": links,
+                    "tamanho_bytes": os.path.getsize(caminho),
+                }
+                if analisador in BACKENDS and not backend_disponivel(analisador):
+                    medicao["ignorado"] = "não instalado"
+                elif analisador.startswith("bs4") and links > limite_bs4:
+                    medicao["ignorado"] = f"acima de {limite_bs4} links"
+                else:
+                    medicao.update(_medir_isolado(analisador, caminho, repeticoes))
+                resultado["medicoes"].append(medicao)
+                print(json.dumps(medicao), file=sys.stderr, flush=True)
+            os.remove(caminho)
+    return resultado
+
+
+def comparar(anterior: Dict[str, Any], atual: Dict[str, Any], tolerancia: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Compara as medições presentes nos dois resultados (mesmo analisador e
+    tamanho). `razao` é o tempo atual sobre o anterior; acima de
+    1 + `tolerancia` a medição é marcada como regressão.
+    """
+    tempos = {
+        (medicao["analisador"], medicao["links"]): medicao["segundos"]
+        for medicao in anterior["medicoes"]
+        if "segundos" in medicao
+    }
+    comparacao = []
+    for medicao in atual["medicoes"]:
+        chave = (medicao["analisador"], medicao["links"])
+        if "segundos" not in medicao or chave not in tempos:
+            continue
+        razao = medicao["segundos"] / tempos[chave]
+        comparacao.append(
+            {
+                "analisador": chave[0],
+                "links": chave[1],
+                "anterior": tempos[chave],
+                "atual": medicao["segundos"],
+                "razao": razao,
+                "regressao": razao > 1 + tolerancia,
+            }
+        )
+    return comparacao
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--links", type=int, nargs="+", default=list(TAMANHOS))
+    parser.add_argument("--analisadores", nargs="+", choices=list(ANALISADORES), default=list(ANALISADORES))
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--limite-bs4", type=int, default=LIMITE_BS4, help="Maior arquivo medido com o bs4.")
+    parser.add_argument("--profundidade", type=int, default=1)
+    parser.add_argument("--icones", type=float, default=0.3, help="Fração dos links com ícone.")
+    parser.add_argument("--unicode", type=float, default=0.0, help="Fração dos títulos com texto Unicode.")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="Grava o JSON neste arquivo (além de imprimi-lo).")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior.")
+    parser.add_argument("--tolerancia", type=float, default=0.1)
+    args = parser.parse_args()
+
+    resultado = executar(
+        args.links,
+        args.analisadores,
+        args.repeticoes,
+        args.limite_bs4,
+        semente=args.semente,
+        profundidade=args.profundidade,
+        proporcao_icones=args.icones,
+        proporcao_unicode=args.unicode,
+    )
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            resultado["comparacao"] = comparar(json.load(arquivo), resultado, args.tolerancia)
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto + "\n")
+    print(texto)
+    return 1 if any(item["regressao"] for item in resultado.get("comparacao", ())) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
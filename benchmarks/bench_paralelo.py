@@ -0,0 +1,104 @@
+# benchmarks/bench_paralelo.py
+
+"""
+Compara a análise paralela de um único arquivo (`AnalisadorParalelo`) com o
+`AnalisadorHTML` e a análise sequencial sobre mmap, com 1, 2, 4 e 8 workers.
+
+Uso:
+    python -m benchmarks.bench_paralelo --links 200000
+    python -m benchmarks.bench_paralelo --arquivo favoritos.html
+
+O resultado é impresso em JSON.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.models.tag_model import AnalisadorHTML
+from app.services.analise_paralela import AnalisadorParalelo
+from benchmarks.gerador_sintetico import gerar_arquivo
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    """
+    Retorna o melhor tempo (em segundos) entre as repetições.
+    """
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def executar(caminho: str, workers=(1, 2, 4, 8), repeticoes: int = 3, sem_bs4: bool = False):
+    """
+    Executa as medições e retorna um dicionário com os tempos e speed-ups.
+    """
+    resultado = {
+        "arquivo": caminho,
+        "tamanho_bytes": os.path.getsize(caminho),
+        "cpus": os.cpu_count(),
+        "medicoes": [],
+    }
+    with AnalisadorHTML.from_path(caminho) as analisador:
+        esperado = list(analisador.iterar_tags(hierarquia=True))
+    resultado["registros"] = len(esperado)
+
+    def sequencial():
+        with AnalisadorHTML.from_path(caminho) as analisador:
+            return list(analisador.iterar_tags(hierarquia=True))
+
+    if not sem_bs4:
+        with open(caminho, encoding="utf-8") as arquivo:
+            conteudo = arquivo.read()
+        base = _medir(lambda: AnalisadorHTML(conteudo, backend="bs4").extrair_tags(), 1)
+        resultado["medicoes"].append({"analisador": "AnalisadorHTML (bs4)", "segundos": base})
+    tempo_sequencial = _medir(sequencial, repeticoes)
+    resultado["medicoes"].append(
+        {"analisador": "AnalisadorHTML.from_path", "segundos": tempo_sequencial}
+    )
+    referencia = tempo_sequencial if sem_bs4 else base
+
+    for quantidade in workers:
+        paralelo = AnalisadorParalelo(caminho, workers=quantidade, hierarquia=True)
+        # O pool é criado fora da medição, como num serviço de longa duração
+        with ProcessPoolExecutor(max_workers=quantidade) as executor:
+            if list(paralelo.iterar_tags(executor)) != esperado:
+                raise AssertionError("A análise paralela divergiu da sequencial.")
+            segundos = _medir(lambda: list(paralelo.iterar_tags(executor)), repeticoes)
+        resultado["medicoes"].append(
+            {
+                "analisador": "AnalisadorParalelo",
+                "workers": quantidade,
+                "segundos": segundos,
+                "speedup": referencia / segundos,
+                "speedup_sobre_sequencial": tempo_sequencial / segundos,
+            }
+        )
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--arquivo", help="Arquivo existente (senão um sintético é gerado).")
+    parser.add_argument("--links", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--sem-bs4", action="store_true", help="Não mede o AnalisadorHTML com bs4.")
+    args = parser.parse_args()
+
+    if args.arquivo:
+        print(json.dumps(executar(args.arquivo, args.workers, args.repeticoes, args.sem_bs4), indent=2))
+        return
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = gerar_arquivo(os.path.join(pasta, "favoritos.html"), args.links)
+        print(json.dumps(executar(caminho, args.workers, args.repeticoes, args.sem_bs4), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# benchmarks/bench_similaridade.py
+
+"""
+Mede a detecção de quase duplicados (`DetectorSimilares`) em favoritos sintéticos.
+
+Uso:
+    python -m benchmarks.bench_similaridade --favoritos 1000000
+    python -m benchmarks.bench_similaridade --arquivo favoritos.html
+
+Os favoritos sintéticos incluem cópias alteradas de alguns deles (outro host,
+outro caminho, título com sufixo); o resultado, em JSON, traz os tempos e
+quantas dessas cópias foram encontradas no grupo do original.
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.models.icones import ICONES_IGNORADOS
+from app.models.tag_model import AnalisadorHTML
+from app.services.similaridade import BANDAS, LIMIAR, LINHAS, DetectorSimilares
+
+SILABAS = ["ba", "ce", "di", "fo", "gu", "la", "me", "ni", "po", "ru", "sa", "te", "vi", "xo", "zu", "tra", "pre"]
+
+
+def _vocabulario(aleatorio: random.Random, tamanho: int = 5000) -> List[str]:
+    return ["".join(aleatorio.choices(SILABAS, k=aleatorio.randint(2, 4))) for _ in range(tamanho)]
+
+
+def gerar_favoritos(
+    quantidade: int, proporcao_copias: float = 0.05, semente: int = 42
+) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int]]]:
+    """
+    Gera `quantidade` registros <A> e retorna também os pares (original,
+    cópia) plantados.
+    """
+    aleatorio = random.Random(semente)
+    palavras_possiveis = _vocabulario(aleatorio)
+    registros: List[Dict[str, Any]] = []
+    plantados: List[Tuple[int, int]] = []
+    while len(registros) < quantidade:
+        indice = len(registros)
+        if registros and aleatorio.random() < proporcao_copias:
+            original = aleatorio.randrange(indice)
+            base = registros[original]
+            host, _, caminho = base["HREF"][len("https://"):].partition("/")
+            variacao = aleatorio.randrange(3)
+            if variacao == 0:
+                href = f"https://espelho{aleatorio.randrange(50)}.example.org/{caminho}"
+                titulo = base["TITLE"]
+            elif variacao == 1:
+                href = f"https://{host}/arquivo/{caminho}"
+                titulo = base["TITLE"]
+            else:
+                href = base["HREF"]
+                titulo = base["TITLE"] + " (atualizado)"
+            registros.append({"tag": "A", "HREF": href, "TITLE": titulo, "ADD_DATE": str(indice)})
+            plantados.append((original, indice))
+            continue
+        palavras = aleatorio.sample(palavras_possiveis, 4)
+        slug = "-".join(palavras) + f"-{indice}"
+        secao = aleatorio.choice(palavras_possiveis[:50])
+        registros.append(
+            {
+                "tag": "A",
+                "HREF": f"https://site{aleatorio.randrange(20_000)}.example.com/{secao}/{slug}",
+                "TITLE": " ".join(palavras).title() + f" {indice}",
+                "ADD_DATE": str(indice),
+            }
+        )
+    return registros, plantados
+
+
+def executar(registros, plantados=(), bandas: int = BANDAS, linhas: int = LINHAS, limiar: float = LIMIAR):
+    """
+    Executa a detecção e retorna um dicionário com os tempos e contagens.
+    """
+    detector = DetectorSimilares(bandas=bandas, linhas=linhas, limiar=limiar)
+    inicio = time.perf_counter()
+    detector.processar(registros)
+    assinaturas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    grupos = detector.grupos()
+    agrupamento = time.perf_counter() - inicio
+
+    resultado = {
+        "favoritos": len(detector),
+        "bandas": bandas,
+        "linhas": linhas,
+        "limiar": limiar,
+        "segundos_assinaturas": assinaturas,
+        "segundos_lsh_e_grupos": agrupamento,
+        "favoritos_por_segundo": len(detector) / (assinaturas + agrupamento),
+        "comparacoes": detector.comparacoes,
+        "pares_possiveis": len(detector) * (len(detector) - 1) // 2,
+        "baldes_ignorados": detector.baldes_ignorados,
+        "grupos": len(grupos),
+    }
+    if plantados:
+        # Com registros sintéticos o ADD_DATE é o próprio índice
+        grupo_de = {}
+        for numero, grupo in enumerate(grupos):
+            for favorito in grupo["favoritos"]:
+                grupo_de[int(favorito["ADD_DATE"])] = numero
+        encontrados = sum(
+            1
+            for original, copia in plantados
+            if original in grupo_de and grupo_de[original] == grupo_de.get(copia)
+        )
+        resultado["copias_plantadas"] = len(plantados)
+        resultado["copias_encontradas"] = encontrados
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--arquivo", help="Arquivo existente (senão favoritos sintéticos são gerados).")
+    parser.add_argument("--favoritos", type=int, default=1_000_000)
+    parser.add_argument("--copias", type=float, default=0.05, help="Proporção de cópias alteradas.")
+    parser.add_argument("--bandas", type=int, default=BANDAS)
+    parser.add_argument("--linhas", type=int, default=LINHAS)
+    parser.add_argument("--limiar", type=float, default=LIMIAR)
+    args = parser.parse_args()
+
+    if args.arquivo:
+        with AnalisadorHTML.from_path(args.arquivo) as analisador:
+            registros = list(analisador.iterar_tags(hierarquia=True, icones=ICONES_IGNORADOS))
+        plantados: List[Tuple[int, int]] = []
+    else:
+        registros, plantados = gerar_favoritos(args.favoritos, args.copias)
+    print(json.dumps(executar(registros, plantados, args.bandas, args.linhas, args.limiar), indent=2))
+
+
+if __name__ == "__main__":
+    main()
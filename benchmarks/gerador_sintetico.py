@@ -0,0 +1,129 @@
+# benchmarks/gerador_sintetico.py
+
+"""
+Gerador determinístico de arquivos de favoritos sintéticos (formato Netscape).
+
+Uso:
+    python -m benchmarks.gerador_sintetico saida.html --links 100000
+    python -m benchmarks.gerador_sintetico saida.html --links 100000 --profundidade 6 --unicode 0.2
+
+Com os valores padrão de profundidade e de títulos Unicode, a mesma semente
+gera exatamente o mesmo arquivo das versões anteriores do gerador.
+"""
+
+import argparse
+import html
+import random
+from typing import Optional, TextIO
+
+CABECALHO = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<!-- This is an automatically generated file.
+     It will be read and overwritten.
+     DO NOT EDIT! -->
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+"""
+RODAPE = "</DL><p>\n"
+DATA_BASE = 1_600_000_000
+# Títulos em vários alfabetos, com acentos, emoji e caracteres que precisam de escape
+PALAVRAS_UNICODE = (
+    "Música", "café & crème", "日本語のページ", "中文书签", "Привет мир", "Ελληνικά", "مرحبا بالعالم",
+    "שלום", "हिन्दी", "한국어", "ไทย", "Ünïcödé", "emoji 🔖📚", "<citação>", "Zoë \"aspas\"",
+)
+
+
+def escrever_favoritos(
+    saida: TextIO,
+    links: int,
+    links_por_pasta: int = 50,
+    proporcao_icones: float = 0.3,
+    tamanho_icone: int = 1024,
+    semente: int = 42,
+    profundidade: int = 1,
+    proporcao_unicode: float = 0.0,
+) -> None:
+    """
+    Escreve um arquivo de favoritos com `links` links distribuídos em pastas.
+    A mesma semente sempre gera o mesmo arquivo.
+
+    Args:
+        saida: Arquivo de texto de destino.
+        links: Quantidade total de links.
+        links_por_pasta: Links em cada pasta.
+        proporcao_icones: Fração dos links com atributo ICON.
+        tamanho_icone: Tamanho (em caracteres) de cada ícone.
+        semente: Semente do gerador aleatório.
+        profundidade: Pastas aninhadas em cada cadeia (1 = sem subpastas).
+        proporcao_unicode: Fração dos títulos com texto fora do ASCII.
+    """
+    if profundidade <= 0:
+        raise ValueError("A profundidade deve ser maior que zero.")
+    aleatorio = random.Random(semente)
+    icones = [
+        "data:image/png;base64," + "".join(aleatorio.choices("ABCDEFGHabcdefgh0123456789", k=tamanho_icone))
+        for _ in range(16)
+    ]
+
+    def titulo(padrao: str) -> str:
+        # Sem títulos Unicode o gerador não consome números aleatórios aqui
+        if proporcao_unicode and aleatorio.random() < proporcao_unicode:
+            return html.escape(f"{aleatorio.choice(PALAVRAS_UNICODE)} {padrao}", quote=False)
+        return padrao
+
+    saida.write(CABECALHO)
+    escritos = pasta = 0
+    while escritos < links:
+        abertas = 0
+        while abertas < profundidade and escritos < links:
+            recuo = "    " * (abertas + 1)
+            data = DATA_BASE + aleatorio.randrange(100_000_000)
+            saida.write(
+                f'{recuo}<DT><H3 ADD_DATE="{data}" LAST_MODIFIED="{data + 1000}">{titulo(f"Pasta {pasta}")}</H3>\n'
+                f"{recuo}<DL><p>\n"
+            )
+            for _ in range(min(links_por_pasta, links - escritos)):
+                atributos = (
+                    f'HREF="https://site{aleatorio.randrange(5000)}.example.com/p/{escritos}?q=1&amp;r=2" '
+                    f'ADD_DATE="{DATA_BASE + aleatorio.randrange(100_000_000)}"'
+                )
+                if aleatorio.random() < proporcao_icones:
+                    atributos += f' ICON="{aleatorio.choice(icones)}"'
+                saida.write(f"{recuo}    <DT><A {atributos}>{titulo(f'Link {escritos}')}</A>\n")
+                escritos += 1
+            abertas += 1
+            pasta += 1
+        for nivel in range(abertas, 0, -1):
+            saida.write(f"{'    ' * nivel}</DL><p>\n")
+    saida.write(RODAPE)
+
+
+def gerar_arquivo(caminho: str, links: int, semente: Optional[int] = 42, **opcoes) -> str:
+    """
+    Gera o arquivo sintético no caminho informado e retorna o caminho.
+    """
+    with open(caminho, "w", encoding="utf-8", newline="\n") as saida:
+        escrever_favoritos(saida, links, semente=semente, **opcoes)
+    return caminho
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera favoritos sintéticos.")
+    parser.add_argument("saida")
+    parser.add_argument("--links", type=int, default=10_000)
+    parser.add_argument("--links-por-pasta", type=int, default=50)
+    parser.add_argument("--icones", type=float, default=0.3)
+    parser.add_argument("--profundidade", type=int, default=1)
+    parser.add_argument("--unicode", type=float, default=0.0)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+    gerar_arquivo(
+        args.saida,
+        args.links,
+        semente=args.semente,
+        links_por_pasta=args.links_por_pasta,
+        proporcao_icones=args.icones,
+        profundidade=args.profundidade,
+        proporcao_unicode=args.unicode,
+    )
@@ -0,0 +1,110 @@
+# pylint: disable=C0114, C0115, C0116
+
+import unittest
+
+from app.models.backends import BACKENDS, ConteudoNaoSuportado, backend_disponivel, extrair_bs4, extrair_tags
+from app.models.tag_model import AnalisadorHTML
+
+CABECALHO = """\ufeff<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<!-- This is an automatically generated file.
+     <A HREF="https://comentario.example/">não é um favorito</A> -->
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+"""
+
+BEM_FORMADO = CABECALHO + """<DL><p>
+    <DT><H3 ADD_DATE="1726452161" LAST_MODIFIED="1733205396" PERSONAL_TOOLBAR_FOLDER="true">Barra</H3>
+    <DL><p>
+        <DT><A HREF="https://a.com/?x=1&amp;y=2&#39;" ADD_DATE=" 1 " ICON="data:ícone">Música &amp; café</A>
+        <DT><a href="https://b.com/" add_date="2" PRIVATE>日本語</a>
+        <DT><A HREF="https://c.com/" HREF="https://c2.com/" ICON="">Dup</A>
+        <DT><H3 ADD_DATE="3">Sub &lt;pasta&gt;</H3>
+        <DL><p>
+            <DT><A HREF="https://d.com/a=&quot;b&quot;" ADD_DATE="4"/>
+            <DT><A
+                HREF="https://e.com/"
+                ADD_DATE="5">quebra de linha</A>
+        </DL><p>
+    </DL><p>
+    <DT><A HREF="https://f.com/>" ADD_DATE="6">maior dentro do valor</A>
+</DL><p>
+"""
+
+GRANDE = CABECALHO + "<DL><p>\n" + "".join(
+    f'<DT><H3 ADD_DATE="{pasta}">Pasta {pasta}</H3>\n<DL><p>\n'
+    + "".join(
+        f'<DT><A HREF="https://site{pasta}.example/{link}?q=1&amp;r=2" ADD_DATE="{link}">Ω {link}</A>\n'
+        for link in range(20)
+    )
+    + "</DL><p>\n"
+    for pasta in range(25)
+) + "</DL><p>\n"
+
+# O "regex" recusa estes documentos; os demais backends devem concordar com o bs4
+FORA_DO_PADRAO = {
+    "sem_aspas": """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p><DT><A HREF=https://b.com/ ADD_DATE/>B</DL><p>
+""",
+    "aspas_simples": CABECALHO + "<DL><p><DT><A HREF='https://a.com/'>A</A></DL><p>",
+    "sem_doctype": '<html><body><h3>P</h3><a href="https://a.com/">A</a></body></html>',
+    "menor_solto": CABECALHO + '<DL><p><DT><A HREF="https://a.com/">1 < 2</A></DL><p>',
+    "script": CABECALHO + '<script>var a = "<a href=x>";</script><A HREF="https://a.com/">A</A>',
+}
+
+
+class TestBackends(unittest.TestCase):
+    def _disponiveis(self):
+        return [nome for nome in BACKENDS if backend_disponivel(nome)]
+
+    def test_conformidade_entre_backends(self):
+        documentos = {"bem_formado": BEM_FORMADO, "grande": GRANDE, **FORA_DO_PADRAO}
+        for nome_documento, documento in documentos.items():
+            esperado = extrair_bs4(documento)
+            for backend in self._disponiveis():
+                with self.subTest(documento=nome_documento, backend=backend):
+                    if backend == "regex" and nome_documento in FORA_DO_PADRAO:
+                        with self.assertRaises(ConteudoNaoSuportado):
+                            extrair_tags(documento, backend)
+                        continue
+                    self.assertEqual(extrair_tags(documento, backend), (backend, esperado))
+
+    def test_documento_bem_formado(self):
+        usado, registros = extrair_tags(BEM_FORMADO)
+        self.assertEqual(usado, "regex")
+        self.assertEqual([registro["tag"] for registro in registros], ["H3"] * 2 + ["A"] * 6)
+        self.assertEqual(registros[2]["HREF"], "https://a.com/?x=1&y=2'")
+        self.assertEqual(registros[2]["ADD_DATE"], "1")
+        self.assertEqual(registros[4]["HREF"], "https://c2.com/")
+        self.assertNotIn("comentario", str(registros))
+
+    def test_selecao_automatica_e_erros(self):
+        usado, _ = extrair_tags(FORA_DO_PADRAO["sem_aspas"])
+        self.assertNotEqual(usado, "regex")
+        self.assertEqual(extrair_tags(GRANDE, ["bs4", "regex"])[0], "bs4")
+        # Backends não instalados são pulados na seleção automática
+        esperado = "bs4_lxml" if backend_disponivel("bs4_lxml") else "tokenizador"
+        self.assertEqual(extrair_tags(GRANDE, ["bs4_lxml", "tokenizador"])[0], esperado)
+        with self.assertRaises(ConteudoNaoSuportado):
+            extrair_tags(FORA_DO_PADRAO["script"], ["regex"])
+        with self.assertRaises(ValueError):
+            extrair_tags(GRANDE, "html5lib")
+        with self.assertRaises(ValueError):
+            extrair_tags(GRANDE, [])
+
+    @unittest.skipIf(backend_disponivel("lxml"), "lxml instalado")
+    def test_backend_sem_biblioteca(self):
+        with self.assertRaises(ImportError):
+            extrair_tags(GRANDE, "lxml")
+
+    def test_analisador_html(self):
+        analisador = AnalisadorHTML(BEM_FORMADO)
+        self.assertEqual(analisador.extrair_tags(), extrair_bs4(BEM_FORMADO))
+        self.assertEqual(analisador.backend_utilizado, "regex")
+        analisador = AnalisadorHTML(BEM_FORMADO, backend="bs4")
+        self.assertEqual(analisador.extrair_tags(), extrair_bs4(BEM_FORMADO))
+        self.assertEqual(analisador.backend_utilizado, "bs4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# pylint: disable=C0114, C0115, C0116
+
+import unittest
+from urllib.parse import urlsplit
+
+from app.models.bookmark_store import BookmarkStore, extrair_host
+from app.models.stream_parser import AnalisadorHTMLStream
+from app.models.tag_model import AnalisadorHTML
+
+HTML = """<DL><p>
+<DT><H3 ADD_DATE="100" LAST_MODIFIED="200" PERSONAL_TOOLBAR_FOLDER="true">Barra</H3>
+<DL><p>
+<DT><A HREF="https://Example.com/a" ADD_DATE="150" ICON="data:1">A</A>
+<DT><A HREF="https://example.com/b" ADD_DATE="0150" ICON="data:1">B</A>
+<DT><A HREF="https://outro.org/" ADD_DATE="abc">C</A>
+</DL><p>
+<DT><A HREF="https://example.com/a" ADD_DATE="300">D</A>
+</DL>
+"""
+
+
+class TestBookmarkStore(unittest.TestCase):
+    def test_ida_e_volta_registros_planos(self):
+        registros = AnalisadorHTML(HTML).extrair_tags()
+        store = BookmarkStore.from_records(registros)
+        self.assertEqual(len(store), 5)
+        self.assertEqual(list(store), registros)
+        self.assertEqual(store.to_dict(1), registros[1])
+
+    def test_ida_e_volta_registros_hierarquicos(self):
+        registros = list(AnalisadorHTMLStream.de_texto(HTML, hierarquia=True).iterar_tags())
+        store = BookmarkStore.from_records(registros)
+        self.assertTrue(store.hierarchy)
+        self.assertEqual(list(store), registros)
+
+    def test_interna_urls_e_hosts(self):
+        store = BookmarkStore.from_records(AnalisadorHTML(HTML).extrair_tags())
+        self.assertEqual(
+            [store.to_dict(linha)["HREF"] for linha in (1, 4)], ["https://Example.com/a", "https://example.com/a"]
+        )
+        self.assertEqual(
+            [store.host(linha) for linha in range(len(store))],
+            ["", "example.com", "example.com", "outro.org", "example.com"],
+        )
+        self.assertEqual(store.filter(host="EXAMPLE.com"), [1, 2, 4])
+        self.assertEqual(sorted(store.hosts()), ["example.com", "outro.org"])
+        # Datas fora do formato canônico voltam como texto e não viram inteiro
+        self.assertEqual([store.add_date(linha) for linha in (1, 2, 3)], [150, None, None])
+        self.assertEqual([store.to_dict(linha)["ADD_DATE"] for linha in (1, 2, 3)], ["150", "0150", "abc"])
+
+    def test_datas_fora_do_intervalo_de_64_bits(self):
+        registros = [
+            {"tag": "A", "HREF": f"https://a.com/{indice}", "ADD_DATE": data, "ICON": ""}
+            for indice, data in enumerate(("99999999999999999999", str(2**63), str(2**63 - 1), str(-(2**63))))
+        ]
+        store = BookmarkStore.from_records(registros)
+        self.assertEqual(list(store), registros)
+        self.assertEqual([store.add_date(linha) for linha in range(4)], [None, None, 2**63 - 1, None])
+
+    def test_extrair_host_igual_ao_urlsplit(self):
+        for href in (
+            "https://WWW.Exemplo.com/x", "http://u:p@h.com:80/", "http://a@b@c.com/",
+            "mailto:x@y.com", " http://a.com", "http://[::1]:80/", "http:///p",
+            "HTTP://x.y:abc/", "http://a.com\t/", "//a.com/x", "place:sort=8",
+        ):
+            with self.subTest(href=href):
+                self.assertEqual(extrair_host(href), urlsplit(href).hostname or "")
+        self.assertEqual(extrair_host("http://[inválido/"), "")
+
+    def test_filtros_por_coluna(self):
+        registros = list(AnalisadorHTMLStream.de_texto(HTML, hierarquia=True).iterar_tags())
+        store = BookmarkStore.from_records(registros)
+        self.assertEqual(store.filter(host="EXAMPLE.com"), [1, 2, 4])
+        self.assertEqual(store.filter(tag="A", add_date_min=100, add_date_max=200), [1])
+        self.assertEqual(store.filter(parent_id=0), [1, 2, 3])
+        self.assertEqual(store.filter(host="example.com", parent_id=0), [1, 2])
+        self.assertEqual(store.filter(host="inexistente.net"), [])
+
+    def test_nao_mistura_formatos(self):
+        store = BookmarkStore.from_records(AnalisadorHTML(HTML).extrair_tags())
+        with self.assertRaises(ValueError):
+            store.add({"tag": "A", "HREF": "x", "ADD_DATE": "", "ICON": "", "PARENT_ID": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
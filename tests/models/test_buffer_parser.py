@@ -0,0 +1,51 @@
+# pylint: disable=C0114, C0115, C0116
+
+import unittest
+
+from app.models.buffer_parser import AnalisadorBuffer
+from app.models.stream_parser import AnalisadorHTMLStream
+
+HTML = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<!-- <A HREF="comentario"> -->
+<DL><p>
+    <DT><H3 ADD_DATE="1" LAST_MODIFIED="2" PERSONAL_TOOLBAR_FOLDER="true">Barra &amp; cia</H3>
+    <DL><p>
+        <DT><A HREF="https://a.com/" ADD_DATE="3" ICON=" data:ç ">Ação</A>
+        <DT><A HREF='x>y' icon="1" ICON="2">Dois</A>
+        <script>"<a href='nao'>"</script>
+        <DT><a/ href=s/>
+    </DL><p>
+    <DT><A HREF=https://b.com/ ADD_DATE>Sem fechamento
+</DL>
+"""
+
+
+def _normalizar(registros):
+    return [{k: str(v) if k == "ICON" else v for k, v in r.items()} for r in registros]
+
+
+class TestAnalisadorBuffer(unittest.TestCase):
+    def test_mesmos_registros_do_stream(self):
+        buffer = HTML.encode("utf-8")
+        for hierarquia in (False, True):
+            for icones in ("completo", "ignorar", "sob_demanda"):
+                with self.subTest(hierarquia=hierarquia, icones=icones):
+                    opcoes = {"hierarquia": hierarquia, "icones": icones}
+                    esperado = AnalisadorHTMLStream.de_texto(HTML, **opcoes).extrair_tags()
+                    obtido = AnalisadorBuffer(buffer, **opcoes).extrair_tags()
+                    self.assertEqual(_normalizar(obtido), _normalizar(esperado))
+
+    def test_icone_sob_demanda_aponta_para_o_buffer(self):
+        buffer = HTML.encode("utf-8")
+        registro = next(
+            r for r in AnalisadorBuffer(buffer, icones="sob_demanda").iterar_tags()
+            if r["tag"] == "A"
+        )
+        icone = registro["ICON"]
+        self.assertIs(icone.fonte, buffer)
+        self.assertEqual(buffer[icone.inicio:icone.inicio + icone.tamanho], " data:ç ".encode())
+        self.assertEqual(icone.valor, "data:ç")
+
+
+if __name__ == "__main__":
+    unittest.main()
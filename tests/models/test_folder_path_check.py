@@ -0,0 +1,70 @@
+# pylint: disable=C0114, C0115, C0116
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.models.folder_path_check import SCAN_FILE, SCAN_FOLDER, FolderPathCheck
+
+
+class TestFolderScan(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.raiz = self.pasta.name
+        self._escrever("a.html", 10)
+        self._escrever("b.txt", 5)
+        self._escrever(os.path.join("sub", "c.HTM"), 7)
+        self._escrever(os.path.join("sub", "mais", "d.html"), 3)
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def _escrever(self, relativo, tamanho):
+        caminho = os.path.join(self.raiz, relativo)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(b"x" * tamanho)
+
+    def _tamanhos(self, **opcoes):
+        return {
+            (entrada.kind, os.path.relpath(entrada.path, self.raiz)): entrada.size
+            for entrada in FolderPathCheck(self.raiz).scan(**opcoes)
+        }
+
+    def test_scan_recursivo_com_tamanho_por_subarvore(self):
+        tamanhos = self._tamanhos()
+        self.assertEqual(tamanhos[(SCAN_FOLDER, ".")], 25)
+        self.assertEqual(tamanhos[(SCAN_FOLDER, "sub")], 10)
+        self.assertEqual(tamanhos[(SCAN_FOLDER, os.path.join("sub", "mais"))], 3)
+        self.assertEqual(tamanhos[(SCAN_FILE, "b.txt")], 5)
+        # O resumo da pasta inicial é sempre o último item
+        ultimo = list(FolderPathCheck(self.raiz).scan())[-1]
+        self.assertEqual((ultimo.kind, ultimo.path, ultimo.depth), (SCAN_FOLDER, self.raiz, 0))
+
+    def test_scan_com_profundidade_e_extensoes(self):
+        tamanhos = self._tamanhos(max_depth=1, extensions={".html", ".htm"})
+        arquivos = sorted(caminho for tipo, caminho in tamanhos if tipo == SCAN_FILE)
+        self.assertEqual(arquivos, ["a.html", os.path.join("sub", "c.HTM")])
+        self.assertEqual(tamanhos[(SCAN_FOLDER, ".")], 17)
+
+    def test_scan_evita_ciclos_de_links(self):
+        os.symlink(self.raiz, os.path.join(self.raiz, "sub", "volta"))
+        arquivos = [
+            entrada for entrada in FolderPathCheck(self.raiz).scan(follow_symlinks=True)
+            if entrada.kind == SCAN_FILE
+        ]
+        self.assertEqual(len(arquivos), 4)
+        self.assertEqual(len(self._tamanhos()), 7)
+
+    def test_list_files_e_get_folder_size_olham_um_nivel(self):
+        check = FolderPathCheck(self.raiz)
+        self.assertEqual(
+            sorted(check.list_files()),
+            [Path(self.raiz, "a.html"), Path(self.raiz, "b.txt")],
+        )
+        self.assertEqual(check.get_folder_size(), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
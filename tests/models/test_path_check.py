@@ -0,0 +1,76 @@
+# pylint: disable=C0114, C0115, C0116
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app.controllers.path_check_controller import PathCheckController
+from app.models.file_path_check import FilePathCheck
+from app.models.folder_path_check import FolderPathCheck
+from app.models.path_check import PathCheck
+
+
+class TestPathSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.arquivo = os.path.join(self.pasta.name, "favoritos.html")
+        with open(self.arquivo, "w", encoding="utf-8") as arquivo:
+            arquivo.write("<DL><p></DL>")
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_validacao_do_arquivo_faz_um_unico_lstat(self):
+        with mock.patch("os.lstat", wraps=os.lstat) as lstat, \
+                mock.patch("os.stat", wraps=os.stat) as stat:
+            check = FilePathCheck(self.arquivo)
+            self.assertTrue(check.is_a_real_file())
+            check.get_file_size()
+            PathCheckController(self.arquivo).get_path_timing()
+        self.assertEqual(lstat.call_count, 2)  # um por objeto
+        self.assertEqual(stat.call_count, 0)
+
+    def test_link_simbolico_segue_o_destino(self):
+        link = os.path.join(self.pasta.name, "link.html")
+        os.symlink(self.arquivo, link)
+        check = FilePathCheck(link)
+        self.assertTrue(check.path_exists())
+        self.assertFalse(check.is_not_symlink())
+        self.assertFalse(check.is_a_real_file())
+        self.assertEqual(check.get_file_size(), os.path.getsize(self.arquivo))
+
+        os.remove(self.arquivo)
+        quebrado = PathCheck(link)
+        self.assertFalse(quebrado.path_exists())
+        self.assertIsNone(quebrado.get_modification_time())
+
+    def test_cache_ate_refresh(self):
+        check = FilePathCheck(self.arquivo)
+        self.assertTrue(check.is_not_empty())
+        with open(self.arquivo, "w", encoding="utf-8"):
+            pass
+        self.assertTrue(check.is_not_empty())
+        check.refresh()
+        self.assertFalse(check.is_not_empty())
+
+        os.remove(self.arquivo)
+        self.assertTrue(check.path_exists())
+        self.assertFalse(check.refresh().exists)
+        with self.assertRaises(FileNotFoundError):
+            check.is_not_empty()
+
+    def test_ttl_zero_sempre_le_novamente(self):
+        check = PathCheck(self.arquivo, ttl=0)
+        self.assertTrue(check.path_exists())
+        os.remove(self.arquivo)
+        self.assertFalse(check.path_exists())
+
+    def test_pasta_valida(self):
+        check = FolderPathCheck(self.pasta.name)
+        self.assertTrue(check.is_a_real_folder())
+        self.assertFalse(FolderPathCheck(self.arquivo).is_a_real_folder())
+
+
+if __name__ == "__main__":
+    unittest.main()
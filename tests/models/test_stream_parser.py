@@ -0,0 +1,150 @@
+# pylint: disable=C0114, C0115, C0116
+
+import io
+import os
+import tempfile
+import unittest
+
+from app.models.icones import ReferenciaIcone, TabelaIcones
+from app.models.stream_parser import AnalisadorHTMLStream
+from app.models.tag_model import AnalisadorHTML
+
+FAVORITOS_HTML = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<!-- This is an automatically generated file. <A HREF="comentario"> -->
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+    <DT><H3 ADD_DATE="1726452161" LAST_MODIFIED="1733205396" PERSONAL_TOOLBAR_FOLDER="true">Barra de favoritos</H3>
+    <DL><p>
+        <DT><A HREF="https://web.whatsapp.com/" ADD_DATE="1728516875" ICON="data:image/png;base64,AAAA">WhatsApp</A>
+        <DT><H3 ADD_DATE="1726452200" LAST_MODIFIED="1726452300">Música ♪</H3>
+        <DL><p>
+            <DT><A HREF=" https://www.youtube.com/watch?v=mr_mD76aXDE&amp;t=1 " ADD_DATE="1733205396">Rádio</A>
+        </DL><p>
+    </DL><p>
+    <DT><A HREF="https://example.com/" ADD_DATE>Sem data</A>
+</DL><p>
+"""
+
+
+class TestAnalisadorHTMLStream(unittest.TestCase):
+    def test_registros_iguais_ao_analisador_html(self):
+        esperado = AnalisadorHTML(FAVORITOS_HTML).extrair_tags()
+        for tamanho_chunk in (1, 7, 64, 1 << 16):
+            with self.subTest(tamanho_chunk=tamanho_chunk):
+                analisador = AnalisadorHTMLStream.de_texto(FAVORITOS_HTML, tamanho_chunk)
+                self.assertEqual(analisador.extrair_tags(), esperado)
+
+    def test_ordem_de_documento(self):
+        tags = [
+            registro["tag"]
+            for registro in AnalisadorHTMLStream.de_texto(FAVORITOS_HTML).iterar_tags()
+        ]
+        self.assertEqual(tags, ["H3", "A", "H3", "A", "A"])
+
+    def test_leitura_de_arquivo_em_chunks(self):
+        esperado = AnalisadorHTML(FAVORITOS_HTML).extrair_tags()
+        with tempfile.NamedTemporaryFile("wb", suffix=".html", delete=False) as arquivo:
+            arquivo.write(FAVORITOS_HTML.encode("utf-8"))
+        try:
+            # Chunks de 3 bytes quebram os caracteres multibyte no meio
+            self.assertEqual(AnalisadorHTMLStream(arquivo.name, 3).extrair_tags(), esperado)
+        finally:
+            os.remove(arquivo.name)
+
+    def test_objeto_de_arquivo(self):
+        esperado = AnalisadorHTML(FAVORITOS_HTML).extrair_tags()
+        texto = AnalisadorHTMLStream(io.StringIO(FAVORITOS_HTML), 5)
+        binario = AnalisadorHTMLStream(io.BytesIO(FAVORITOS_HTML.encode("utf-8")), 5)
+        self.assertEqual(texto.extrair_tags(), esperado)
+        self.assertEqual(binario.extrair_tags(), esperado)
+
+    def test_modo_hierarquico(self):
+        registros = list(
+            AnalisadorHTMLStream.de_texto(FAVORITOS_HTML, 5, hierarquia=True).iterar_tags()
+        )
+        resumo = [
+            (r["tag"], r["TITLE"], r.get("FOLDER_ID"), r["PARENT_ID"], r["DEPTH"], r["PATH"])
+            for r in registros
+        ]
+        self.assertEqual(
+            resumo,
+            [
+                ("H3", "Barra de favoritos", 0, None, 0, ()),
+                ("A", "WhatsApp", None, 0, 1, ("Barra de favoritos",)),
+                ("H3", "Música ♪", 1, 0, 1, ("Barra de favoritos",)),
+                ("A", "Rádio", None, 1, 2, ("Barra de favoritos", "Música ♪")),
+                ("A", "Sem data", None, None, 0, ()),
+            ],
+        )
+        # Os atributos continuam iguais aos do modo plano
+        planos = AnalisadorHTMLStream.de_texto(FAVORITOS_HTML).iterar_tags()
+        for plano, hierarquico in zip(planos, registros):
+            self.assertEqual(plano, {k: hierarquico[k] for k in plano})
+
+    def test_link_sem_fechamento(self):
+        html = "<DL><DT><H3>Pasta</H3><DL><DT><A HREF='a'>Um<DT><A HREF='b'>Dois</DL></DL>"
+        registros = list(AnalisadorHTMLStream.de_texto(html, hierarquia=True).iterar_tags())
+        self.assertEqual([r["TITLE"] for r in registros], ["Pasta", "Um", "Dois"])
+        self.assertEqual([r["PARENT_ID"] for r in registros], [None, 0, 0])
+
+    def test_icones_sob_demanda(self):
+        html = FAVORITOS_HTML.replace(
+            'ICON="data:image/png;base64,AAAA"', "ICON=' ç&amp;data:ÁÉ '"
+        )
+        esperado = AnalisadorHTML(html).extrair_tags()
+        with tempfile.NamedTemporaryFile("wb", suffix=".html", delete=False) as arquivo:
+            arquivo.write(html.encode("utf-8"))
+        try:
+            for analisador in (
+                AnalisadorHTMLStream.de_texto(html, 3, icones="sob_demanda"),
+                AnalisadorHTMLStream(arquivo.name, 3, icones="sob_demanda"),
+            ):
+                registros = analisador.extrair_tags()
+                self.assertIsInstance(registros[2]["ICON"], ReferenciaIcone)
+                for registro in registros:
+                    if registro["tag"] == "A":
+                        registro["ICON"] = str(registro["ICON"])
+                self.assertEqual(registros, esperado)
+        finally:
+            os.remove(arquivo.name)
+
+    def test_icones_sob_demanda_referenciam_a_fonte(self):
+        # Se o HTMLParser mudar a forma de avançar ou de ler atributos, os
+        # ícones passam a ser copiados em vez de referenciados
+        html = (
+            "<DL><p>\n"
+            '<DT><A HREF="https://a.com/" ICON="data:a">A</A>\n'
+            "<DT><A HREF='https://b.com/' ICON='data:b' >B</A>\n"
+            "<DT><A HREF=https://c.com/ ICON=data:c>C</A>\n"
+            '<DT><A ICON="antigo" HREF="https://d.com/" icon = "data:d"/>D</A>\n'
+            "</DL><p>\n"
+        )
+        for tamanho_chunk in (1, 7, 4096):
+            with self.subTest(tamanho_chunk=tamanho_chunk):
+                registros = AnalisadorHTMLStream.de_texto(html, tamanho_chunk, icones="sob_demanda").extrair_tags()
+                for registro in registros:
+                    self.assertIsInstance(registro["ICON"], ReferenciaIcone)
+                self.assertEqual([str(r["ICON"]) for r in registros], ["data:a", "data:b", "data:c", "data:d"])
+
+    def test_icones_ignorados_e_tabela(self):
+        html = FAVORITOS_HTML.replace('ADD_DATE>', 'ADD_DATE ICON="data:image/png;base64,AAAA">')
+        ignorados = AnalisadorHTMLStream.de_texto(html, icones="ignorar").extrair_tags()
+        self.assertEqual({r["ICON"] for r in ignorados if r["tag"] == "A"}, {""})
+
+        tabela = TabelaIcones()
+        registros = AnalisadorHTMLStream.de_texto(html, tabela_icones=tabela).extrair_tags()
+        self.assertEqual(registros, AnalisadorHTML(html).extrair_tags())
+        self.assertEqual((len(tabela), tabela.referencias), (1, 2))
+        self.assertIs(registros[2]["ICON"], registros[4]["ICON"])
+        with self.assertRaises(ValueError):
+            AnalisadorHTMLStream.de_texto(html, icones="sob_demanda", tabela_icones=tabela)
+
+    def test_chunk_invalido(self):
+        with self.assertRaises(ValueError):
+            AnalisadorHTMLStream.de_texto("", 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,21 @@
 # pylint: disable=C0114, C0115, C0116
 
+import os
+import tempfile
 import unittest
 from bs4 import BeautifulSoup
 from app.models.tag_model import AnalisadorHTML
 
+FAVORITOS_HTML = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p>
+    <DT><H3 ADD_DATE="1726452161" LAST_MODIFIED="1733205396">Música</H3>
+    <DL><p>
+        <DT><A HREF="https://a.com/?x=1&amp;y=2" ADD_DATE="1" ICON="data:ícone">Á</A>
+        <DT><A HREF=https://b.com/ ADD_DATE/>B
+    </DL><p>
+</DL>
+"""
+
 
 class TestAnalisadorHTML(unittest.TestCase):
     def test_init_with_valid_html(self):
@@ -16,6 +28,31 @@ class TestAnalisadorHTML(unittest.TestCase):
         analisador = self._extracted_from_test_init_with_empty_html_2("")
         self.assertEqual(analisador.soup.string, None)
 
+    def test_from_path_mapeia_o_arquivo(self):
+        with tempfile.NamedTemporaryFile("wb", suffix=".html", delete=False) as arquivo:
+            arquivo.write(FAVORITOS_HTML.encode("utf-8"))
+        try:
+            esperado = AnalisadorHTML(FAVORITOS_HTML).extrair_tags()
+            with AnalisadorHTML.from_path(arquivo.name) as analisador:
+                # Os dois construtores montam o mesmo conjunto de atributos
+                self.assertEqual(vars(analisador).keys(), vars(AnalisadorHTML(FAVORITOS_HTML)).keys())
+                self.assertEqual(analisador.extrair_tags(), esperado)
+                self.assertEqual(len(list(analisador.iterar_tags(hierarquia=True))), 3)
+                # A árvore só é construída quando solicitada
+                self.assertIsInstance(analisador.soup, BeautifulSoup)
+                self.assertEqual(analisador.extrair_tags(), esperado)
+        finally:
+            os.remove(arquivo.name)
+
+    def test_from_path_valida_o_arquivo(self):
+        with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as arquivo:
+            arquivo.write(FAVORITOS_HTML.encode("utf-8"))
+        try:
+            with self.assertRaises(ValueError):
+                AnalisadorHTML.from_path(arquivo.name)
+        finally:
+            os.remove(arquivo.name)
+
     # _TODO Rename this here and in `test_init_with_valid_html` and `test_init_with_empty_html`
     def _extracted_from_test_init_with_empty_html_2(self, arg0):
         html_content = arg0
@@ -0,0 +1,119 @@
+# pylint: disable=C0114, C0115, C0116
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from app import create_app
+from app.models.tag_model import AnalisadorHTML
+from app.routes import favorites_routes
+
+HTML = """<DL><p>
+<DT><H3 ADD_DATE="1">Pasta</H3>
+<DL><p><DT><A HREF="https://a.com/" ADD_DATE="2">A</A>
+<DT><A HREF="https://b.com/" ADD_DATE="3">B</A></DL><p>
+</DL>
+"""
+
+
+class TestFavoritesRoutes(unittest.TestCase):
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()
+        self.pasta = Path(self._temporario.name)
+        self.arquivo = self.pasta / "favoritos.html"
+        self.arquivo.write_text(HTML, encoding="utf-8")
+        self.cliente = create_app({"TESTING": True, "PASTA_FAVORITOS": str(self.pasta)}).test_client()
+
+    def tearDown(self):
+        self._temporario.cleanup()
+
+    def _esperado(self, **opcoes):
+        with AnalisadorHTML.from_path(str(self.arquivo)) as analisador:
+            return json.loads(json.dumps(list(analisador.iterar_tags(**opcoes))))
+
+    def test_ndjson_de_um_caminho_do_servidor(self):
+        resposta = self.cliente.get("/api/favoritos", query_string={"caminho": str(self.arquivo), "hierarquia": 1})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.mimetype, "application/x-ndjson")
+        linhas = resposta.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(linha) for linha in linhas], self._esperado(hierarquia=True))
+
+    def test_array_json_e_corpo_vazio(self):
+        resposta = self.cliente.post("/api/favoritos?formato=json", json={"caminho": str(self.arquivo)})
+        self.assertEqual(resposta.mimetype, "application/json")
+        self.assertEqual(json.loads(resposta.get_data(as_text=True)), self._esperado())
+        self.assertEqual(b"".join(favorites_routes.array_json([])), b"[]")
+
+    def test_upload_e_removido_ao_fim_da_resposta(self):
+        criados = []
+        original = tempfile.mkstemp
+
+        def mkstemp(*args, **kwargs):
+            criados.append(original(*args, **kwargs))
+            return criados[-1]
+
+        with mock.patch.object(favorites_routes.tempfile, "mkstemp", mkstemp):
+            resposta = self.cliente.post(
+                "/api/favoritos",
+                data={"arquivo": (io.BytesIO(HTML.encode("utf-8")), "favoritos.html")},
+                content_type="multipart/form-data",
+            )
+            registros = [json.loads(linha) for linha in resposta.get_data(as_text=True).splitlines()]
+            resposta.close()
+        self.assertEqual(registros, self._esperado())
+        self.assertEqual(len(criados), 1)
+        self.assertFalse(os.path.exists(criados[0][1]))
+
+    def test_erros(self):
+        fora = Path(self._temporario.name).parent / "fora.html"
+        vazio = self.pasta / "vazio.html"
+        vazio.write_text("", encoding="utf-8")
+        casos = [
+            ({}, 400),
+            ({"caminho": str(fora)}, 403),
+            ({"caminho": str(self.pasta / ".." / "fora.html")}, 403),
+            ({"caminho": str(vazio)}, 400),
+            ({"caminho": str(self.arquivo), "formato": "xml"}, 400),
+        ]
+        for parametros, status in casos:
+            with self.subTest(parametros=parametros):
+                resposta = self.cliente.get("/api/favoritos", query_string=parametros)
+                self.assertEqual(resposta.status_code, status)
+                self.assertIn("error", resposta.get_json())
+
+    def test_caminhos_do_servidor_exigem_pasta_configurada(self):
+        cliente = create_app({"TESTING": True}).test_client()
+        for caminho in (str(self.arquivo), "~/favoritos.html", "/etc/passwd"):
+            with self.subTest(caminho=caminho):
+                resposta = cliente.get("/api/favoritos", query_string={"caminho": caminho})
+                self.assertEqual(resposta.status_code, 403)
+        # Caminhos relativos partem da pasta configurada; "~" não é expandido
+        relativo = self.cliente.get("/api/favoritos", query_string={"caminho": "favoritos.html"})
+        self.assertEqual(relativo.status_code, 200)
+        til = self.cliente.get("/api/favoritos", query_string={"caminho": "~/favoritos.html"})
+        self.assertEqual(til.status_code, 400)
+
+    def test_primeiro_bloco_sai_sozinho(self):
+        partes = ["a" * 10] + ["b" * 1024] * 100
+        blocos = list(favorites_routes._blocos(partes))  # pylint: disable=W0212
+        self.assertEqual(blocos[0], b"a" * 10)
+        self.assertEqual(b"".join(blocos), "".join(partes).encode("utf-8"))
+        self.assertEqual(len(blocos), 3)
+
+    def test_analyze(self):
+        self.assertEqual(self.cliente.post("/api/analyze", json={}).status_code, 400)
+        self.assertEqual(self.cliente.post("/api/analyze", json={"path": str(self.pasta / "x")}).status_code, 404)
+        resposta = self.cliente.post("/api/analyze", json={"path": str(self.arquivo)})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.get_json()["caminho_absoluto"], str(self.arquivo.resolve()))
+        self.assertEqual(self.cliente.post("/api/analyze", json={"path": "/etc/passwd"}).status_code, 403)
+        sem_pasta = create_app({"TESTING": True}).test_client()
+        self.assertEqual(sem_pasta.post("/api/analyze", json={"path": str(self.arquivo)}).status_code, 403)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# pylint: disable=C0114, C0115, C0116
+
+import io
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from app import create_app
+
+HTML = """<DL><p>
+<DT><H3 ADD_DATE="1">Pasta</H3>
+<DL><p><DT><A HREF="https://a.com/" ADD_DATE="2">A</A>
+<DT><A HREF="https://b.com/" ADD_DATE="3">B</A></DL><p>
+</DL>
+"""
+
+
+class TestTarefasRoutes(unittest.TestCase):
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()
+        self.pasta = Path(self._temporario.name)
+        self.arquivo = self.pasta / "favoritos.html"
+        self.arquivo.write_text(HTML, encoding="utf-8")
+        self.app = create_app(
+            {
+                "TESTING": True,
+                "PASTA_FAVORITOS": str(self.pasta),
+                "BANCO_TAREFAS": str(self.pasta / "tarefas.sqlite"),
+                "WORKERS_TAREFAS": 1,
+            }
+        )
+        self.cliente = self.app.test_client()
+
+    def tearDown(self):
+        if "tarefas" in self.app.extensions:
+            self.app.extensions["tarefas"].fechar()
+        self._temporario.cleanup()
+
+    def _aguardar(self, local):
+        prazo = time.monotonic() + 30
+        while (tarefa := self.cliente.get(local).get_json())["estado"] in ("pendente", "executando"):
+            self.assertLess(time.monotonic(), prazo)
+            time.sleep(0.02)
+        return tarefa
+
+    def test_upload_progresso_e_paginacao(self):
+        resposta = self.cliente.post(
+            "/api/tarefas",
+            data={"tipo": "analisar", "hierarquia": "1", "arquivo": (io.BytesIO(HTML.encode("utf-8")), "f.html")},
+            content_type="multipart/form-data",
+        )
+        self.assertEqual(resposta.status_code, 202)
+        self.assertNotIn("arquivo", resposta.get_json())
+        tarefa = self._aguardar(resposta.headers["Location"])
+        self.assertEqual((tarefa["estado"], tarefa["progresso"]), ("concluida", 3))
+        self.assertEqual(tarefa["parametros"]["hierarquia"], True)
+
+        pagina = self.cliente.get(tarefa["links"]["resultados"] + "?limite=2").get_json()
+        self.assertEqual([registro["tag"] for registro in pagina["resultados"]], ["H3", "A"])
+        self.assertEqual(pagina["proximo"], 2)
+        pagina = self.cliente.get(tarefa["links"]["resultados"], query_string={"inicio": 2, "limite": 2}).get_json()
+        self.assertEqual(pagina["resultados"][0]["PATH"], ["Pasta"])
+        self.assertIsNone(pagina["proximo"])
+        self.assertEqual(self.cliente.delete(resposta.headers["Location"]).status_code, 409)
+
+    def test_caminho_do_servidor_e_erros(self):
+        resposta = self.cliente.post("/api/tarefas", json={"tipo": "deduplicar", "caminho": str(self.arquivo)})
+        self.assertEqual(resposta.status_code, 202)
+        self.assertEqual(self._aguardar(resposta.headers["Location"])["estado"], "concluida")
+
+        casos = [
+            ({"tipo": "exportar", "caminho": str(self.arquivo)}, 400),
+            ({}, 400),
+            ({"caminho": str(self.pasta.parent / "fora.html")}, 403),
+            ({"caminho": str(self.pasta / "inexistente.html")}, 404),
+        ]
+        for dados, status in casos:
+            with self.subTest(dados=dados):
+                self.assertEqual(self.cliente.post("/api/tarefas", json=dados).status_code, status)
+        self.assertEqual(self.cliente.get("/api/tarefas/inexistente").status_code, 404)
+        self.assertEqual(self.cliente.delete("/api/tarefas/inexistente").status_code, 404)
+        local = resposta.headers["Location"]
+        self.assertEqual(self.cliente.get(f"{local}/resultados?limite=0").status_code, 400)
+
+        # Sem PASTA_FAVORITOS nenhum caminho do servidor é aceito
+        sem_pasta = create_app({"TESTING": True, "BANCO_TAREFAS": str(self.pasta / "outro.sqlite")})
+        resposta = sem_pasta.test_client().post("/api/tarefas", json={"tipo": "analisar", "caminho": str(self.arquivo)})
+        self.assertEqual(resposta.status_code, 403)
+        self.assertNotIn("tarefas", sem_pasta.extensions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+# pylint: disable=C0114, C0115, C0116
+
+import asyncio
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services.agendador import AgendadorHosts, BaldeTokens, dominio_registravel
+from app.services.verificacao import VerificadorLinks
+
+
+class _Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_):
+        pass
+
+    def do_HEAD(self):  # pylint: disable=C0103
+        with self.server.trava:
+            self.server.chegadas.setdefault(self.headers["Host"].split(":")[0], []).append(time.monotonic())
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class TestDominioRegistravel(unittest.TestCase):
+    def test_heuristica(self):
+        casos = {
+            "www.example.com": "example.com",
+            "blog.exemplo.com.br": "exemplo.com.br",
+            "news.bbc.co.uk": "bbc.co.uk",
+            "fulano.github.io": "fulano.github.io",
+            "a.b.c.de": "c.de",
+            "127.0.0.1": "127.0.0.1",
+            "localhost": "localhost",
+        }
+        for host, esperado in casos.items():
+            with self.subTest(host=host):
+                self.assertEqual(dominio_registravel(host), esperado)
+
+
+class TestAgendadorHosts(unittest.TestCase):
+    def test_rodizio_justo_entre_dominios(self):
+        agendador = AgendadorHosts(rajada=100, max_por_dominio=100)
+        hrefs = [f"https://www.a.com/{numero}" for numero in range(6)]
+        hrefs += ["https://b.com/1", "https://m.b.com/2", "https://c.org/1"]
+        for href in hrefs:
+            agendador.adicionar(href)
+        ordem = []
+        while len(agendador):
+            (dominio, _), _ = agendador.proximo()
+            ordem.append(dominio)
+            agendador.concluir(dominio)
+        self.assertEqual(ordem[:6], ["a.com", "b.com", "c.org", "a.com", "b.com", "a.com"])
+        self.assertEqual(ordem.count("a.com"), 6)
+
+    def test_balde_de_tokens_e_limite_por_dominio(self):
+        relogio = _Relogio()
+        agendador = AgendadorHosts(taxa_por_dominio=2, rajada=2, max_por_dominio=3, relogio=relogio)
+        agendador.indexar([{"tag": "H3"}] + [{"tag": "A", "HREF": f"http://a.com/{n}"} for n in range(5)])
+        self.assertEqual(len(agendador), 5)
+        self.assertIsNotNone(agendador.proximo()[0])
+        self.assertIsNotNone(agendador.proximo()[0])
+        pronto, espera = agendador.proximo()
+        self.assertIsNone(pronto)
+        self.assertAlmostEqual(espera, 0.5)
+
+        relogio.agora = 0.5
+        self.assertIsNotNone(agendador.proximo()[0])
+        relogio.agora = 5.0
+        # Três em andamento: o domínio espera uma vaga mesmo com tokens
+        self.assertEqual(agendador.proximo(), (None, None))
+        agendador.concluir("a.com", erro=True)
+        self.assertIsNotNone(agendador.proximo()[0])
+
+        metricas = agendador.metricas()
+        self.assertEqual(metricas["pendentes"], 1)
+        self.assertEqual(metricas["em_andamento"], 3)
+        self.assertEqual((metricas["concluidos"], metricas["erros"]), (1, 1))
+        self.assertEqual(metricas["maiores_filas"], [("a.com", 1)])
+
+    def test_balde_recarrega_ate_a_rajada(self):
+        balde = BaldeTokens(taxa=10, rajada=3, agora=0)
+        for _ in range(3):
+            self.assertEqual(balde.espera(0), 0)
+            balde.consumir()
+        self.assertAlmostEqual(balde.espera(0), 0.1)
+        self.assertEqual(balde.espera(100), 0)
+        self.assertEqual(balde.tokens, 3)
+
+    def test_executar_com_servidor_local(self):
+        servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Manipulador)
+        servidor.daemon_threads = True
+        servidor.trava = threading.Lock()
+        servidor.chegadas = {}
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        porta = servidor.server_address[1]
+        # "127.0.0.1" e "localhost" são domínios diferentes no mesmo servidor
+        agendador = AgendadorHosts(taxa_por_dominio=20, rajada=1)
+        for numero in range(8):
+            agendador.adicionar(f"http://127.0.0.1:{porta}/{numero}")
+        agendador.adicionar(f"http://localhost:{porta}/extra")
+
+        async def executar():
+            async with VerificadorLinks() as verificador:
+                return [saida async for saida in agendador.executar(verificador.verificar_link)]
+
+        try:
+            saidas = asyncio.run(executar())
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+        self.assertEqual(len(saidas), 9)
+        self.assertTrue(all(saida["resultado"]["ok"] for saida in saidas))
+        # O domínio com um só link não espera atrás dos outros oito
+        self.assertLess([saida["dominio"] for saida in saidas].index("localhost"), 3)
+        chegadas = servidor.chegadas["127.0.0.1"]
+        self.assertGreaterEqual(chegadas[-1] - chegadas[0], 7 / 20 * 0.9)
+        metricas = agendador.metricas()
+        self.assertEqual((metricas["pendentes"], metricas["concluidos"]), (0, 9))
+        self.assertGreater(metricas["vazao"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# pylint: disable=C0114, C0115, C0116
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.tag_model import AnalisadorHTML
+from app.models.buffer_parser import AnalisadorBuffer
+from app.services.analise_paralela import AnalisadorParalelo, calcular_trechos, prever_estados
+
+HTML = "".join(
+    ["<!DOCTYPE NETSCAPE-Bookmark-file-1>\n<DL><p>\n"]
+    + [
+        f'<DT><H3 ADD_DATE="{p}">Pasta &amp; {p}</H3>\n<DL><p>\n'
+        + "".join(f'<DT><A HREF="https://s{p}.com/{i}" ADD_DATE="{i}">L{i}</A>\n' for i in range(20))
+        + f'<DT><H3>Sub {p}</H3>\n<DL><p>\n<DT><A HREF="https://sub.com/{p}">S</A>\n</DL><p>\n'
+        + "</DL><p>\n"
+        for p in range(30)
+    ]
+    + ["<DT><A HREF=\"https://raiz.com/\">Raiz</A>\n</DL><p>\n"]
+)
+
+
+class TestAnalisadorParalelo(unittest.TestCase):
+    def _arquivo(self, conteudo):
+        with tempfile.NamedTemporaryFile("wb", suffix=".html", delete=False) as arquivo:
+            arquivo.write(conteudo.encode("utf-8"))
+        self.addCleanup(os.remove, arquivo.name)
+        return arquivo.name
+
+    def _comparar(self, conteudo):
+        caminho = self._arquivo(conteudo)
+        with AnalisadorHTML.from_path(caminho) as analisador:
+            esperado = list(analisador.iterar_tags(hierarquia=True))
+            plano = analisador.extrair_tags()
+        paralelo = AnalisadorParalelo(
+            caminho, workers=3, tamanho_minimo_trecho=500, hierarquia=True
+        )
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            self.assertEqual(list(paralelo.iterar_tags(executor)), esperado)
+            plano_paralelo = AnalisadorParalelo(caminho, workers=3, tamanho_minimo_trecho=500)
+            self.assertEqual(plano_paralelo.extrair_tags(executor), plano)
+
+    def test_trechos_comecam_em_dt(self):
+        buffer = HTML.encode("utf-8")
+        trechos = calcular_trechos(buffer, 8)
+        self.assertEqual(len(trechos), 8)
+        self.assertEqual(trechos[0][0], 0)
+        self.assertEqual(trechos[-1][1], len(buffer))
+        for inicio, _ in trechos[1:]:
+            self.assertEqual(buffer[inicio:inicio + 3].upper(), b"<DT")
+
+    def test_resultado_identico_ao_sequencial(self):
+        self._comparar(HTML)
+
+    def test_previsao_errada_cai_para_sequencial(self):
+        # A varredura estrutural não entende valores de atributos; o resultado
+        # final precisa continuar idêntico ao sequencial
+        self._comparar(
+            HTML.replace("<DT><H3>Sub 3</H3>", '<DT><A HREF="x" TITLE="<DL>">x</A><DT><H3>Sub 3</H3>')
+        )
+
+    def test_varredura_ignora_comentarios(self):
+        html = HTML.replace("<DT><H3>Sub 3</H3>", "<!-- <DL> --><DT><H3>Sub 3</H3>")
+        buffer = html.encode("utf-8")
+        inicios = [inicio for inicio, _ in calcular_trechos(buffer, 8)]
+        esperado = []
+        for inicio in inicios:
+            analisador = AnalisadorBuffer(buffer, hierarquia=True, fim=inicio)
+            list(analisador.iterar_tags())
+            esperado.append(analisador.estado_final)
+        self.assertEqual(prever_estados(buffer, inicios), esperado)
+
+    def test_fronteiras_fora_de_comentarios_e_scripts(self):
+        comentado = "".join(f'<DT><A HREF="https://comentado.com/{i}">C</A>\n' for i in range(200))
+        html = HTML.replace(
+            "<DT><H3>Sub 3</H3>",
+            f"<!--\n{comentado}-->\n<script>var s = '{comentado.replace(chr(10), ' ')}';</script>\n"
+            "<DT><H3>Sub 3</H3>",
+        )
+        buffer = html.encode("utf-8")
+        opacos = [
+            (buffer.index(b"<!--"), buffer.index(b"-->")),
+            (buffer.index(b"<script>"), buffer.index(b"</script>")),
+        ]
+        for inicio, _ in calcular_trechos(buffer, 29)[1:]:
+            self.assertEqual(buffer[inicio:inicio + 3].upper(), b"<DT")
+            for abertura, fechamento in opacos:
+                self.assertFalse(abertura < inicio < fechamento)
+        self._comparar(html)
+
+    def test_rejeita_icones_sob_demanda(self):
+        with self.assertRaises(ValueError):
+            AnalisadorParalelo(self._arquivo(HTML), icones="sob_demanda")
+
+
+if __name__ == "__main__":
+    unittest.main()
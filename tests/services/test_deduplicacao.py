@@ -0,0 +1,89 @@
+# pylint: disable=C0114, C0115, C0116
+
+import os
+import tempfile
+import unittest
+
+from app.services.deduplicacao import Deduplicador, RegrasCanonicas
+
+
+def _favorito(href, add_date="1", titulo=""):
+    return {"tag": "A", "HREF": href, "ADD_DATE": add_date, "TITLE": titulo}
+
+
+class TestRegrasCanonicas(unittest.TestCase):
+    def test_variantes_da_mesma_url(self):
+        regras = RegrasCanonicas()
+        variantes = [
+            "https://www.Example.com/artigo/?b=2&a=1",
+            "http://example.com/artigo?a=1&b=2&utm_source=news#topo",
+            "HTTP://EXAMPLE.COM:80/artigo?fbclid=x&a=1&b=2",
+        ]
+        self.assertEqual({regras.canonicalizar(href) for href in variantes}, {"//example.com/artigo?a=1&b=2"})
+
+    def test_portas_caminhos_e_esquemas_distintos(self):
+        regras = RegrasCanonicas()
+        self.assertEqual(regras.canonicalizar("https://example.com:8443/"), "//example.com:8443")
+        self.assertNotEqual(regras.canonicalizar("https://a.com/X"), regras.canonicalizar("https://a.com/x"))
+        self.assertEqual(regras.canonicalizar(" javascript:void(0) "), "javascript:void(0)")
+
+    def test_regras_configuraveis(self):
+        regras = RegrasCanonicas(ignorar_esquema=False, remover_www=False, remover_fragmento=False)
+        self.assertEqual(regras.canonicalizar("HTTPS://www.a.com/#x"), "https://www.a.com#x")
+
+
+class TestDeduplicador(unittest.TestCase):
+    def test_agrupa_e_mantem_o_mais_antigo(self):
+        deduplicador = Deduplicador().processar(
+            [
+                {"tag": "H3", "ADD_DATE": "1", "LAST_MODIFIED": "2"},
+                _favorito("https://a.com/?utm_medium=x", "30", "A novo"),
+                _favorito("http://www.a.com", "10", "A antigo"),
+                _favorito("https://a.com/", "20"),
+                _favorito("https://b.com/", ""),
+            ]
+        )
+        grupos = list(deduplicador.grupos())
+        self.assertEqual(deduplicador.registros, 4)
+        self.assertEqual([grupo["canonica"] for grupo in grupos], ["//a.com", "//b.com"])
+        self.assertEqual(grupos[0]["HREF"], "http://www.a.com")
+        self.assertEqual(grupos[0]["TITLE"], "A antigo")
+        self.assertEqual(grupos[0]["ocorrencias"], 3)
+        self.assertEqual(len(grupos[0]["variantes"]), 3)
+        self.assertEqual(grupos[1]["ocorrencias"], 1)
+
+    def test_datas_invalidas_ficam_sem_data(self):
+        deduplicador = Deduplicador().processar(
+            [_favorito("https://a.com/", "²"), _favorito("https://a.com/", "-5"), _favorito("https://a.com/", " 7 ")]
+        )
+        (grupo,) = deduplicador.grupos()
+        self.assertEqual((grupo["ADD_DATE"], grupo["ocorrencias"]), (" 7 ", 3))
+
+    def test_runs_em_disco_dao_o_mesmo_resultado(self):
+        registros = [
+            _favorito(f"https://{'www.' if i % 2 else ''}site{i % 37}.com/?utm_id={i}", str(1000 - i), f"T{i}")
+            for i in range(500)
+        ]
+        with tempfile.TemporaryDirectory() as pasta:
+            em_disco = Deduplicador(limite_grupos=5, max_variantes=3, pasta_temporaria=pasta)
+            grupos_em_disco = list(em_disco.processar(registros).grupos(somente_duplicados=True))
+            self.assertEqual(os.listdir(pasta), [])
+        em_memoria = Deduplicador(max_variantes=3).processar(registros)
+        esperado = sorted(em_memoria.grupos(somente_duplicados=True), key=lambda grupo: grupo["canonica"])
+
+        self.assertEqual(len(esperado), 37)
+        for grupo, outro in zip(grupos_em_disco, esperado):
+            self.assertEqual(
+                (grupo["canonica"], grupo["HREF"], grupo["ADD_DATE"], grupo["ocorrencias"]),
+                (outro["canonica"], outro["HREF"], outro["ADD_DATE"], outro["ocorrencias"]),
+            )
+            self.assertEqual(len(grupo["variantes"]), 3)
+        self.assertEqual([grupo["canonica"] for grupo in grupos_em_disco], [g["canonica"] for g in esperado])
+
+    def test_limite_invalido(self):
+        with self.assertRaises(ValueError):
+            Deduplicador(limite_grupos=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# pylint: disable=C0114, C0115, C0116
+
+import os
+import tempfile
+import unittest
+
+from app.services.delta import ADICIONADO, MOVIDO, REMOVIDO, SnapshotFavoritos, comparar, diferencas
+
+ANTERIOR = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p>
+    <DT><H3 ADD_DATE="1" LAST_MODIFIED="10">Trabalho</H3>
+    <DL><p>
+        <DT><A HREF="https://a.com/" ADD_DATE="2">A</A>
+        <DT><A HREF="https://b.com/" ADD_DATE="3">B</A>
+        <DT><H3 ADD_DATE="4" LAST_MODIFIED="11">Projetos</H3>
+        <DL><p>
+            <DT><A HREF="https://c.com/" ADD_DATE="5">C</A>
+        </DL><p>
+    </DL><p>
+    <DT><H3 ADD_DATE="6" LAST_MODIFIED="12">Lazer</H3>
+    <DL><p>
+        <DT><A HREF="https://d.com/" ADD_DATE="7">D</A>
+    </DL><p>
+    <DT><A HREF="https://raiz.com/" ADD_DATE="8">Raiz</A>
+</DL><p>
+"""
+
+# B saiu de Trabalho para Lazer, C foi removido e E foi adicionado em Projetos
+NOVO = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p>
+    <DT><H3 ADD_DATE="1" LAST_MODIFIED="20">Trabalho</H3>
+    <DL><p>
+        <DT><A HREF="https://a.com/" ADD_DATE="2">A</A>
+        <DT><H3 ADD_DATE="4" LAST_MODIFIED="21">Projetos</H3>
+        <DL><p>
+            <DT><A HREF="https://e.com/" ADD_DATE="9">E</A>
+        </DL><p>
+    </DL><p>
+    <DT><H3 ADD_DATE="6" LAST_MODIFIED="22">Lazer</H3>
+    <DL><p>
+        <DT><A HREF="https://d.com/" ADD_DATE="7">D</A>
+        <DT><A HREF="https://b.com/" ADD_DATE="3">B</A>
+    </DL><p>
+    <DT><A HREF="https://raiz.com/" ADD_DATE="8">Raiz</A>
+</DL><p>
+"""
+
+
+class TestDelta(unittest.TestCase):
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.pasta = self._temporario.name
+
+    def tearDown(self):
+        self._temporario.cleanup()
+
+    def _arquivo(self, nome, conteudo):
+        caminho = os.path.join(self.pasta, nome)
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+        return caminho
+
+    def test_eventos_de_adicao_remocao_e_movimento(self):
+        anterior = SnapshotFavoritos.de_arquivo(self._arquivo("anterior.html", ANTERIOR))
+        resultado = comparar(self._arquivo("novo.html", NOVO), anterior)
+        eventos = {(evento["tipo"], evento["HREF"]): evento for evento in resultado["eventos"]}
+        self.assertEqual(
+            set(eventos),
+            {(ADICIONADO, "https://e.com/"), (REMOVIDO, "https://c.com/"), (MOVIDO, "https://b.com/")},
+        )
+        self.assertEqual(eventos[(ADICIONADO, "https://e.com/")]["PATH"], ("Trabalho", "Projetos"))
+        self.assertEqual(eventos[(MOVIDO, "https://b.com/")]["PATH_ANTERIOR"], ("Trabalho",))
+        self.assertTrue(resultado["incremental"])
+
+    def test_pastas_inalteradas_sao_puladas(self):
+        anterior = SnapshotFavoritos.de_arquivo(self._arquivo("anterior.html", ANTERIOR))
+        # Mudança sem atualizar o LAST_MODIFIED: a pasta é pulada de propósito
+        novo = ANTERIOR.replace("https://d.com/", "https://x.com/")
+        resultado = comparar(self._arquivo("novo.html", novo), anterior)
+        self.assertEqual(resultado["pastas_puladas"], 3)
+        self.assertEqual(resultado["eventos"], [])
+
+        caminho = os.path.join(self.pasta, "snapshot.json")
+        resultado["snapshot"].salvar(caminho)
+        self.assertEqual(SnapshotFavoritos.carregar(caminho).pastas, anterior.pastas)
+
+    def test_incremental_igual_a_analise_completa(self):
+        anterior = SnapshotFavoritos.de_arquivo(self._arquivo("anterior.html", ANTERIOR))
+        # Um <DL> dentro de comentário não confunde a varredura estrutural
+        novo = NOVO.replace("<DT><A HREF=\"https://a.com/\"", "<!-- <DL> --><DT><A HREF=\"https://a.com/\"")
+        caminho = self._arquivo("novo.html", novo)
+        resultado = comparar(caminho, anterior)
+        completo = SnapshotFavoritos.de_arquivo(caminho)
+        self.assertTrue(resultado["incremental"])
+        self.assertEqual(resultado["snapshot"].pastas, completo.pastas)
+        self.assertEqual(resultado["eventos"], diferencas(anterior, completo))
+
+        # Já um <DL> cru num atributo faz a análise cair para a completa
+        novo = NOVO.replace('<A HREF="https://a.com/"', '<A TITLE="<DL>" HREF="https://a.com/"')
+        caminho = self._arquivo("novo.html", novo)
+        resultado = comparar(caminho, anterior)
+        completo = SnapshotFavoritos.de_arquivo(caminho)
+        self.assertFalse(resultado["incremental"])
+        self.assertEqual(resultado["snapshot"].pastas, completo.pastas)
+
+    def test_sem_snapshot_anterior_tudo_e_adicionado(self):
+        resultado = comparar(self._arquivo("novo.html", NOVO), None)
+        self.assertEqual(len(resultado["eventos"]), 5)
+        self.assertTrue(all(evento["tipo"] == ADICIONADO for evento in resultado["eventos"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+# pylint: disable=C0114, C0115, C0116
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from app.services.descoberta import DescobertaFavoritos, eh_arquivo_de_favoritos
+
+FAVORITOS = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p><DT><A HREF="https://a.com/" ADD_DATE="1">A</A></DL>
+"""
+
+
+class TestDescobertaFavoritos(unittest.TestCase):
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.raiz = Path(self._temporario.name)
+        self.esperados = []
+        for relativo in ("a.html", "x/b.htm", "x/y/z/c.html", "w/d.html"):
+            caminho = self.raiz / relativo
+            caminho.parent.mkdir(parents=True, exist_ok=True)
+            caminho.write_text(FAVORITOS, encoding="utf-8")
+            self.esperados.append(caminho)
+        (self.raiz / "x" / "pagina.html").write_text("<html></html>", encoding="utf-8")
+        (self.raiz / "x" / "notas.txt").write_text(FAVORITOS, encoding="utf-8")
+        (self.raiz / "vazio.html").write_text("", encoding="utf-8")
+
+    def tearDown(self):
+        self._temporario.cleanup()
+
+    def test_sniff_do_doctype(self):
+        self.assertTrue(eh_arquivo_de_favoritos(self.raiz / "a.html"))
+        self.assertFalse(eh_arquivo_de_favoritos(self.raiz / "x" / "pagina.html"))
+        self.assertFalse(eh_arquivo_de_favoritos(self.raiz / "inexistente.html"))
+
+    def test_encontra_apenas_favoritos_em_ordem(self):
+        descoberta = DescobertaFavoritos(self.raiz, workers=4, max_em_voo=2, ordenado=True)
+        self.assertEqual(list(descoberta.executar()), sorted(self.esperados))
+
+    def test_profundidade_e_links(self):
+        os.symlink(self.raiz, self.raiz / "x" / "volta")
+        descoberta = DescobertaFavoritos(self.raiz, seguir_links=True, ordenado=True)
+        self.assertEqual(list(descoberta.executar()), sorted(self.esperados))
+
+        rasa = DescobertaFavoritos(self.raiz, profundidade_maxima=1)
+        self.assertEqual(
+            sorted(rasa.executar()),
+            sorted([self.raiz / "a.html", self.raiz / "x" / "b.htm", self.raiz / "w" / "d.html"]),
+        )
+
+    def test_cancelamento_e_pasta_invalida(self):
+        cancelar = threading.Event()
+        cancelar.set()
+        descoberta = DescobertaFavoritos([self.raiz, self.raiz / "nada"])
+        self.assertEqual(list(descoberta.executar(cancelar)), [])
+        self.assertEqual(descoberta.erros, [(str(self.raiz / "nada"), "A pasta não é válida.")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# pylint: disable=C0114, C0115, C0116
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from app.services import exportacao
+from app.services.exportacao import COLUNAS, ExportadorFavoritos, formato_do_destino
+
+HTML = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p>
+<DT><H3 ADD_DATE="1700000000" LAST_MODIFIED="1700000100">Barra</H3>
+<DL><p>
+    <DT><A HREF="https://www.Exemplo.com/a?x=1" ADD_DATE="1700000200">Exemplo, "com" vírgula</A>
+    <DT><H3 ADD_DATE="²">Sub</H3>
+    <DL><p><DT><A HREF="https://b.org/" ADD_DATE="abc">B</A></DL><p>
+</DL><p>
+<DT><A HREF="https://c.net/">C</A>
+</DL><p>
+"""
+
+
+class TestExportadorFavoritos(unittest.TestCase):
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()
+        self.pasta = self._temporario.name
+        self.origem = os.path.join(self.pasta, "favoritos.html")
+        with open(self.origem, "w", encoding="utf-8") as arquivo:
+            arquivo.write(HTML)
+
+    def tearDown(self):
+        self._temporario.cleanup()
+
+    def _exportar(self, nome, **opcoes):
+        destino = os.path.join(self.pasta, nome)
+        with ExportadorFavoritos(destino, **opcoes) as exportador:
+            self.assertEqual(exportador.exportar_arquivo(self.origem), 5)
+            self.assertEqual(exportador.exportar_arquivo(self.origem), 5)
+        self.assertEqual(exportador.total, 10)
+        return destino
+
+    def test_csv(self):
+        with open(self._exportar("saida.csv", tamanho_lote=3), encoding="utf-8", newline="") as arquivo:
+            linhas = list(csv.DictReader(arquivo))
+        self.assertEqual(len(linhas), 10)
+        self.assertEqual(tuple(linhas[0]), COLUNAS)
+        self.assertEqual(linhas[0]["tag"], "H3")
+        self.assertEqual(linhas[0]["last_modified"], "2023-11-14T22:15:00Z")
+        self.assertEqual(linhas[1]["titulo"], 'Exemplo, "com" vírgula')
+        self.assertEqual(linhas[1]["host"], "www.exemplo.com")
+        self.assertEqual(linhas[1]["pasta"], "Barra")
+        self.assertEqual(linhas[3]["pasta"], "Barra/Sub")
+        self.assertEqual((linhas[2]["add_date"], linhas[3]["add_date"]), ("", ""))
+
+    def test_jsonl_igual_em_qualquer_lote(self):
+        textos = []
+        for tamanho_lote in (1, 4, 1000):
+            destino = self._exportar(f"saida-{tamanho_lote}.jsonl", tamanho_lote=tamanho_lote)
+            with open(destino, encoding="utf-8") as arquivo:
+                textos.append(arquivo.read())
+        self.assertEqual(len(set(textos)), 1)
+        linhas = [json.loads(texto) for texto in textos[0].splitlines()]
+        self.assertEqual(linhas[1]["add_date"], "2023-11-14T22:16:40Z")
+        self.assertEqual(linhas[1]["profundidade"], 1)
+        self.assertIsNone(linhas[1]["last_modified"])
+        self.assertEqual(linhas[4], {**linhas[4], "pasta": "", "host": "c.net", "add_date": None})
+
+    @unittest.skipIf(exportacao.pa is None, "pyarrow não instalado")
+    def test_parquet_e_arrow(self):
+        tabela = exportacao.pq.read_table(self._exportar("saida.parquet", tamanho_lote=4))
+        self.assertEqual(tabela.num_rows, 10)
+        self.assertEqual(exportacao.pq.ParquetFile(os.path.join(self.pasta, "saida.parquet")).num_row_groups, 3)
+        # O Parquet não tem unidade de segundos: o pyarrow grava e lê em milissegundos
+        self.assertEqual(str(tabela.schema.field("add_date").type), "timestamp[ms, tz=UTC]")
+        self.assertEqual(tabela.column("add_date").to_pylist()[1].timestamp(), 1700000200)
+        self.assertEqual(tabela.column("host").to_pylist()[1], "www.exemplo.com")
+
+        with exportacao.pa.ipc.open_stream(self._exportar("saida.arrow", tamanho_lote=4)) as leitor:
+            tabela = leitor.read_all()
+        self.assertEqual(tabela.num_rows, 10)
+        self.assertEqual(str(tabela.schema.field("add_date").type), "timestamp[s, tz=UTC]")
+        self.assertEqual(tabela.column("pasta").to_pylist()[3], "Barra/Sub")
+
+    def test_datas_fora_do_intervalo_de_64_bits(self):
+        with open(self.origem, "w", encoding="utf-8") as arquivo:
+            arquivo.write(
+                '<DL><p><DT><A HREF="https://a.com/" ADD_DATE="99999999999999999999">A</A>'
+                '<DT><A HREF="https://b.com/" ADD_DATE="9223372036854775807">B</A></DL><p>'
+            )
+        formatos = ["saida.jsonl"] + (["saida.parquet", "saida.arrow"] if exportacao.pa is not None else [])
+        for nome in formatos:
+            with self.subTest(formato=nome):
+                destino = os.path.join(self.pasta, nome)
+                with ExportadorFavoritos(destino) as exportador:
+                    self.assertEqual(exportador.exportar_arquivo(self.origem), 2)
+                if nome.endswith(".jsonl"):
+                    with open(destino, encoding="utf-8") as arquivo:
+                        datas = [json.loads(texto)["add_date"] for texto in arquivo]
+                elif nome.endswith(".parquet"):
+                    datas = exportacao.pq.read_table(destino).column("add_date").to_pylist()
+                else:
+                    with exportacao.pa.ipc.open_stream(destino) as leitor:
+                        datas = leitor.read_all().column("add_date").to_pylist()
+                self.assertEqual(datas, [None, None])
+
+    def test_formatos_invalidos(self):
+        self.assertEqual(formato_do_destino("a.NDJSON"), "jsonl")
+        with self.assertRaises(ValueError):
+            formato_do_destino("a.xlsx")
+        with self.assertRaises(ValueError):
+            ExportadorFavoritos(os.path.join(self.pasta, "a.csv"), formato="xlsx")
+        with self.assertRaises(ValueError):
+            ExportadorFavoritos(os.path.join(self.pasta, "a.csv"), tamanho_lote=0)
+        if exportacao.pa is None:
+            with self.assertRaises(ImportError):
+                ExportadorFavoritos(os.path.join(self.pasta, "a.parquet"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# pylint: disable=C0114, C0115, C0116
+
+import os
+import random
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from app.instrumentacao import metricas
+from app.services import global_services
+from app.services.global_services import GeneralServices
+
+
+class TestFormatarTimestamps(unittest.TestCase):
+    def setUp(self):
+        aleatorio = random.Random(7)
+        # Datas espalhadas por décadas e uma semana inteira, hora a hora,
+        # para cobrir as trocas de horário de verão do fuso local
+        self.timestamps = [aleatorio.randrange(0, 4_000_000_000) for _ in range(2000)]
+        self.timestamps += list(range(1_667_000_000, 1_667_000_000 + 7 * 86_400, 3_599))
+
+    def _esperado(self, tipado):
+        if tipado:
+            return [datetime.fromtimestamp(timestamp) for timestamp in self.timestamps]
+        return [GeneralServices._formatar_timestamp(timestamp) for timestamp in self.timestamps]
+
+    def test_python_puro_igual_ao_escalar(self):
+        for tipado in (False, True):
+            with self.subTest(tipado=tipado):
+                resultado = GeneralServices.formatar_timestamps(self.timestamps, tipado, usar_numpy=False)
+                self.assertEqual(resultado, self._esperado(tipado))
+
+    @unittest.skipIf(global_services.np is None, "NumPy não instalado")
+    def test_numpy_igual_ao_escalar(self):
+        for tipado in (False, True):
+            with self.subTest(tipado=tipado):
+                resultado = GeneralServices.formatar_timestamps(self.timestamps, tipado, usar_numpy=True)
+                self.assertEqual(resultado, self._esperado(tipado))
+
+    def test_textos_e_coluna_vazia(self):
+        self.assertEqual(
+            GeneralServices.formatar_timestamps(["1700000000"], usar_numpy=False),
+            [GeneralServices._formatar_timestamp(1_700_000_000)],
+        )
+        self.assertEqual(GeneralServices.formatar_timestamps([]), [])
+        with self.assertRaises(ValueError):
+            GeneralServices.formatar_timestamps(["abc"])
+
+
+class TestMetadadosEmLote(unittest.TestCase):
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()
+        self.pasta = self._temporario.name
+        for indice in range(20):
+            with open(os.path.join(self.pasta, f"{indice}.html"), "w", encoding="utf-8") as arquivo:
+                arquivo.write("x" * indice * 100)
+        os.mkdir(os.path.join(self.pasta, "sub"))
+
+    def tearDown(self):
+        self._temporario.cleanup()
+
+    def test_igual_ao_individual(self):
+        resultado = GeneralServices.obter_metadados_em_lote(self.pasta)
+        self.assertEqual(len(resultado), 21)
+        for caminho, metadados in resultado.items():
+            self.assertEqual(metadados, GeneralServices(caminho).obter_metadados())
+
+        existente = os.path.join(self.pasta, "1.html")
+        ausente = os.path.join(self.pasta, "nao_existe.html")
+        resultado = GeneralServices.obter_metadados_em_lote([existente, ausente])
+        self.assertEqual(list(resultado), [existente, ausente])
+        self.assertIsNone(resultado[ausente])
+
+    def test_cache_por_tempos_do_stat(self):
+        caminho = os.path.join(self.pasta, "3.html")
+        GeneralServices.obter_metadados_em_lote([caminho])
+        with mock.patch.object(
+            GeneralServices, "_converter_tamanho", side_effect=AssertionError("reformatado")
+        ):
+            resultado = GeneralServices.obter_metadados_em_lote([caminho])
+            resultado[caminho]["permissoes"] = "alterado"  # Cópia: não contamina o cache
+            resultado = GeneralServices.obter_metadados_em_lote([caminho])
+        self.assertEqual(resultado[caminho], GeneralServices(caminho).obter_metadados())
+
+        os.utime(caminho, (1_000_000_000, 1_000_000_000))
+        resultado = GeneralServices.obter_metadados_em_lote([caminho])
+        self.assertEqual(resultado[caminho], GeneralServices(caminho).obter_metadados())
+        self.assertEqual(
+            resultado[caminho]["ultima_modificacao"], GeneralServices._formatar_timestamp(1_000_000_000)
+        )
+
+    def test_metricas_do_cache_ignoram_ausentes(self):
+        caminho = os.path.join(self.pasta, "4.html")
+        ausentes = [os.path.join(self.pasta, f"sumiu-{indice}.html") for indice in range(3)]
+        GeneralServices.obter_metadados_em_lote([caminho])
+        metricas.limpar()
+        metricas.ativar()
+        try:
+            GeneralServices.obter_metadados_em_lote([caminho, os.path.join(self.pasta, "5.html"), *ausentes])
+            contadores = {
+                c["rotulos"]["resultado"]: c["valor"]
+                for c in metricas.exportar_json()["contadores"]
+                if c["nome"] == "global_services.cache_metadados"
+            }
+        finally:
+            metricas.desativar()
+            metricas.limpar()
+        self.assertEqual(contadores, {"acerto": 1, "falta": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# pylint: disable=C0114, C0115, C0116
+
+import os
+import tempfile
+import unittest
+
+from app.models.tag_model import AnalisadorHTML
+from app.services.indice import IndiceFavoritos
+
+HTML = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p>
+    <DT><H3 ADD_DATE="1" LAST_MODIFIED="2">Trabalho</H3>
+    <DL><p>
+        <DT><A HREF="https://github.com/python" ADD_DATE="100">Python no GitHub</A>
+        <DT><H3 ADD_DATE="3" LAST_MODIFIED="²">Leituras</H3>
+        <DL><p>
+            <DT><A HREF="https://docs.python.org/" ADD_DATE="200">Documentação do Python</A>
+        </DL><p>
+    </DL><p>
+    <DT><A HREF="https://GitHub.com/" ADD_DATE="300">GitHub</A>
+    <DT><A HREF="https://exemplo.com/" ADD_DATE="x">Exemplo</A>
+</DL><p>
+"""
+
+
+class TestIndiceFavoritos(unittest.TestCase):
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.arquivo = os.path.join(self._temporario.name, "favoritos.html")
+        with open(self.arquivo, "w", encoding="utf-8") as arquivo:
+            arquivo.write(HTML)
+        self.indice = IndiceFavoritos(os.path.join(self._temporario.name, "indice.sqlite"), 2)
+        self.assertEqual(self.indice.indexar_arquivo(self.arquivo), 4)
+
+    def tearDown(self):
+        self.indice.fechar()
+        self._temporario.cleanup()
+
+    def _hrefs(self, **filtros):
+        return [favorito["HREF"] for favorito in self.indice.buscar(**filtros)]
+
+    def test_consultas_por_coluna(self):
+        self.assertEqual(self._hrefs(host="github.com"), ["https://github.com/python", "https://GitHub.com/"])
+        self.assertEqual(
+            self._hrefs(pasta=("Trabalho",)), ["https://github.com/python", "https://docs.python.org/"]
+        )
+        self.assertEqual(self._hrefs(pasta=("Trabalho", "Leituras")), ["https://docs.python.org/"])
+        self.assertEqual(
+            self._hrefs(add_date_min=150, add_date_max=300),
+            ["https://docs.python.org/", "https://GitHub.com/"],
+        )
+        self.assertEqual(self.indice.contar(), 4)
+        self.assertEqual(self.indice.hosts(1), [("github.com", 2)])
+
+        favorito = self.indice.buscar(href="https://docs.python.org/")[0]
+        self.assertEqual(favorito["PATH"], ("Trabalho", "Leituras"))
+        self.assertEqual(favorito["ADD_DATE"], 200)
+        self.assertIsNone(self.indice.buscar(host="exemplo.com")[0]["ADD_DATE"])
+
+    def test_busca_textual_e_paginacao(self):
+        self.assertEqual(self.indice.contar(texto="python"), 2)
+        self.assertEqual(self._hrefs(texto="documentação"), ["https://docs.python.org/"])
+        self.assertEqual(self._hrefs(texto="python", limite=1, deslocamento=1), ["https://docs.python.org/"])
+
+    def test_reindexar_substitui_o_arquivo(self):
+        self.indice.indexar_arquivo(self.arquivo)
+        self.assertEqual(self.indice.contar(), 4)
+        self.assertEqual(self.indice.contar(texto="python"), 2)
+
+        with AnalisadorHTML.from_path(self.arquivo) as analisador:
+            self.indice.carregar(analisador.extrair_tags(), "plano")
+        self.assertEqual(self.indice.contar(arquivo="plano"), 4)
+        self.assertEqual(self.indice.contar(host="github.com"), 4)
+
+    def test_datas_fora_do_intervalo_de_64_bits(self):
+        enorme = {"tag": "A", "HREF": "https://a.com/", "ADD_DATE": "99999999999999999999", "ICON": ""}
+        self.assertEqual(self.indice.carregar([enorme], "enorme"), 1)
+        (favorito,) = self.indice.buscar(arquivo="enorme")
+        self.assertIsNone(favorito["ADD_DATE"])
+
+
+if __name__ == "__main__":
+    unittest.main()
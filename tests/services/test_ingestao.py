@@ -0,0 +1,143 @@
+# pylint: disable=C0114, C0115, C0116
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest import mock
+
+from app.services import ingestao
+from app.services.ingestao import IngestaoEmLote
+
+HTML = """<DL><p>
+<DT><H3 ADD_DATE="1">Pasta</H3>
+<DL><p><DT><A HREF="https://a.com/" ADD_DATE="2">A</A></DL><p>
+</DL>
+"""
+
+
+class _ExecutorSincrono(Executor):
+    def submit(self, fn, /, *args, **kwargs):
+        futuro = Future()
+        futuro.set_result(fn(*args, **kwargs))
+        return futuro
+
+
+class _ExecutorQuebrado(Executor):
+    """Simula um pool cujo worker morreu."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        futuro = Future()
+        futuro.set_exception(BrokenProcessPool("um worker morreu"))
+        return futuro
+
+
+class TestIngestaoEmLote(unittest.TestCase):
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()
+        self.pasta = Path(self._temporario.name)
+        (self.pasta / "um.html").write_text(HTML, encoding="utf-8")
+        (self.pasta / "dois.htm").write_text(HTML + HTML, encoding="utf-8")
+        (self.pasta / "vazio.html").write_text("", encoding="utf-8")
+        (self.pasta / "notas.txt").write_text(HTML, encoding="utf-8")
+
+    def tearDown(self):
+        self._temporario.cleanup()
+
+    def _resultados(self, **opcoes):
+        resultados = IngestaoEmLote(str(self.pasta), **opcoes).executar()
+        return {Path(r["arquivo"]).name: r for r in resultados}
+
+    def test_filtra_extensoes_e_isola_erros(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                resultados = self._resultados(workers=workers, tamanho_lote=2)
+                self.assertEqual(set(resultados), {"um.html", "dois.htm", "vazio.html"})
+                self.assertEqual(resultados["um.html"]["total"], 2)
+                self.assertEqual(resultados["dois.htm"]["total"], 4)
+                self.assertIsNotNone(resultados["vazio.html"]["erro"])
+                self.assertGreaterEqual(resultados["um.html"]["duracao"], 0)
+
+    def test_opcoes_de_extracao(self):
+        resultados = self._resultados(workers=1, hierarquia=True, incluir_registros=False)
+        self.assertNotIn("registros", resultados["um.html"])
+        resultados = self._resultados(workers=1, hierarquia=True)
+        self.assertEqual(resultados["um.html"]["registros"][1]["PATH"], ("Pasta",))
+
+    def test_manifesto_pula_arquivos_inalterados(self):
+        manifesto = str(self.pasta / "manifesto.sqlite")
+        primeira = self._resultados(workers=1, hierarquia=True, manifesto=manifesto)
+        self.assertFalse(primeira["um.html"]["cache"])
+
+        segunda = self._resultados(workers=1, hierarquia=True, manifesto=manifesto)
+        self.assertTrue(segunda["um.html"]["cache"])
+        self.assertEqual(segunda["um.html"]["registros"], primeira["um.html"]["registros"])
+        # Arquivos com erro não entram no cache
+        self.assertFalse(segunda["vazio.html"]["cache"])
+
+        # Só a data mudou: o hash confirma que o conteúdo é o mesmo
+        os.utime(self.pasta / "um.html", ns=(1, 1))
+        (self.pasta / "dois.htm").write_text(HTML, encoding="utf-8")
+        terceira = self._resultados(workers=1, hierarquia=True, manifesto=manifesto)
+        self.assertTrue(terceira["um.html"]["cache"])
+        self.assertFalse(terceira["dois.htm"]["cache"])
+        self.assertEqual(terceira["dois.htm"]["total"], 2)
+
+        # Outras opções de extração não reaproveitam o cache
+        plana = self._resultados(workers=1, manifesto=manifesto, incluir_registros=False)
+        self.assertFalse(plana["um.html"]["cache"])
+        self.assertNotIn("registros", plana["um.html"])
+
+    def test_manifesto_compartilhado_entre_pastas(self):
+        manifesto = str(self.pasta / "manifesto.sqlite")
+        outra = self.pasta / "outra"
+        outra.mkdir()
+        (outra / "tres.html").write_text(HTML, encoding="utf-8")
+        self._resultados(workers=1, manifesto=manifesto)
+        list(IngestaoEmLote(str(outra), workers=1, manifesto=manifesto).executar())
+
+        # Ingerir uma pasta não apaga as entradas da outra
+        self.assertTrue(self._resultados(workers=1, manifesto=manifesto)["um.html"]["cache"])
+        (resultado,) = IngestaoEmLote(str(outra), workers=1, manifesto=manifesto).executar()
+        self.assertTrue(resultado["cache"])
+
+        # Os arquivos que sumiram da própria pasta continuam sendo removidos
+        (self.pasta / "um.html").unlink()
+        self._resultados(workers=1, manifesto=manifesto)
+        with ingestao.ManifestoIngestao(manifesto, {"hierarquia": False, "icones": "completo"}) as aberto:
+            self.assertEqual(len(aberto), 2)
+
+    def test_outras_extensoes(self):
+        resultados = self._resultados(workers=1, extensoes={".txt"})
+        self.assertEqual(set(resultados), {"notas.txt"})
+        self.assertIsNone(resultados["notas.txt"]["erro"])
+        self.assertEqual(resultados["notas.txt"]["total"], 2)
+
+    def test_pool_quebrado_vira_erro_por_arquivo(self):
+        # O pool próprio quebra: os arquivos são refeitos num pool novo
+        with mock.patch.object(
+            ingestao, "ProcessPoolExecutor", side_effect=[_ExecutorQuebrado(), _ExecutorSincrono()]
+        ):
+            resultados = self._resultados(workers=2, tamanho_lote=2)
+        self.assertEqual(resultados["um.html"]["total"], 2)
+        self.assertEqual(resultados["dois.htm"]["total"], 4)
+
+        # Um executor externo quebrado não é recriado: cada arquivo fica com o erro
+        resultados = list(IngestaoEmLote(str(self.pasta)).executar(_ExecutorQuebrado()))
+        self.assertEqual(len(resultados), 3)
+        for resultado in resultados:
+            self.assertIn("BrokenProcessPool", resultado["erro"])
+
+    def test_parametros_invalidos(self):
+        with self.assertRaises(ValueError):
+            IngestaoEmLote(str(self.pasta), icones="sob_demanda")
+        with self.assertRaises(ValueError):
+            IngestaoEmLote(str(self.pasta), tamanho_lote=0)
+        with self.assertRaises(ValueError):
+            IngestaoEmLote(str(self.pasta / "um.html")).listar_arquivos()
+
+
+if __name__ == "__main__":
+    unittest.main()
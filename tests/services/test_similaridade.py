@@ -0,0 +1,62 @@
+# pylint: disable=C0114, C0115, C0116
+
+import unittest
+
+from app.services.similaridade import DetectorSimilares, tokens_favorito
+
+FAVORITOS = [
+    {"tag": "H3", "ADD_DATE": "1", "LAST_MODIFIED": "2"},
+    {"tag": "A", "HREF": "https://blog.example.com/2023/como-usar-python-asyncio", "TITLE": "Como usar Python asyncio"},
+    {
+        "tag": "A",
+        "HREF": "https://espelho.example.org/2023/como-usar-python-asyncio",
+        "TITLE": "Como usar Python asyncio - Espelho",
+    },
+    {
+        "tag": "A",
+        "HREF": "https://blog.example.com/posts/como-usar-python-asyncio",
+        "TITLE": "Como usar Python asyncio",
+    },
+    {"tag": "A", "HREF": "https://github.com/psf/requests", "TITLE": "psf/requests: HTTP for humans"},
+    {"tag": "A", "HREF": "https://news.ycombinator.com/", "TITLE": "Hacker News"},
+    {"tag": "A", "HREF": "https://www.com/", "TITLE": ""},
+]
+
+
+class TestSimilaridade(unittest.TestCase):
+    def test_tokens(self):
+        self.assertEqual(
+            tokens_favorito("https://www.example.com/o-guia_de-Python.html?id=7", "Guia de Python"),
+            {"example", "guia", "python", "id"},
+        )
+
+    def test_agrupa_quase_duplicados(self):
+        detector = DetectorSimilares().processar(FAVORITOS)
+        # A pasta e o favorito sem tokens úteis ficam de fora
+        self.assertEqual(len(detector), 5)
+        self.assertGreater(detector.similaridade(0, 1), 0.6)
+        self.assertLess(detector.similaridade(0, 3), 0.2)
+
+        grupos = detector.grupos()
+        self.assertEqual(len(grupos), 1)
+        self.assertEqual(
+            [favorito["HREF"] for favorito in grupos[0]["favoritos"]],
+            [FAVORITOS[1]["HREF"], FAVORITOS[2]["HREF"], FAVORITOS[3]["HREF"]],
+        )
+        self.assertGreaterEqual(grupos[0]["similaridade"], 0.6)
+
+    def test_limiar_ajustavel(self):
+        self.assertEqual(DetectorSimilares(limiar=1.0).processar(FAVORITOS).grupos(), [])
+        with self.assertRaises(ValueError):
+            DetectorSimilares(limiar=0)
+
+    def test_baldes_grandes_sao_ignorados(self):
+        favoritos = [{"HREF": f"https://a.com/{i}", "TITLE": "Mesmo título"} for i in range(10)]
+        detector = DetectorSimilares(max_balde=5).processar(favoritos)
+        detector.grupos()
+        self.assertGreater(detector.baldes_ignorados, 0)
+        self.assertEqual(detector.comparacoes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+# pylint: disable=C0114, C0115, C0116
+
+import json
+import sqlite3
+import tempfile
+import time
+import unittest
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest import mock
+
+from app.models.tag_model import AnalisadorHTML
+from app.services import tarefas
+from app.services.tarefas import FilaTarefas, executar_tarefa
+
+HTML = """<DL><p>
+<DT><H3 ADD_DATE="1">Pasta</H3>
+<DL><p><DT><A HREF="https://a.com/" ADD_DATE="2">A</A>
+<DT><A HREF="http://www.a.com/?utm_source=x" ADD_DATE="3">A de novo</A>
+<DT><A HREF="https://b.com/" ADD_DATE="4">B</A></DL><p>
+</DL>
+"""
+
+
+class _ExecutorManual(Executor):
+    """
+    Guarda as tarefas enviadas; o teste decide quando executá-las.
+    """
+
+    def __init__(self):
+        self.enviadas = []
+        self.futuros = []
+
+    def submit(self, fn, /, *args, **kwargs):  # pylint: disable=W0221
+        self.enviadas.append(args)
+        self.futuros.append(Future())
+        return self.futuros[-1]
+
+
+class _ExecutorQuebrado(Executor):
+    """
+    Pool em que um worker morreu: nenhum envio é aceito.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):  # pylint: disable=W0221
+        raise BrokenProcessPool("A child process terminated abruptly")
+
+
+def _aguardar(fila, tarefa_id, limite=30.0):
+    prazo = time.monotonic() + limite
+    while (tarefa := fila.consultar(tarefa_id))["estado"] in tarefas.ATIVOS:
+        if time.monotonic() > prazo:
+            raise AssertionError(f"A tarefa não terminou: {tarefa}")
+        time.sleep(0.02)
+    return tarefa
+
+
+class TestFilaTarefas(unittest.TestCase):
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()
+        self.pasta = Path(self._temporario.name)
+        self.arquivo = self.pasta / "favoritos.html"
+        self.arquivo.write_text(HTML, encoding="utf-8")
+        self.banco = str(self.pasta / "tarefas.sqlite")
+
+    def tearDown(self):
+        self._temporario.cleanup()
+
+    def test_analise_e_deduplicacao_no_pool(self):
+        with FilaTarefas(self.banco, workers=1) as fila:
+            analise = fila.enviar("analisar", str(self.arquivo), {"hierarquia": True})
+            duplicados = fila.enviar("deduplicar", str(self.arquivo), {"somente_duplicados": True})
+            tarefa = _aguardar(fila, analise)
+            self.assertEqual((tarefa["estado"], tarefa["progresso"]), ("concluida", 4))
+            self.assertIsNone(tarefa["erro"])
+            with AnalisadorHTML.from_path(str(self.arquivo)) as analisador:
+                esperado = json.loads(json.dumps(list(analisador.iterar_tags(hierarquia=True, icones="ignorar"))))
+            paginas = fila.resultados(analise, 0, 3) + fila.resultados(analise, 3, 3)
+            self.assertEqual(paginas, esperado)
+
+            self.assertEqual(_aguardar(fila, duplicados)["estado"], "concluida")
+            (grupo,) = fila.resultados(duplicados)
+            self.assertEqual((grupo["HREF"], grupo["ocorrencias"]), ("https://a.com/", 2))
+
+    def test_cancelamento_antes_e_durante_a_execucao(self):
+        executor = _ExecutorManual()
+        fila = FilaTarefas(self.banco, executor=executor)
+        enviado = self.pasta / "enviado.html"
+        enviado.write_text(HTML, encoding="utf-8")
+        pendente = fila.enviar("analisar", str(enviado), temporario=True)
+        self.assertEqual(fila.cancelar(pendente)["estado"], "cancelada")
+        self.assertEqual(executar_tarefa(*executor.enviadas[0]), "cancelada")
+        self.assertFalse(enviado.exists())
+
+        def longa(_arquivo, _parametros, execucao):
+            for numero in range(10):
+                if numero == 5:
+                    fila.cancelar(execucao.tarefa_id)
+                if not execucao.publicar(numero):
+                    return
+
+        em_execucao = fila.enviar("analisar", str(self.arquivo))
+        with mock.patch.dict(tarefas.TIPOS, {"analisar": longa}), mock.patch.object(tarefas, "TAMANHO_LOTE", 2):
+            self.assertEqual(executar_tarefa(*executor.enviadas[1]), "cancelada")
+        self.assertEqual(fila.resultados(em_execucao), [])
+        self.assertEqual(fila.consultar(em_execucao)["progresso"], 4)
+        self.assertTrue(self.arquivo.exists())
+
+    def test_erro_e_retomada_apos_reinicio(self):
+        vazio = self.pasta / "vazio.html"
+        vazio.write_text("", encoding="utf-8")
+        executor = _ExecutorManual()
+        fila = FilaTarefas(self.banco, executor=executor)
+        invalida = fila.enviar("analisar", str(vazio))
+        self.assertEqual(executar_tarefa(*executor.enviadas[0]), "erro")
+        self.assertIn("ValueError", fila.consultar(invalida)["erro"])
+        with self.assertRaises(ValueError):
+            fila.enviar("exportar", str(self.arquivo))
+        with self.assertRaises(ValueError):
+            fila.resultados(invalida, limite=0)
+
+        interrompida = fila.enviar("analisar", str(self.arquivo))
+        pendente = fila.enviar("analisar", str(self.arquivo))
+        with sqlite3.connect(self.banco) as conexao:
+            conexao.execute("UPDATE tarefas SET estado = 'executando' WHERE id = ?", (interrompida,))
+        conexao.close()
+
+        novo_executor = _ExecutorManual()
+        fila = FilaTarefas(self.banco, executor=novo_executor)
+        self.assertEqual(fila.consultar(interrompida)["estado"], "erro")
+        self.assertEqual([tarefa_id for _, tarefa_id in novo_executor.enviadas], [pendente])
+        self.assertIsNone(fila.consultar("inexistente"))
+
+    def test_pool_quebrado(self):
+        enviado = self.pasta / "enviado.html"
+        enviado.write_text(HTML, encoding="utf-8")
+        fila = FilaTarefas(self.banco, executor=_ExecutorQuebrado())
+        recusada = fila.enviar("analisar", str(enviado), temporario=True)
+        tarefa = fila.consultar(recusada)
+        self.assertEqual(tarefa["estado"], "erro")
+        self.assertIn("BrokenProcessPool", tarefa["erro"])
+        self.assertFalse(enviado.exists())
+
+        # O pool próprio quebrado é trocado por um novo
+        novo = _ExecutorManual()
+        with mock.patch.object(tarefas, "ProcessPoolExecutor", side_effect=[_ExecutorQuebrado(), novo]):
+            fila = FilaTarefas(self.banco)
+            enviado.write_text(HTML, encoding="utf-8")
+            morta = fila.enviar("analisar", str(enviado), temporario=True)
+            esperando = fila.enviar("analisar", str(self.arquivo))
+        self.assertEqual([tarefa_id for _, tarefa_id in novo.enviadas], [morta, esperando])
+        self.assertEqual(fila.consultar(morta)["estado"], "pendente")
+
+        # O worker morre durante a primeira tarefa: ela fica com erro e o
+        # arquivo enviado é apagado; a que nem tinha começado é reenviada
+        with sqlite3.connect(self.banco) as conexao:
+            conexao.execute("UPDATE tarefas SET estado = 'executando' WHERE id = ?", (morta,))
+        conexao.close()
+        for futuro in list(novo.futuros):
+            futuro.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        self.assertEqual(fila.consultar(morta)["estado"], "erro")
+        self.assertFalse(enviado.exists())
+        self.assertEqual(fila.consultar(esperando)["estado"], "pendente")
+        self.assertEqual([tarefa_id for _, tarefa_id in novo.enviadas], [morta, esperando, esperando])
+        self.assertEqual(executar_tarefa(*novo.enviadas[-1]), "concluida")
+
+
+if __name__ == "__main__":
+    unittest.main()
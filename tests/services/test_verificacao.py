@@ -0,0 +1,156 @@
+# pylint: disable=C0114, C0115, C0116
+
+import asyncio
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services.verificacao import VerificadorLinks
+
+
+class _Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Manipulador)
+        self.trava = threading.Lock()
+        self.conexoes = 0
+        self.simultaneas = 0
+        self.max_simultaneas = 0
+        self.pedidos = {}
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.trava:
+            self.server.conexoes += 1
+
+    def log_message(self, *_):
+        pass
+
+    def _responder(self, status, corpo=b"ok", cabecalhos=()):
+        self.send_response(status)
+        for nome, valor in cabecalhos:
+            self.send_header(nome, valor)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(corpo)
+
+    def _tratar(self):
+        servidor = self.server
+        with servidor.trava:
+            chave = (self.command, self.path)
+            servidor.pedidos[chave] = servidor.pedidos.get(chave, 0) + 1
+            vezes = servidor.pedidos[chave]
+            servidor.simultaneas += 1
+            servidor.max_simultaneas = max(servidor.max_simultaneas, servidor.simultaneas)
+        try:
+            if self.path.startswith("/ok"):
+                time.sleep(0.01)
+                self._responder(200)
+            elif self.path == "/sem-head":
+                self._responder(405 if self.command == "HEAD" else 200)
+            elif self.path == "/instavel":
+                self._responder(503 if vezes == 1 else 200, cabecalhos=[("Retry-After", "²")])
+            elif self.path == "/movido":
+                self._responder(301, cabecalhos=[("Location", "/ok")])
+            elif self.path == "/lento":
+                time.sleep(0.5)
+                self._responder(200)
+            else:
+                self._responder(404)
+        finally:
+            with servidor.trava:
+                servidor.simultaneas -= 1
+
+    do_HEAD = do_GET = _tratar
+
+
+class TestVerificadorLinks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.servidor = _Servidor()
+        cls.thread = threading.Thread(target=cls.servidor.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.servidor.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+
+    def setUp(self):
+        with self.servidor.trava:
+            self.servidor.conexoes = self.servidor.max_simultaneas = 0
+            self.servidor.pedidos.clear()
+
+    @staticmethod
+    def _verificar(hrefs, **opcoes):
+        async def executar():
+            async with VerificadorLinks(**opcoes) as verificador:
+                return {resultado["HREF"]: resultado async for resultado in verificador.verificar(hrefs)}
+
+        return asyncio.run(executar())
+
+    def test_status_e_fallback_para_get(self):
+        hrefs = [f"{self.base}/ok", f"{self.base}/sumiu", f"{self.base}/sem-head", f"{self.base}/movido", "ftp://x"]
+        resultados = self._verificar(hrefs, espera_inicial=0.01)
+        self.assertEqual(resultados[hrefs[0]]["status"], 200)
+        self.assertTrue(resultados[hrefs[0]]["ok"])
+        self.assertEqual((resultados[hrefs[1]]["status"], resultados[hrefs[1]]["metodo"]), (404, "GET"))
+        self.assertFalse(resultados[hrefs[1]]["ok"])
+        self.assertEqual((resultados[hrefs[2]]["status"], resultados[hrefs[2]]["metodo"]), (200, "GET"))
+        self.assertEqual(resultados[hrefs[3]]["location"], "/ok")
+        self.assertIsNone(resultados[hrefs[4]]["ok"])
+
+    def test_repeticao_e_timeout(self):
+        instavel, lento = f"{self.base}/instavel", f"{self.base}/lento"
+        resultados = self._verificar([instavel, lento], timeout=0.2, tentativas=1, espera_inicial=0.01)
+        self.assertEqual((resultados[instavel]["status"], resultados[instavel]["tentativas"]), (200, 2))
+        self.assertFalse(resultados[lento]["ok"])
+        self.assertIn("TimeoutError", resultados[lento]["erro"])
+
+    def test_pool_e_limite_por_host(self):
+        hrefs = [f"{self.base}/ok/{numero}" for numero in range(40)]
+        resultados = self._verificar(hrefs, max_por_host=3)
+        self.assertEqual(len(resultados), 40)
+        self.assertTrue(all(resultado["ok"] for resultado in resultados.values()))
+        self.assertLessEqual(self.servidor.max_simultaneas, 3)
+        # As conexões são reaproveitadas (keep-alive) em vez de uma por link
+        self.assertLessEqual(self.servidor.conexoes, 3)
+
+    def test_cache_e_links_repetidos(self):
+        href = f"{self.base}/ok"
+
+        async def executar():
+            verificador = VerificadorLinks()
+            try:
+                primeiros = await asyncio.gather(*(verificador.verificar_link(href) for _ in range(5)))
+                depois = await verificador.verificar_link(href)
+            finally:
+                await verificador.fechar()
+            return primeiros, depois
+
+        primeiros, depois = asyncio.run(executar())
+        self.assertEqual(self.servidor.pedidos[("HEAD", "/ok")], 1)
+        self.assertEqual(sum(not resultado["cache"] for resultado in primeiros), 1)
+        self.assertTrue(depois["cache"])
+
+        async def expirado():
+            verificador = VerificadorLinks(ttl_cache=0)
+            try:
+                await verificador.verificar_link(href)
+                return await verificador.verificar_link(href)
+            finally:
+                await verificador.fechar()
+
+        self.assertFalse(asyncio.run(expirado())["cache"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# pylint: disable=C0114, C0115, C0116
+
+import io
+import os
+import tempfile
+import unittest
+
+from app.instrumentacao import RegistroMetricas, metricas, perfilar
+from app.models.path_check import PathCheck
+from app.models.tag_model import AnalisadorHTML
+from app.services.global_services import GeneralServices
+
+HTML = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p>
+<DT><H3 ADD_DATE="1">Pasta</H3>
+<DL><p><DT><A HREF="https://a.com/" ADD_DATE="2">A</A></DL><p>
+</DL>
+"""
+
+
+class TestRegistroMetricas(unittest.TestCase):
+    def test_desligado_nao_registra(self):
+        registro = RegistroMetricas()
+        registro.contar("a")
+        registro.observar("b", 1.0)
+        with registro.cronometro("c"):
+            pass
+        self.assertEqual(registro.exportar_json(), {"contadores": [], "histogramas": []})
+        self.assertEqual(registro.exportar_prometheus(), "")
+
+    def test_exportacoes(self):
+        registro = RegistroMetricas(ativo=True)
+        registro.contar("analise.registros", 3, backend="regex")
+        registro.contar("analise.registros", 2, backend="regex")
+        for valor in (0.5, 2.0, 200.0):
+            registro.observar("etapa_segundos", valor, limites=(1.0, 10.0))
+        with registro.cronometro("bloco", origem='a"b'):
+            pass
+
+        dados = registro.exportar_json()
+        self.assertEqual(
+            dados["contadores"], [{"nome": "analise.registros", "rotulos": {"backend": "regex"}, "valor": 5}]
+        )
+        etapa = next(h for h in dados["histogramas"] if h["nome"] == "etapa_segundos")
+        self.assertEqual(etapa["quantidade"], 3)
+        self.assertEqual((etapa["minimo"], etapa["maximo"]), (0.5, 200.0))
+        self.assertEqual(etapa["baldes"], {"1.0": 1, "10.0": 1, "+Inf": 1})
+        self.assertEqual(dados["histogramas"][0]["nome"], "bloco_segundos")
+
+        texto = registro.exportar_prometheus()
+        self.assertIn("# TYPE bookmarkhunter_analise_registros_total counter", texto)
+        self.assertIn('bookmarkhunter_analise_registros_total{backend="regex"} 5', texto)
+        self.assertIn('bookmarkhunter_etapa_segundos_bucket{le="10.0"} 2', texto)
+        self.assertIn('bookmarkhunter_etapa_segundos_bucket{le="+Inf"} 3', texto)
+        self.assertIn("bookmarkhunter_etapa_segundos_count 3", texto)
+        self.assertIn('bookmarkhunter_bloco_segundos_count{origem="a\\"b"} 1', texto)
+
+        registro.limpar()
+        self.assertEqual(registro.exportar_json()["histogramas"], [])
+
+    def test_pontos_de_medicao(self):
+        metricas.limpar()
+        metricas.ativar()
+        try:
+            with tempfile.TemporaryDirectory() as pasta:
+                PathCheck(pasta).path_exists()
+                caminho = os.path.join(pasta, "favoritos.html")
+                with open(caminho, "w", encoding="utf-8") as arquivo:
+                    arquivo.write(HTML)
+                GeneralServices(caminho).obter_metadados()
+            AnalisadorHTML(HTML).extrair_tags()
+            GeneralServices.formatar_timestamps([1, 2, 3])
+            dados = metricas.exportar_json()
+        finally:
+            metricas.desativar()
+            metricas.limpar()
+
+        nomes = {histograma["nome"] for histograma in dados["histogramas"]}
+        self.assertLessEqual(
+            {
+                "path_check.snapshot_segundos",
+                "analisador_html.extrair_tags_segundos",
+                "global_services.formatar_timestamps_segundos",
+                "global_services.obter_metadados_segundos",
+            },
+            nomes,
+        )
+        contadores = {(c["nome"], tuple(c["rotulos"].items())): c["valor"] for c in dados["contadores"]}
+        self.assertEqual(contadores[("analisador_html.registros", (("backend", "regex"),))], 2)
+        self.assertEqual(contadores[("global_services.timestamps", ())], 3)
+
+    def test_perfilar(self):
+        for modo in ("cprofile", "tracemalloc"):
+            with self.subTest(modo=modo):
+                relatorio = io.StringIO()
+                with perfilar(modo, relatorio=relatorio, limite=5):
+                    sorted(str(numero) for numero in range(1000))
+                self.assertTrue(relatorio.getvalue())
+        with self.assertRaises(ValueError):
+            with perfilar("perf"):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()